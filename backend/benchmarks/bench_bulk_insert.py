@@ -0,0 +1,40 @@
+import argparse
+from benchmarks.common import setup_django, create_content, synthetic_frame, timed
+
+def iterrows_insert(content, df):
+    from equipment_api.models import EquipmentData
+    
+    equipment_list = []
+    for _, row in df.iterrows():
+        equipment_list.append(EquipmentData(
+            content=content,
+            equipment_name=row['Equipment Name'],
+            equipment_type=row['Type'],
+            flowrate=row['Flowrate'],
+            pressure=row['Pressure'],
+            temperature=row['Temperature']
+        ))
+    EquipmentData.objects.bulk_create(equipment_list)
+    return len(equipment_list)
+
+def columnar_insert(content, df, batch_size):
+    from data_processor.bulk_loader import ColumnarBulkLoader
+    return ColumnarBulkLoader(batch_size=batch_size).load(content, df)
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the iterrows ORM insert with ColumnarBulkLoader.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--batch-size', type=int, default=10000)
+    args = parser.parse_args()
+    
+    setup_django()
+    
+    print(f"{'rows':>10} {'iterrows (s)':>14} {'columnar (s)':>14} {'speedup':>9}")
+    for rows in args.rows:
+        df = synthetic_frame(rows)
+        _, baseline = timed(iterrows_insert, create_content(f'iterrows-{rows}'), df)
+        _, columnar = timed(columnar_insert, create_content(f'columnar-{rows}'), df, args.batch_size)
+        print(f'{rows:>10} {baseline:>14.2f} {columnar:>14.2f} {baseline / columnar:>8.1f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+from benchmarks.common import synthetic_frame, timed
+from data_processor.csv_parser import CSVParser, pa
+
+def parse_whole(profile, path, chunk_size):
+    with open(path, 'rb') as file:
+        df = CSVParser(profile=profile).parse_file(file)
+    return len(df), int(df.memory_usage(deep=True).sum())
+
+def parse_chunked(profile, path, chunk_size):
+    rows = frame_bytes = 0
+    with open(path, 'rb') as file:
+        for chunk in CSVParser(profile=profile).iter_chunks(file, chunk_size):
+            rows += len(chunk)
+            frame_bytes = max(frame_bytes, int(chunk.memory_usage(deep=True).sum()))
+    return rows, frame_bytes
+
+def measure(mode, profile, path, chunk_size, queue):
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    (rows, frame_bytes), elapsed = timed(MODES[mode], profile, path, chunk_size)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((rows, elapsed, frame_bytes, (peak - baseline) * 1024))
+
+MODES = {'whole': parse_whole, 'chunked': parse_chunked}
+
+def run_isolated(mode, profile, path, chunk_size):
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=measure, args=(mode, profile, path, chunk_size, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the default and typed CSV parsing profiles.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000, 5000000])
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    args = parser.parse_args()
+    
+    print(f"pyarrow: {'available' if pa is not None else 'not installed, typed whole-file parses use the C engine'}")
+    print(f"{'rows':>10} {'mode':>8} {'profile':>8} {'time (s)':>9} {'frame (MB)':>11} {'peak RSS (MB)':>14}")
+    
+    for rows in args.rows:
+        with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as tmp:
+            synthetic_frame(rows).to_csv(tmp, index=False)
+        try:
+            for mode in MODES:
+                for profile in ['default', 'typed']:
+                    count, elapsed, frame_bytes, peak = run_isolated(mode, profile, tmp.name, args.chunk_size)
+                    assert count == rows
+                    print(f'{rows:>10} {mode:>8} {profile:>8} {elapsed:>9.2f} '
+                          f'{frame_bytes / 2**20:>11.1f} {peak / 2**20:>14.1f}')
+        finally:
+            os.unlink(tmp.name)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import tempfile
+from benchmarks.common import setup_django, create_content, synthetic_frame, timed
+
+def serializer_render(content):
+    from rest_framework.renderers import JSONRenderer
+    from equipment_api.serializers import EquipmentDataSerializer
+    data = EquipmentDataSerializer(content.equipment.order_by('id'), many=True).data
+    return JSONRenderer().render(data)
+
+def values_list_render(content):
+    from equipment_api.equipment_rows import EQUIPMENT_FIELDS, equipment_records
+    from equipment_api.renderers import FastJSONRenderer
+    data = equipment_records(content.equipment.order_by('id').values_list(*EQUIPMENT_FIELDS))
+    return FastJSONRenderer().render(data)
+
+def columnar_render(columns):
+    from equipment_api.renderers import FastJSONRenderer
+    return FastJSONRenderer().render(columns.to_records())
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare equipment row serialization paths.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 500000])
+    args = parser.parse_args()
+    
+    setup_django()
+    from data_processor.bulk_loader import ColumnarBulkLoader
+    from data_processor.columnar_store import ColumnarStore
+    from equipment_api.models import EquipmentData
+    from equipment_api.renderers import orjson
+    
+    store = ColumnarStore(tempfile.mkdtemp())
+    print(f"orjson: {'available' if orjson is not None else 'not installed, falling back to json'}")
+    print(f"{'rows':>10} {'serializer (rows/s)':>20} {'values_list (rows/s)':>21} {'columnar (rows/s)':>18}")
+    for rows in args.rows:
+        df = synthetic_frame(rows)
+        content = create_content(f'serialization-{rows}')
+        ColumnarBulkLoader().load(content, df)
+        
+        writer = store.writer(content.file_hash)
+        writer.append(df)
+        writer.write_ids(EquipmentData.objects.filter(content=content).order_by('id').values_list('id', flat=True))
+        writer.commit()
+        columns = store.open(content.file_hash)
+        
+        baseline_body, baseline = timed(serializer_render, content)
+        fast_body, fast = timed(values_list_render, content)
+        columnar_body, columnar = timed(columnar_render, columns)
+        assert baseline_body == fast_body == columnar_body
+        print(f'{rows:>10} {rows / baseline:>20,.0f} {rows / fast:>21,.0f} {rows / columnar:>18,.0f}')
+
+if __name__ == '__main__':
+    main()
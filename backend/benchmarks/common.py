@@ -0,0 +1,35 @@
+import os
+import time
+import django
+import numpy as np
+import pandas as pd
+
+EQUIPMENT_TYPES = ['Pump', 'Compressor', 'Valve', 'HeatExchanger', 'Reactor', 'Condenser']
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    django.setup()
+    
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+
+def create_content(name):
+    from equipment_api.models import DatasetContent
+    return DatasetContent.objects.create(file_hash=name)
+
+def synthetic_frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Equipment Name': [f'Unit-{i}' for i in range(rows)],
+        'Type': rng.choice(EQUIPMENT_TYPES, rows),
+        'Flowrate': rng.uniform(10, 250, rows).round(2),
+        'Pressure': rng.uniform(1, 12, rows).round(2),
+        'Temperature': rng.uniform(40, 180, rows).round(2),
+    })
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
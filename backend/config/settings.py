@@ -76,6 +76,10 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'equipment_api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
 }
@@ -96,7 +100,69 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'jobs': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'jobs',
+    },
+    'summaries': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'summaries',
+        'TIMEOUT': int(os.getenv('SUMMARY_CACHE_TIMEOUT', 86400)),
+    },
+}
+
 MAX_UPLOAD_SIZE = int(os.getenv('MAX_UPLOAD_SIZE', 10485760))
+CHUNKED_UPLOAD_MAX_SIZE = int(os.getenv('CHUNKED_UPLOAD_MAX_SIZE', 2147483648))
+CHUNKED_UPLOAD_CHUNK_SIZE = int(os.getenv('CHUNKED_UPLOAD_CHUNK_SIZE', 5242880))
+CHUNKED_UPLOAD_EXPIRY_HOURS = int(os.getenv('CHUNKED_UPLOAD_EXPIRY_HOURS', 24))
+FILE_UPLOAD_HANDLERS = [
+    'equipment_api.upload_handlers.HashingMemoryFileUploadHandler',
+    'equipment_api.upload_handlers.HashingTemporaryFileUploadHandler',
+]
+COLUMNAR_STORE_ENABLED = os.getenv('COLUMNAR_STORE_ENABLED', 'True') == 'True'
+COLUMNAR_STORE_ROOT = Path(os.getenv('COLUMNAR_STORE_ROOT', BASE_DIR / 'columnar'))
+REPORT_STORE_ROOT = Path(os.getenv('REPORT_STORE_ROOT', BASE_DIR / 'reports'))
+REPORT_STORE_MAX_BYTES = int(os.getenv('REPORT_STORE_MAX_BYTES', 268435456))
+REPORT_ACCEL_REDIRECT_PREFIX = os.getenv('REPORT_ACCEL_REDIRECT_PREFIX', '')
+REPORT_WORKERS = int(os.getenv('REPORT_WORKERS', 2))
+REPORT_POLL_INTERVAL = float(os.getenv('REPORT_POLL_INTERVAL', 1.0))
+REPORT_MAX_ATTEMPTS = int(os.getenv('REPORT_MAX_ATTEMPTS', 3))
+REPORT_MAX_QUEUED_JOBS = int(os.getenv('REPORT_MAX_QUEUED_JOBS', 5))
+REPORT_EXPORT_MAX_DATASETS = int(os.getenv('REPORT_EXPORT_MAX_DATASETS', 100))
+REPORT_EXPORT_RETRY_AFTER = int(os.getenv('REPORT_EXPORT_RETRY_AFTER', 5))
+REPORT_EXPORT_MAX_BYTES = int(os.getenv('REPORT_EXPORT_MAX_BYTES', REPORT_STORE_MAX_BYTES // 2))
+REPORT_BASE_BYTES = int(os.getenv('REPORT_BASE_BYTES', 8192))
+REPORT_FULL_BYTES_PER_ROW = int(os.getenv('REPORT_FULL_BYTES_PER_ROW', 100))
+CSV_PARSER_PROFILE = os.getenv('CSV_PARSER_PROFILE', 'typed')
+INGEST_CHUNK_SIZE = int(os.getenv('INGEST_CHUNK_SIZE', 50000))
+INGEST_INSERT_BATCH_SIZE = int(os.getenv('INGEST_INSERT_BATCH_SIZE', 10000))
+INGEST_WORKERS = int(os.getenv('INGEST_WORKERS', 2))
+INGEST_POLL_INTERVAL = float(os.getenv('INGEST_POLL_INTERVAL', 1.0))
+INGEST_MAX_ATTEMPTS = int(os.getenv('INGEST_MAX_ATTEMPTS', 5))
+EQUIPMENT_PAGE_SIZE = int(os.getenv('EQUIPMENT_PAGE_SIZE', 1000))
+EQUIPMENT_MAX_PAGE_SIZE = int(os.getenv('EQUIPMENT_MAX_PAGE_SIZE', 10000))
+EQUIPMENT_STREAM_CHUNK_SIZE = int(os.getenv('EQUIPMENT_STREAM_CHUNK_SIZE', 2000))
+CHART_BINS = int(os.getenv('CHART_BINS', 50))
+CHART_MAX_BINS = int(os.getenv('CHART_MAX_BINS', 200))
+CHART_TOP_N = int(os.getenv('CHART_TOP_N', 10))
+CHART_MAX_TOP_N = int(os.getenv('CHART_MAX_TOP_N', 100))
+DISTRIBUTION_BINS = int(os.getenv('DISTRIBUTION_BINS', 20))
+COMPARE_MAX_DATASETS = int(os.getenv('COMPARE_MAX_DATASETS', 10))
+BATCH_MAX_REQUESTS = int(os.getenv('BATCH_MAX_REQUESTS', 20))
+RETENTION_MAX_AGE_DAYS = int(os.getenv('RETENTION_MAX_AGE_DAYS', 30))
+RETENTION_KEEP_INACTIVE = int(os.getenv('RETENTION_KEEP_INACTIVE', 5))
+RETENTION_USER_ROW_QUOTA = int(os.getenv('RETENTION_USER_ROW_QUOTA', 0))
+RETENTION_BATCH_SIZE = int(os.getenv('RETENTION_BATCH_SIZE', 5000))
+RETENTION_PAUSE = float(os.getenv('RETENTION_PAUSE', 0))
+RETENTION_VACUUM_PAGES = int(os.getenv('RETENTION_VACUUM_PAGES', 1000))
+ARCHIVE_MAX_SIZE = int(os.getenv('ARCHIVE_MAX_SIZE', MAX_UPLOAD_SIZE))
+ARCHIVE_MAX_FILES = int(os.getenv('ARCHIVE_MAX_FILES', 100))
+ARCHIVE_WORKERS = int(os.getenv('ARCHIVE_WORKERS', os.cpu_count() or 1))
+ARCHIVE_MAX_IN_FLIGHT = int(os.getenv('ARCHIVE_MAX_IN_FLIGHT', 2 * ARCHIVE_WORKERS))
 
 LOGGING = {
     'version': 1,
@@ -1,38 +1,206 @@
 import pandas as pd
 import numpy as np
 
-class DataAnalyzer:
-    def compute_statistics(self, df):
-        return {
-            'total_count': int(len(df)),
-            'avg_flowrate': float(df['Flowrate'].mean()),
-            'avg_pressure': float(df['Pressure'].mean()),
-            'avg_temperature': float(df['Temperature'].mean()),
-            'min_flowrate': float(df['Flowrate'].min()),
-            'max_flowrate': float(df['Flowrate'].max()),
-            'min_pressure': float(df['Pressure'].min()),
-            'max_pressure': float(df['Pressure'].max()),
-            'min_temperature': float(df['Temperature'].min()),
-            'max_temperature': float(df['Temperature'].max()),
-        }
+class RunningStatistics:
+    NUMERIC_COLUMNS = {'Flowrate': 'flowrate', 'Pressure': 'pressure', 'Temperature': 'temperature'}
+    MERGE_RULES = {'count': 'sum', 'sum': 'sum', 'sumsq': 'sum', 'min': 'min', 'max': 'max'}
+    QUANTILES = (5, 25, 50, 75, 95)
+    RELATIVE_ACCURACY = 0.01
+    GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+    SKETCH_LEVELS = ['equipment_type', 'metric', 'sign', 'bucket']
+    
+    def __init__(self):
+        self.state = None
+        self.sketch = None
+    
+    @property
+    def count(self):
+        return 0 if self.state is None else int(self.state['count'].sum())
+    
+    @classmethod
+    def from_records(cls, records):
+        records = list(records)
+        stats = cls()
+        columns = ['count'] + [
+            f'{stat}_{field}' for stat in ['sum', 'sumsq', 'min', 'max'] for field in cls.NUMERIC_COLUMNS.values()
+        ]
+        state = pd.DataFrame.from_records(
+            [{column: record[column] for column in ['equipment_type'] + columns} for record in records],
+            columns=['equipment_type'] + columns
+        ).set_index('equipment_type')
+        if not state.empty:
+            stats.state = state.astype(float).astype({'count': int})
+        
+        buckets = [
+            (record['equipment_type'], metric, sign, offset + position, count)
+            for record in records if record.get('sketch')
+            for metric, runs in record['sketch'].items()
+            for sign, offset, counts in runs
+            for position, count in enumerate(counts) if count
+        ]
+        if buckets:
+            stats.sketch = pd.DataFrame(buckets, columns=cls.SKETCH_LEVELS + ['count']).set_index(cls.SKETCH_LEVELS)['count']
+        return stats
+    
+    @classmethod
+    def aggregate(cls, df):
+        values = df[list(cls.NUMERIC_COLUMNS)].rename(columns=cls.NUMERIC_COLUMNS).astype('float64')
+        keys = df['Type'].astype(str)
+        grouped = values.groupby(keys, sort=False)
+        
+        state = pd.concat({
+            'sum': grouped.sum(),
+            'sumsq': values.pow(2).groupby(keys, sort=False).sum(),
+            'min': grouped.min(),
+            'max': grouped.max(),
+        }, axis=1)
+        state.columns = [f'{stat}_{field}' for stat, field in state.columns]
+        state.insert(0, 'count', grouped.size())
+        return state
     
-    def get_type_distribution(self, df):
-        type_counts = df['Type'].value_counts()
-        total = len(df)
+    @classmethod
+    def sketch_values(cls, df):
+        values = df[list(cls.NUMERIC_COLUMNS)].rename(columns=cls.NUMERIC_COLUMNS).astype('float64')
+        values.insert(0, 'equipment_type', df['Type'].astype(str).to_numpy())
+        values = values.melt(id_vars='equipment_type', var_name='metric').dropna(subset=['value'])
+        
+        x = values.pop('value').to_numpy()
+        magnitude = np.abs(x)
+        nonzero = magnitude > 0
+        logs = np.log(np.where(nonzero, magnitude, 1)) / np.log(cls.GAMMA)
+        values['sign'] = np.where(nonzero, np.sign(x), 0).astype('int64')
+        values['bucket'] = np.where(nonzero, np.ceil(logs), 0).astype('int64')
+        return values.groupby(cls.SKETCH_LEVELS, sort=False).size()
+    
+    def update(self, df):
+        if not df.empty:
+            self.merge(self.aggregate(df), self.sketch_values(df))
+    
+    def merge(self, state, sketch=None):
+        if sketch is not None:
+            if self.sketch is None:
+                self.sketch = sketch
+            else:
+                self.sketch = pd.concat([self.sketch, sketch]).groupby(level=self.SKETCH_LEVELS, sort=False).sum()
+        
+        if self.state is None:
+            self.state = state
+            return
+        
+        rules = {column: self.MERGE_RULES[column.split('_')[0]] for column in state.columns}
+        self.state = pd.concat([self.state, state]).groupby(level=0, sort=False).agg(rules)
+    
+    def compute_statistics(self):
+        count = self.count
+        summary = {'total_count': count}
+        for field in self.NUMERIC_COLUMNS.values():
+            summary[f'avg_{field}'] = float(self.state[f'sum_{field}'].sum()) / count
+            summary[f'min_{field}'] = float(self.state[f'min_{field}'].min())
+            summary[f'max_{field}'] = float(self.state[f'max_{field}'].max())
+        return summary
+    
+    def get_type_stats(self):
+        state = self.state.sort_values('count', ascending=False, kind='stable')
+        counts = state['count']
+        
+        stats = pd.DataFrame({'count': counts, 'percentage': (counts / self.count * 100).round(2)})
+        for field in self.NUMERIC_COLUMNS.values():
+            sums = state[f'sum_{field}']
+            variance = (state[f'sumsq_{field}'] - sums ** 2 / counts) / (counts - 1)
+            stats[f'avg_{field}'] = sums / counts
+            stats[f'min_{field}'] = state[f'min_{field}']
+            stats[f'max_{field}'] = state[f'max_{field}']
+            stats[f'std_{field}'] = np.sqrt(variance.clip(lower=0)).where(counts > 1)
+            stats[f'sum_{field}'] = sums
+            stats[f'sumsq_{field}'] = state[f'sumsq_{field}']
         
-        distribution = []
-        for eq_type, count in type_counts.items():
-            distribution.append({
+        sketches = self._serialize_sketch()
+        return [
+            {
                 'equipment_type': eq_type,
-                'count': int(count),
-                'percentage': round((int(count) / total) * 100, 2)
-            })
-        return distribution
+                **{key: (None if pd.isna(value) else value) for key, value in row.items()},
+                'sketch': sketches.get(eq_type),
+            }
+            for eq_type, row in stats.to_dict('index').items()
+        ]
     
-    def get_type_statistics(self, df, equipment_type):
-        type_df = df[df['Type'] == equipment_type]
+    def _serialize_sketch(self):
+        sketches = {}
+        if self.sketch is None:
+            return sketches
+        
+        for (eq_type, metric, sign), buckets in self.sketch.groupby(level=[0, 1, 2], sort=False):
+            indexes = buckets.index.get_level_values('bucket').to_numpy()
+            offset = int(indexes.min())
+            dense = np.zeros(int(indexes.max()) - offset + 1, dtype='int64')
+            dense[indexes - offset] = buckets.to_numpy()
+            sketches.setdefault(eq_type, {}).setdefault(metric, []).append([int(sign), offset, dense.tolist()])
+        return sketches
+    
+    def compute_distributions(self, bins=20):
+        state = self.state.sort_values('count', ascending=False, kind='stable')
+        sketch = self.sketch if self.sketch is not None else pd.Series(
+            [], dtype='int64', index=pd.MultiIndex.from_tuples([], names=self.SKETCH_LEVELS)
+        )
+        
+        overall = sketch.groupby(level=['metric', 'sign', 'bucket'], sort=False).sum()
+        by_type = dict(list(sketch.groupby(level='equipment_type', sort=False)))
+        
+        fields = self.NUMERIC_COLUMNS.values()
+        overall_ranges = {field: (state[f'min_{field}'].min(), state[f'max_{field}'].max()) for field in fields}
+        
+        return {
+            'bins': bins,
+            'quantiles': [f'p{q}' for q in self.QUANTILES],
+            'overall': self._metric_distributions(overall, overall_ranges, bins),
+            'types': {
+                eq_type: self._metric_distributions(
+                    by_type[eq_type].droplevel('equipment_type') if eq_type in by_type else overall.iloc[:0],
+                    {field: (row[f'min_{field}'], row[f'max_{field}']) for field in fields},
+                    bins
+                )
+                for eq_type, row in state.iterrows()
+            },
+        }
+    
+    def _metric_distributions(self, sketch, ranges, bins):
+        by_metric = dict(list(sketch.groupby(level='metric', sort=False)))
         return {
-            'avg_flowrate': float(type_df['Flowrate'].mean()),
-            'avg_pressure': float(type_df['Pressure'].mean()),
-            'avg_temperature': float(type_df['Temperature'].mean()),
-        }
\ No newline at end of file
+            field: self._distribution(by_metric[field].droplevel('metric'), low, high, bins)
+            if field in by_metric and not pd.isna(low) else None
+            for field, (low, high) in ranges.items()
+        }
+    
+    def _distribution(self, buckets, low, high, bins):
+        low, high = round(float(low), 2), round(float(high), 2)
+        signs = buckets.index.get_level_values('sign').to_numpy()
+        indexes = buckets.index.get_level_values('bucket').to_numpy()
+        counts = buckets.to_numpy()
+        
+        lower = np.where(signs > 0, self.GAMMA ** (indexes - 1), -self.GAMMA ** indexes) * (signs != 0)
+        upper = np.where(signs > 0, self.GAMMA ** indexes, -self.GAMMA ** (indexes - 1)) * (signs != 0)
+        lower, upper = np.clip(lower, low, high), np.clip(upper, low, high)
+        order = np.argsort(lower, kind='stable')
+        lower, upper, counts = lower[order], upper[order], counts[order]
+        width = upper - lower
+        
+        cumulative = np.cumsum(counts)
+        ranks = np.array(self.QUANTILES) / 100 * cumulative[-1]
+        position = np.minimum(np.searchsorted(cumulative, ranks, side='left'), len(counts) - 1)
+        below = cumulative[position] - counts[position]
+        quantiles = lower[position] + (ranks - below) / counts[position] * width[position]
+        
+        edges = np.linspace(low, high, bins + 1)
+        fraction = np.where(
+            width > 0,
+            np.clip((edges[:, None] - lower) / np.where(width > 0, width, 1), 0, 1),
+            edges[:, None] >= lower
+        )
+        cdf = np.round(fraction @ counts)
+        cdf[0], cdf[-1] = 0, cumulative[-1]
+        
+        return {
+            'edges': np.round(edges, 2).tolist(),
+            'counts': np.diff(cdf).astype(int).tolist(),
+            'quantiles': {f'p{q}': round(float(value), 2) for q, value in zip(self.QUANTILES, quantiles)},
+        }
@@ -0,0 +1,52 @@
+import os
+import tarfile
+import zipfile
+from io import BytesIO
+from .csv_parser import CSVParser
+from .analyzer import RunningStatistics
+
+ARCHIVE_EXTENSIONS = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2')
+
+def is_archive(filename):
+    return filename.lower().endswith(ARCHIVE_EXTENSIONS)
+
+def _is_csv_member(name):
+    basename = os.path.basename(name)
+    return basename.lower().endswith('.csv') and not basename.startswith(('.', '__MACOSX'))
+
+def iter_archive_members(file, filename, max_files, max_member_size):
+    file.seek(0)
+    try:
+        if filename.lower().endswith('.zip'):
+            with zipfile.ZipFile(file) as archive:
+                members = [info for info in archive.infolist() if not info.is_dir() and _is_csv_member(info.filename)]
+                _check_members(members, max_files, max_member_size, lambda info: (info.filename, info.file_size))
+                for info in members:
+                    yield os.path.basename(info.filename), archive.read(info)
+        else:
+            with tarfile.open(fileobj=file, mode='r:*') as archive:
+                members = [member for member in archive.getmembers() if member.isfile() and _is_csv_member(member.name)]
+                _check_members(members, max_files, max_member_size, lambda member: (member.name, member.size))
+                for member in members:
+                    yield os.path.basename(member.name), archive.extractfile(member).read()
+    except (zipfile.BadZipFile, tarfile.TarError) as e:
+        raise ValueError(f"Failed to read archive: {str(e)}")
+
+def _check_members(members, max_files, max_member_size, describe):
+    if not members:
+        raise ValueError("Archive contains no CSV files")
+    if len(members) > max_files:
+        raise ValueError(f"Archive contains more than {max_files} CSV files")
+    for member in members:
+        name, size = describe(member)
+        if size > max_member_size:
+            raise ValueError(f"'{name}' exceeds maximum limit of {max_member_size} bytes")
+
+def analyze_csv(data, profile='default'):
+    df = CSVParser(profile=profile).parse_file(BytesIO(data))
+    if df.empty:
+        raise ValueError("CSV file contains no data rows")
+    
+    stats = RunningStatistics()
+    stats.update(df)
+    return df, stats
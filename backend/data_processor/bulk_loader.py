@@ -0,0 +1,38 @@
+from itertools import islice, repeat
+from django.db import connection, transaction
+from django.utils import timezone
+from equipment_api.models import EquipmentData
+
+class ColumnarBulkLoader:
+    FIELDS = ['content_id', 'equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature', 'created_at']
+    
+    def __init__(self, batch_size=10000):
+        self.batch_size = batch_size
+        table = connection.ops.quote_name(EquipmentData._meta.db_table)
+        columns = ', '.join(connection.ops.quote_name(field) for field in self.FIELDS)
+        placeholders = ', '.join(['%s'] * len(self.FIELDS))
+        self.insert_sql = f'INSERT INTO {table} ({columns}) VALUES ({placeholders})'
+    
+    def load(self, content, df):
+        created_at = EquipmentData._meta.get_field('created_at').get_db_prep_value(
+            timezone.now(), connection
+        )
+        rows = zip(
+            repeat(content.pk),
+            df['Equipment Name'].astype(str).tolist(),
+            df['Type'].astype(str).tolist(),
+            df['Flowrate'].to_numpy(dtype=float).round(2).tolist(),
+            df['Pressure'].to_numpy(dtype=float).round(2).tolist(),
+            df['Temperature'].to_numpy(dtype=float).round(2).tolist(),
+            repeat(created_at),
+        )
+        
+        inserted = 0
+        with transaction.atomic(), connection.cursor() as cursor:
+            while True:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    break
+                cursor.executemany(self.insert_sql, batch)
+                inserted += len(batch)
+        return inserted
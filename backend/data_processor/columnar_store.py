@@ -0,0 +1,198 @@
+import json
+import os
+import shutil
+import uuid
+import numpy as np
+import pandas as pd
+
+class ColumnarWriter:
+    NUMERIC_COLUMNS = {'Flowrate': 'flowrate', 'Pressure': 'pressure', 'Temperature': 'temperature'}
+    FILES = ['id', 'type_code', 'name_offsets', 'names', *NUMERIC_COLUMNS.values()]
+    
+    def __init__(self, final_path, work_path, append=False, owns_work_path=True):
+        self.final_path = final_path
+        self.work_path = work_path
+        self.owns_work_path = owns_work_path
+        
+        if append:
+            dataset = ColumnarDataset(work_path)
+            self.row_count = dataset.row_count
+            self.types = list(dataset.types)
+            self.name_bytes = int(dataset.column('name_offsets')[-1])
+            self.sizes = {name: dataset.column(name).nbytes for name in self.FILES}
+            for name, size in self.sizes.items():
+                os.truncate(self._file_path(name), size)
+            self.files = {name: open(self._file_path(name), 'ab') for name in self.FILES}
+        else:
+            self.row_count = 0
+            self.types = []
+            self.name_bytes = 0
+            self.sizes = None
+            os.makedirs(work_path)
+            self.files = {name: open(self._file_path(name), 'wb') for name in self.FILES}
+            self.files['name_offsets'].write(np.zeros(1, dtype='<i8').tobytes())
+        
+        self.initial_row_count = self.row_count
+    
+    def _file_path(self, name):
+        return os.path.join(self.work_path, f'{name}.bin')
+    
+    def append(self, df):
+        types = df['Type'].astype(str)
+        for eq_type in pd.unique(types):
+            if eq_type not in self.types:
+                self.types.append(eq_type)
+        codes = pd.Index(self.types).get_indexer(types).astype('<i4')
+        self.files['type_code'].write(codes.tobytes())
+        
+        for column, name in self.NUMERIC_COLUMNS.items():
+            values = df[column].to_numpy(dtype='<f8').round(2)
+            self.files[name].write(values.tobytes())
+        
+        encoded = [name.encode('utf-8') for name in df['Equipment Name'].astype(str)]
+        lengths = np.fromiter((len(name) for name in encoded), dtype='<i8', count=len(encoded))
+        self.files['names'].write(b''.join(encoded))
+        self.files['name_offsets'].write((np.cumsum(lengths) + self.name_bytes).tobytes())
+        self.name_bytes += int(lengths.sum())
+        self.row_count += len(df)
+    
+    def write_ids(self, ids):
+        count = self.row_count - self.initial_row_count
+        self.files['id'].write(np.fromiter(ids, dtype='<i8', count=count).tobytes())
+    
+    def commit(self):
+        for file in self.files.values():
+            file.close()
+        manifest_path = os.path.join(self.work_path, 'manifest.json')
+        with open(f'{manifest_path}.tmp', 'w') as manifest:
+            json.dump({'row_count': self.row_count, 'types': self.types}, manifest)
+        os.replace(f'{manifest_path}.tmp', manifest_path)
+        
+        if self.work_path != self.final_path:
+            if os.path.exists(self.final_path):
+                shutil.rmtree(self.final_path)
+            os.replace(self.work_path, self.final_path)
+    
+    def abort(self):
+        for file in self.files.values():
+            file.close()
+        if self.owns_work_path:
+            shutil.rmtree(self.work_path, ignore_errors=True)
+        else:
+            for name, size in self.sizes.items():
+                os.truncate(self._file_path(name), size)
+
+class ColumnarDataset:
+    DTYPES = {
+        'id': '<i8',
+        'type_code': '<i4',
+        'name_offsets': '<i8',
+        'names': 'u1',
+        'flowrate': '<f8',
+        'pressure': '<f8',
+        'temperature': '<f8',
+    }
+    
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'manifest.json')) as manifest:
+            meta = json.load(manifest)
+        self.row_count = meta['row_count']
+        self.types = meta['types']
+    
+    def column(self, name):
+        if name == 'names':
+            length = int(self.column('name_offsets')[-1])
+        elif name == 'name_offsets':
+            length = self.row_count + 1
+        else:
+            length = self.row_count
+        
+        if length == 0:
+            return np.empty(0, dtype=self.DTYPES[name])
+        return np.memmap(os.path.join(self.path, f'{name}.bin'), dtype=self.DTYPES[name], mode='r', shape=(length,))
+    
+    def equipment_types(self, start=0, stop=None):
+        return np.asarray(self.types, dtype=object)[self.column('type_code')[start:stop]]
+    
+    def equipment_names(self, start=0, stop=None):
+        stop = self.row_count if stop is None else min(stop, self.row_count)
+        offsets = self.column('name_offsets')[start:stop + 1]
+        if len(offsets) < 2:
+            return []
+        blob = self.column('names')[offsets[0]:offsets[-1]].tobytes()
+        relative = (offsets - offsets[0]).tolist()
+        return [blob[a:b].decode('utf-8') for a, b in zip(relative[:-1], relative[1:])]
+    
+    def equipment_names_at(self, indices):
+        offsets = self.column('name_offsets')
+        names = self.column('names')
+        return [
+            names[offsets[index]:offsets[index + 1]].tobytes().decode('utf-8')
+            for index in np.asarray(indices).tolist()
+        ]
+    
+    def to_frame(self):
+        return pd.DataFrame({
+            'Equipment Name': self.equipment_names(),
+            'Type': pd.Categorical.from_codes(self.column('type_code'), categories=self.types),
+            'Flowrate': self.column('flowrate'),
+            'Pressure': self.column('pressure'),
+            'Temperature': self.column('temperature'),
+        })
+    
+    def to_records(self, start=0, stop=None):
+        return [
+            {
+                'id': row_id,
+                'equipment_name': name,
+                'equipment_type': eq_type,
+                'flowrate': f'{flowrate:.2f}',
+                'pressure': f'{pressure:.2f}',
+                'temperature': f'{temperature:.2f}',
+            }
+            for row_id, name, eq_type, flowrate, pressure, temperature in zip(
+                self.column('id')[start:stop].tolist(),
+                self.equipment_names(start, stop),
+                self.equipment_types(start, stop).tolist(),
+                self.column('flowrate')[start:stop].tolist(),
+                self.column('pressure')[start:stop].tolist(),
+                self.column('temperature')[start:stop].tolist(),
+            )
+        ]
+
+class ColumnarStore:
+    def __init__(self, root):
+        self.root = str(root)
+    
+    def path(self, key):
+        return os.path.join(self.root, key)
+    
+    def _temp_path(self, key):
+        return self.path(f'.{key}.{uuid.uuid4().hex}.tmp')
+    
+    def writer(self, key):
+        return ColumnarWriter(self.path(key), self._temp_path(key))
+    
+    def appender(self, key, new_key):
+        if self.open(key) is None:
+            return None
+        return ColumnarWriter(self.path(new_key), self.path(key), append=True, owns_work_path=False)
+    
+    def cloner(self, key, new_key, ids):
+        if self.open(key) is None:
+            return None
+        temp_path = self._temp_path(new_key)
+        shutil.copytree(self.path(key), temp_path)
+        with open(os.path.join(temp_path, 'id.bin'), 'wb') as id_file:
+            id_file.write(np.fromiter(ids, dtype='<i8').tobytes())
+        return ColumnarWriter(self.path(new_key), temp_path, append=True)
+    
+    def open(self, key):
+        path = self.path(key)
+        if not os.path.exists(os.path.join(path, 'manifest.json')):
+            return None
+        return ColumnarDataset(path)
+    
+    def delete(self, key):
+        shutil.rmtree(self.path(key), ignore_errors=True)
@@ -2,12 +2,35 @@ import pandas as pd
 import hashlib
 from io import BytesIO
 
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
 class CSVParser:
     REQUIRED_COLUMNS = ['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']
+    NUMERIC_COLUMNS = ['Flowrate', 'Pressure', 'Temperature']
+    HASH_CHUNK_SIZE = 64 * 1024
+    PROFILES = ('default', 'typed')
+    TYPED_DTYPES = {'Type': 'category', 'Flowrate': 'float64', 'Pressure': 'float64', 'Temperature': 'float64'}
+    
+    def __init__(self, profile='default'):
+        if profile not in self.PROFILES:
+            raise ValueError(f"Unknown CSV parser profile: {profile}")
+        self.profile = profile
+    
+    @property
+    def uses_arrow(self):
+        return self.profile == 'typed' and pa is not None
+    
+    def _read_options(self):
+        if self.profile == 'typed':
+            return {'dtype': self.TYPED_DTYPES}
+        return {}
     
     def parse_file(self, file):
         try:
-            df = pd.read_csv(file)
+            df = pd.read_csv(file, engine='pyarrow' if self.uses_arrow else 'c', **self._read_options())
         except Exception as e:
             raise ValueError(f"Failed to parse CSV: {str(e)}")
         
@@ -15,15 +38,32 @@ class CSVParser:
         self.validate_data_types(df)
         return df
     
+    def iter_chunks(self, file, chunk_size):
+        try:
+            reader = pd.read_csv(file, chunksize=chunk_size, **self._read_options())
+        except Exception as e:
+            raise ValueError(f"Failed to parse CSV: {str(e)}")
+        
+        with reader:
+            while True:
+                try:
+                    chunk = next(reader)
+                except StopIteration:
+                    return
+                except Exception as e:
+                    raise ValueError(f"Failed to parse CSV: {str(e)}")
+                
+                self.validate_structure(chunk)
+                self.validate_data_types(chunk)
+                yield chunk
+    
     def validate_structure(self, df):
         missing_cols = set(self.REQUIRED_COLUMNS) - set(df.columns)
         if missing_cols:
             raise ValueError(f"Missing required columns: {', '.join(missing_cols)}")
     
     def validate_data_types(self, df):
-        numeric_columns = ['Flowrate', 'Pressure', 'Temperature']
-        
-        for col in numeric_columns:
+        for col in self.NUMERIC_COLUMNS:
             if not pd.api.types.is_numeric_dtype(df[col]):
                 try:
                     df[col] = pd.to_numeric(df[col], errors='coerce')
@@ -38,6 +78,8 @@ class CSVParser:
     
     def generate_hash(self, file):
         file.seek(0)
-        content = file.read()
+        sha256 = hashlib.sha256()
+        for chunk in iter(lambda: file.read(self.HASH_CHUNK_SIZE), b''):
+            sha256.update(chunk)
         file.seek(0)
-        return hashlib.sha256(content).hexdigest()
\ No newline at end of file
+        return sha256.hexdigest()
\ No newline at end of file
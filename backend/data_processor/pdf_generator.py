@@ -6,30 +6,84 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from equipment_api.models import DatasetSummary, EquipmentTypeStats, EquipmentData
+from equipment_api.storage import open_columns
+from equipment_api.equipment_rows import iter_equipment_rows
+
+OVERVIEW_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#E3F2FD')),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+])
+
+def _data_table_style(font_size, padding):
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1976D2')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), font_size),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), padding),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')]),
+    ])
+
+SUMMARY_TABLE_STYLE = _data_table_style(10, 8)
+EQUIPMENT_TABLE_STYLE = _data_table_style(9, 6)
+
+@lru_cache(maxsize=None)
+def report_styles():
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1976D2'),
+        spaceAfter=30,
+        alignment=TA_CENTER
+    )
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#1976D2'),
+        spaceAfter=12,
+    )
+    return styles, title_style, heading_style
+
+class StreamingDocTemplate(SimpleDocTemplate):
+    def build(self, flowables, pending=(), **kwargs):
+        self._flowables = list(flowables)
+        self._pending = iter(pending)
+        self.filterFlowables(self._flowables)
+        super().build(self._flowables, **kwargs)
+    
+    def filterFlowables(self, flowables):
+        if flowables is self._flowables and len(flowables) < 2:
+            flowables.extend(islice(self._pending, 2))
 
 class PDFReportGenerator:
+    TEMPLATE_VERSION = 1
+    FULL_TABLE_ROWS = 45
+    EQUIPMENT_COLUMNS = ['Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']
+    
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self.title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1976D2'),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
-        self.heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=self.styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#1976D2'),
-            spaceAfter=12,
-        )
+        self.styles, self.title_style, self.heading_style = report_styles()
     
-    def generate_report(self, dataset):
+    def generate_report(self, dataset, full=False):
         buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
+        self.write_report(dataset, buffer, full=full)
+        buffer.seek(0)
+        return buffer
+    
+    def write_report(self, dataset, output, full=False, chunk_size=2000):
+        doc = StreamingDocTemplate(output, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
         elements = []
         
         elements.append(Paragraph("Equipment Analysis Report", self.title_style))
@@ -38,11 +92,13 @@ class PDFReportGenerator:
         elements.extend(self._create_overview_section(dataset))
         elements.extend(self._create_statistics_section(dataset))
         elements.extend(self._create_type_distribution_section(dataset))
-        elements.extend(self._create_equipment_table_section(dataset))
         
-        doc.build(elements)
-        buffer.seek(0)
-        return buffer
+        if full:
+            elements.append(Paragraph("Equipment Details", self.heading_style))
+            doc.build(elements, pending=self._iter_full_equipment_section(dataset, chunk_size))
+        else:
+            elements.extend(self._create_equipment_table_section(dataset))
+            doc.build(elements)
     
     def _create_overview_section(self, dataset):
         elements = []
@@ -56,15 +112,7 @@ class PDFReportGenerator:
         ]
         
         table = Table(data, colWidths=[2*inch, 4*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#E3F2FD')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-        ]))
+        table.setStyle(OVERVIEW_TABLE_STYLE)
         
         elements.append(table)
         elements.append(Spacer(1, 0.3*inch))
@@ -75,7 +123,7 @@ class PDFReportGenerator:
         elements.append(Paragraph("Statistical Summary", self.heading_style))
         
         try:
-            summary = DatasetSummary.objects.get(dataset=dataset)
+            summary = DatasetSummary.objects.get(content=dataset.content_id)
             
             data = [
                 ['Metric', 'Average', 'Minimum', 'Maximum'],
@@ -94,16 +142,7 @@ class PDFReportGenerator:
             ]
             
             table = Table(data, colWidths=[2*inch, 1.5*inch, 1.5*inch, 1.5*inch])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1976D2')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')]),
-            ]))
+            table.setStyle(SUMMARY_TABLE_STYLE)
             
             elements.append(table)
         except DatasetSummary.DoesNotExist:
@@ -116,7 +155,7 @@ class PDFReportGenerator:
         elements = []
         elements.append(Paragraph("Equipment Type Distribution", self.heading_style))
         
-        type_stats = EquipmentTypeStats.objects.filter(dataset=dataset).order_by('-count')
+        type_stats = EquipmentTypeStats.objects.filter(content=dataset.content_id).order_by('-count')
         
         if type_stats.exists():
             data = [['Equipment Type', 'Count', 'Percentage']]
@@ -124,16 +163,7 @@ class PDFReportGenerator:
                 data.append([stat.equipment_type, str(stat.count), f'{stat.percentage:.2f}%'])
             
             table = Table(data, colWidths=[3*inch, 1.5*inch, 1.5*inch])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1976D2')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')]),
-            ]))
+            table.setStyle(SUMMARY_TABLE_STYLE)
             
             elements.append(table)
         else:
@@ -142,46 +172,83 @@ class PDFReportGenerator:
         elements.append(Spacer(1, 0.3*inch))
         return elements
     
+    def _equipment_rows(self, dataset, limit):
+        columns = open_columns(dataset.content)
+        if columns is None:
+            return list(EquipmentData.objects.filter(content=dataset.content_id).values_list(
+                'equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature'
+            )[:limit])
+        
+        return list(zip(
+            columns.equipment_names(0, limit),
+            columns.equipment_types(0, limit).tolist(),
+            columns.column('flowrate')[:limit].tolist(),
+            columns.column('pressure')[:limit].tolist(),
+            columns.column('temperature')[:limit].tolist(),
+        ))
+    
     def _create_equipment_table_section(self, dataset):
         elements = []
         elements.append(Paragraph("Equipment Details", self.heading_style))
         
-        equipment = EquipmentData.objects.filter(dataset=dataset)[:20]
-        
-        if equipment.exists():
-            data = [['Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']]
-            for eq in equipment:
-                data.append([
-                    eq.equipment_name,
-                    eq.equipment_type,
-                    f'{eq.flowrate:.2f}' if eq.flowrate else 'N/A',
-                    f'{eq.pressure:.2f}' if eq.pressure else 'N/A',
-                    f'{eq.temperature:.2f}' if eq.temperature else 'N/A'
-                ])
-            
-            table = Table(data, colWidths=[1.5*inch, 1.3*inch, 1.2*inch, 1.2*inch, 1.3*inch])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1976D2')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')]),
-            ]))
+        rows = self._equipment_rows(dataset, 20)
+        
+        if rows:
+            table = self._equipment_table([
+                (
+                    name,
+                    eq_type,
+                    f'{flowrate:.2f}' if flowrate else 'N/A',
+                    f'{pressure:.2f}' if pressure else 'N/A',
+                    f'{temperature:.2f}' if temperature else 'N/A'
+                )
+                for name, eq_type, flowrate, pressure, temperature in rows
+            ])
             
             elements.append(table)
             
-            if EquipmentData.objects.filter(dataset=dataset).count() > 20:
+            if dataset.row_count > 20:
                 elements.append(Spacer(1, 0.1*inch))
                 elements.append(Paragraph(f"Showing first 20 of {dataset.row_count} equipment entries", 
                                           self.styles['Normal']))
         else:
             elements.append(Paragraph("No equipment data available", self.styles['Normal']))
         
-        elements.append(Spacer(1, 0.3*inch))
-        elements.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 
-                                  self.styles['Normal']))
+        elements.extend(self._create_footer())
+        return elements
+    
+    def _equipment_table(self, rows):
+        table = Table([self.EQUIPMENT_COLUMNS, *rows], colWidths=[1.5*inch, 1.3*inch, 1.2*inch, 1.2*inch, 1.3*inch],
+                      repeatRows=1)
+        table.setStyle(EQUIPMENT_TABLE_STYLE)
+        return table
+    
+    def _iter_full_equipment_section(self, dataset, chunk_size):
+        rows = (
+            (
+                row['equipment_name'],
+                row['equipment_type'],
+                row['flowrate'] or 'N/A',
+                row['pressure'] or 'N/A',
+                row['temperature'] or 'N/A',
+            )
+            for row in iter_equipment_rows(dataset.content, chunk_size)
+        )
+        
+        empty = True
+        while True:
+            batch = list(islice(rows, self.FULL_TABLE_ROWS))
+            if not batch:
+                break
+            empty = False
+            yield self._equipment_table(batch)
         
-        return elements
\ No newline at end of file
+        if empty:
+            yield Paragraph("No equipment data available", self.styles['Normal'])
+        yield from self._create_footer()
+    
+    def _create_footer(self):
+        return [
+            Spacer(1, 0.3*inch),
+            Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", self.styles['Normal']),
+        ]
\ No newline at end of file
@@ -0,0 +1,77 @@
+import os
+import shutil
+import uuid
+
+class ReportStore:
+    def __init__(self, root, max_bytes):
+        self.root = str(root)
+        self.max_bytes = max_bytes
+    
+    def relative_path(self, dataset_id, version, content_key, full=False):
+        suffix = '-full' if full else ''
+        return f'{dataset_id}/v{version}-{content_key[:16]}{suffix}.pdf'
+    
+    def path(self, dataset_id, version, content_key, full=False):
+        return os.path.join(self.root, self.relative_path(dataset_id, version, content_key, full))
+    
+    def get(self, dataset_id, version, content_key, full=False):
+        path = self.path(dataset_id, version, content_key, full)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+    
+    def put(self, dataset_id, version, content_key, data, full=False):
+        return self.write(dataset_id, version, content_key, lambda report: report.write(data), full)
+    
+    def write(self, dataset_id, version, content_key, render, full=False):
+        path = self.path(dataset_id, version, content_key, full)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = os.path.join(os.path.dirname(path), f'.{uuid.uuid4().hex}.tmp')
+        try:
+            with open(temp_path, 'wb') as report:
+                render(report)
+        except Exception:
+            self._remove(temp_path)
+            raise
+        os.replace(temp_path, path)
+        
+        for entry in os.scandir(os.path.dirname(path)):
+            stale = entry.path != path and entry.name.endswith('.pdf')
+            if stale and entry.name.endswith('-full.pdf') == full:
+                self._remove(entry.path)
+        self.evict()
+        return path
+    
+    def delete(self, dataset_id):
+        shutil.rmtree(os.path.join(self.root, str(dataset_id)), ignore_errors=True)
+    
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    
+    def _entries(self):
+        entries = []
+        for directory, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if not filename.endswith('.pdf'):
+                    continue
+                path = os.path.join(directory, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+    
+    def evict(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
@@ -1,5 +1,10 @@
 from django.contrib import admin
-from .models import Dataset, EquipmentData, DatasetSummary, EquipmentTypeStats
+from .models import DatasetContent, Dataset, EquipmentData, DatasetSummary, EquipmentTypeStats, IngestionJob, ReportJob
+
+@admin.register(DatasetContent)
+class DatasetContentAdmin(admin.ModelAdmin):
+    list_display = ['file_hash', 'row_count', 'file_size', 'created_at']
+    search_fields = ['file_hash']
 
 @admin.register(Dataset)
 class DatasetAdmin(admin.ModelAdmin):
@@ -9,15 +14,27 @@ class DatasetAdmin(admin.ModelAdmin):
 
 @admin.register(EquipmentData)
 class EquipmentDataAdmin(admin.ModelAdmin):
-    list_display = ['equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature', 'dataset']
+    list_display = ['equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature', 'content']
     list_filter = ['equipment_type']
     search_fields = ['equipment_name', 'equipment_type']
 
 @admin.register(DatasetSummary)
 class DatasetSummaryAdmin(admin.ModelAdmin):
-    list_display = ['dataset', 'total_count', 'avg_flowrate', 'avg_pressure', 'avg_temperature']
+    list_display = ['content', 'total_count', 'avg_flowrate', 'avg_pressure', 'avg_temperature']
 
 @admin.register(EquipmentTypeStats)
 class EquipmentTypeStatsAdmin(admin.ModelAdmin):
-    list_display = ['dataset', 'equipment_type', 'count', 'percentage']
-    list_filter = ['equipment_type']
\ No newline at end of file
+    list_display = ['content', 'equipment_type', 'count', 'percentage']
+    list_filter = ['equipment_type']
+
+@admin.register(IngestionJob)
+class IngestionJobAdmin(admin.ModelAdmin):
+    list_display = ['filename', 'user', 'status', 'stage', 'rows_processed', 'created_at']
+    list_filter = ['status']
+    search_fields = ['filename', 'user__username']
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ['dataset', 'user', 'full', 'status', 'created_at', 'finished_at']
+    list_filter = ['status', 'full']
+    search_fields = ['dataset__filename', 'user__username']
\ No newline at end of file
@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class EquipmentApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'equipment_api'
\ No newline at end of file
+    name = 'equipment_api'
+    
+    def ready(self):
+        from . import signals
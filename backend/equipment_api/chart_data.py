@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+from .storage import open_columns
+
+CHART_METRICS = ['flowrate', 'pressure', 'temperature']
+
+def _int_param(params, name, default, minimum, maximum):
+    try:
+        value = int(params.get(name, default))
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+    return max(minimum, min(value, maximum))
+
+def _metric_param(params, name, default):
+    value = params.get(name, default)
+    if value not in CHART_METRICS:
+        raise ValueError(f"{name} must be one of: {', '.join(CHART_METRICS)}")
+    return value
+
+def parse_chart_options(params, default_bins, max_bins, default_top, max_top):
+    chart = params.get('chart', 'scatter')
+    if chart == 'scatter':
+        options = {
+            'x': _metric_param(params, 'x', 'pressure'),
+            'y': _metric_param(params, 'y', 'temperature'),
+            'bins': _int_param(params, 'bins', default_bins, 2, max_bins),
+            'equipment_type': params.get('type', ''),
+        }
+        if options['x'] == options['y']:
+            raise ValueError("x and y must be different metrics")
+    elif chart == 'top':
+        options = {
+            'metric': _metric_param(params, 'metric', 'flowrate'),
+            'n': _int_param(params, 'n', default_top, 1, max_top),
+        }
+    else:
+        raise ValueError(f"chart must be one of: {', '.join(CHART_BUILDERS)}")
+    return chart, options
+
+def _chart_columns(content, fields, with_names=False):
+    columns = open_columns(content)
+    if columns is not None:
+        data = {field: np.asarray(columns.column(field)) for field in fields}
+        return columns.types, np.asarray(columns.column('type_code')), data, columns.equipment_names_at
+    
+    values = ['equipment_type', *fields] + (['equipment_name'] if with_names else [])
+    frame = pd.DataFrame.from_records(content.equipment.order_by('id').values_list(*values).iterator(), columns=values)
+    codes, types = pd.factorize(frame['equipment_type'])
+    data = {field: frame[field].astype('float64').to_numpy() for field in fields}
+    names = frame['equipment_name'].to_numpy() if with_names else None
+    return list(types), codes, data, lambda indices: names[indices].tolist()
+
+def _value_range(values):
+    low, high = round(float(values.min()), 2), round(float(values.max()), 2)
+    return (low, high) if high > low else (low - 0.5, high + 0.5)
+
+def scatter_chart(content, x, y, bins, equipment_type=''):
+    types, codes, data, _ = _chart_columns(content, [x, y])
+    xs, ys = data[x], data[y]
+    mask = ~(np.isnan(xs) | np.isnan(ys))
+    if equipment_type:
+        mask &= codes == (types.index(equipment_type) if equipment_type in types else -1)
+    xs, ys = xs[mask], ys[mask]
+    
+    result = {'chart': 'scatter', 'x': x, 'y': y, 'bins': bins, 'type': equipment_type or None, 'total': int(len(xs))}
+    if not len(xs):
+        return {**result, 'x_edges': [], 'y_edges': [], 'cells': []}
+    
+    counts, x_edges, y_edges = np.histogram2d(xs, ys, bins=bins, range=[_value_range(xs), _value_range(ys)])
+    rows, cols = np.nonzero(counts)
+    return {
+        **result,
+        'x_edges': np.round(x_edges, 2).tolist(),
+        'y_edges': np.round(y_edges, 2).tolist(),
+        'cells': np.column_stack([rows, cols, counts[rows, cols]]).astype(int).tolist(),
+    }
+
+def top_chart(content, metric, n):
+    types, codes, data, names_at = _chart_columns(content, [metric], with_names=True)
+    values = data[metric]
+    valid = np.flatnonzero(~np.isnan(values))
+    order = valid[np.lexsort((-values[valid], codes[valid]))]
+    
+    sorted_codes = codes[order]
+    type_codes = np.arange(len(types))
+    starts = np.searchsorted(sorted_codes, type_codes, side='left')
+    stops = np.minimum(starts + n, np.searchsorted(sorted_codes, type_codes, side='right'))
+    selected = order[np.concatenate([np.arange(start, stop) for start, stop in zip(starts, stops)] or [[]]).astype(int)]
+    names = iter(names_at(selected))
+    top_values = iter(values[selected].tolist())
+    
+    return {
+        'chart': 'top',
+        'metric': metric,
+        'n': n,
+        'types': [
+            {
+                'equipment_type': eq_type,
+                'equipment': [
+                    {'equipment_name': next(names), metric: round(next(top_values), 2)}
+                    for _ in range(stop - start)
+                ],
+            }
+            for eq_type, start, stop in zip(types, starts, stops)
+        ],
+    }
+
+CHART_BUILDERS = {'scatter': scatter_chart, 'top': top_chart}
@@ -0,0 +1,86 @@
+import numpy as np
+from .models import DatasetSummary, EquipmentTypeStats
+
+SUMMARY_METRICS = [
+    'total_count',
+    'avg_flowrate', 'avg_pressure', 'avg_temperature',
+    'min_flowrate', 'max_flowrate',
+    'min_pressure', 'max_pressure',
+    'min_temperature', 'max_temperature',
+]
+TYPE_METRICS = ['count', 'percentage', 'avg_flowrate', 'avg_pressure', 'avg_temperature']
+COUNT_METRICS = {'total_count', 'count'}
+
+def _values(array, integer=False):
+    digits = None if integer else 2
+    return [None if np.isnan(value) else round(value, digits) for value in array.tolist()]
+
+def _summary_matrix(content_ids):
+    rows = DatasetSummary.objects.filter(content__in=set(content_ids)).values_list('content_id', *SUMMARY_METRICS)
+    summaries = {content_id: values for content_id, *values in rows}
+    empty = [None] * len(SUMMARY_METRICS)
+    return np.array([summaries.get(content_id, empty) for content_id in content_ids], dtype=float)
+
+def _type_cube(content_ids):
+    positions = {}
+    for position, content_id in enumerate(content_ids):
+        positions.setdefault(content_id, []).append(position)
+    
+    rows = list(EquipmentTypeStats.objects.filter(content__in=positions).values_list(
+        'content_id', 'equipment_type', *TYPE_METRICS
+    ))
+    types = list(dict.fromkeys(row[1] for row in rows))
+    type_index = {eq_type: index for index, eq_type in enumerate(types)}
+    
+    cube = np.full((len(types), len(content_ids), len(TYPE_METRICS)), np.nan)
+    for content_id, eq_type, *values in rows:
+        cube[type_index[eq_type], positions[content_id]] = np.array(values, dtype=float)
+    cube[:, :, :2] = np.nan_to_num(cube[:, :, :2])
+    
+    order = np.argsort(-cube[:, :, 0].sum(axis=1), kind='stable')
+    return [types[index] for index in order], cube[order]
+
+def compare_datasets(datasets):
+    content_ids = [dataset.content_id for dataset in datasets]
+    
+    matrix = _summary_matrix(content_ids)
+    deltas = matrix - matrix[0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        changes = np.where(matrix[0] != 0, deltas / matrix[0] * 100, np.nan)
+    
+    types, cube = _type_cube(content_ids)
+    shifts = cube - cube[:, :1, :]
+    
+    return {
+        'baseline_id': datasets[0].id,
+        'datasets': [
+            {
+                'id': dataset.id,
+                'filename': dataset.filename,
+                'upload_date': dataset.upload_date,
+                'row_count': dataset.row_count,
+            }
+            for dataset in datasets
+        ],
+        'metrics': {
+            metric: {
+                'values': _values(matrix[:, column], metric in COUNT_METRICS),
+                'deltas': _values(deltas[:, column], metric in COUNT_METRICS),
+                'percent_change': _values(changes[:, column]),
+            }
+            for column, metric in enumerate(SUMMARY_METRICS)
+        },
+        'types': [
+            {
+                'equipment_type': eq_type,
+                **{
+                    metric: {
+                        'values': _values(cube[index, :, column], metric in COUNT_METRICS),
+                        'deltas': _values(shifts[index, :, column], metric in COUNT_METRICS),
+                    }
+                    for column, metric in enumerate(TYPE_METRICS)
+                },
+            }
+            for index, eq_type in enumerate(types)
+        ],
+    }
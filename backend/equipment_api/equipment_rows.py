@@ -0,0 +1,93 @@
+from itertools import islice
+import numpy as np
+from .renderers import ColumnarData, json_dumps
+from .storage import open_columns
+
+EQUIPMENT_FIELDS = ['id', 'equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature']
+
+def _format_decimal(value):
+    return None if value is None else f'{value:.2f}'
+
+def equipment_records(rows):
+    return [
+        {
+            'id': row_id,
+            'equipment_name': name,
+            'equipment_type': eq_type,
+            'flowrate': _format_decimal(flowrate),
+            'pressure': _format_decimal(pressure),
+            'temperature': _format_decimal(temperature),
+        }
+        for row_id, name, eq_type, flowrate, pressure, temperature in rows
+    ]
+
+def equipment_columns(content, after=0, limit=None):
+    columns = open_columns(content)
+    if columns is not None:
+        start = int(np.searchsorted(columns.column('id'), after, side='right')) if after else 0
+        stop = None if limit is None else start + limit
+        return ColumnarData(
+            id=np.asarray(columns.column('id')[start:stop]),
+            equipment_name=columns.equipment_names(start, stop),
+            equipment_type=columns.equipment_types(start, stop).tolist(),
+            flowrate=np.asarray(columns.column('flowrate')[start:stop]),
+            pressure=np.asarray(columns.column('pressure')[start:stop]),
+            temperature=np.asarray(columns.column('temperature')[start:stop]),
+        )
+    
+    queryset = content.equipment.filter(id__gt=after).order_by('id')
+    if limit is not None:
+        queryset = queryset[:limit]
+    return equipment_column_data(queryset.values_list(*EQUIPMENT_FIELDS))
+
+def equipment_column_data(rows):
+    rows = list(rows)
+    row_ids, names, eq_types, flowrates, pressures, temperatures = zip(*rows) if rows else ([],) * 6
+    return ColumnarData(
+        id=np.array(row_ids, dtype='<i8'),
+        equipment_name=list(names),
+        equipment_type=list(eq_types),
+        flowrate=np.array(flowrates, dtype='<f8'),
+        pressure=np.array(pressures, dtype='<f8'),
+        temperature=np.array(temperatures, dtype='<f8'),
+    )
+
+def all_equipment(content):
+    columns = open_columns(content)
+    if columns is not None:
+        return columns.to_records()
+    return equipment_records(content.equipment.order_by('id').values_list(*EQUIPMENT_FIELDS))
+
+def equipment_page(content, after, limit):
+    columns = open_columns(content)
+    if columns is not None:
+        start = int(np.searchsorted(columns.column('id'), after, side='right'))
+        return columns.to_records(start, start + limit)
+    
+    queryset = content.equipment.filter(id__gt=after).order_by('id')[:limit]
+    return equipment_records(queryset.values_list(*EQUIPMENT_FIELDS))
+
+def iter_equipment_rows(content, chunk_size):
+    columns = open_columns(content)
+    if columns is not None:
+        for start in range(0, columns.row_count, chunk_size):
+            yield from columns.to_records(start, start + chunk_size)
+        return
+    
+    rows = content.equipment.order_by('id').values_list(*EQUIPMENT_FIELDS).iterator(chunk_size=chunk_size)
+    while True:
+        batch = list(islice(rows, chunk_size))
+        if not batch:
+            return
+        yield from equipment_records(batch)
+
+def stream_json_array(rows, chunk_size):
+    yield b'['
+    separator = b''
+    while True:
+        batch = list(islice(rows, chunk_size))
+        if not batch:
+            break
+        yield separator + json_dumps(batch)[1:-1]
+        separator = b','
+    yield b']'
@@ -0,0 +1,262 @@
+import hashlib
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from .models import DatasetContent, Dataset, EquipmentData, DatasetSummary, EquipmentTypeStats
+from .storage import get_columnar_store
+from data_processor.csv_parser import CSVParser
+from data_processor.analyzer import RunningStatistics
+from data_processor.bulk_loader import ColumnarBulkLoader
+from data_processor.archive import iter_archive_members, analyze_csv
+
+def _summary_fields(stats):
+    return {**stats.compute_statistics(), 'distributions': stats.compute_distributions(settings.DISTRIBUTION_BINS)}
+
+def _ingest_content(chunks, file_hash, file_size, progress=None, stats=None):
+    analyzed = stats is not None
+    stats = stats if analyzed else RunningStatistics()
+    loader = ColumnarBulkLoader(batch_size=settings.INGEST_INSERT_BATCH_SIZE)
+    store = get_columnar_store()
+    writer = store.writer(file_hash) if store else None
+    
+    try:
+        content = DatasetContent.objects.create(file_hash=file_hash, file_size=file_size)
+        
+        rows = 0
+        for chunk in chunks:
+            loader.load(content, chunk)
+            if not analyzed:
+                stats.update(chunk)
+            if writer:
+                writer.append(chunk)
+            rows += len(chunk)
+            if progress:
+                progress('processing', rows)
+        
+        if rows == 0:
+            raise ValueError("CSV file contains no data rows")
+        
+        if progress:
+            progress('finalizing', rows)
+        
+        content.row_count = stats.count
+        content.save(update_fields=['row_count'])
+        
+        DatasetSummary.objects.create(content=content, **_summary_fields(stats))
+        EquipmentTypeStats.objects.bulk_create([
+            EquipmentTypeStats(content=content, **type_stats)
+            for type_stats in stats.get_type_stats()
+        ])
+        
+        if writer:
+            ids = EquipmentData.objects.filter(content=content).order_by('id').values_list('id', flat=True)
+            writer.write_ids(ids.iterator(chunk_size=settings.INGEST_INSERT_BATCH_SIZE))
+            transaction.on_commit(writer.commit)
+    except Exception:
+        if writer:
+            writer.abort()
+        raise
+    
+    return content
+
+def find_content(file_hash):
+    return DatasetContent.objects.filter(file_hash=file_hash).first()
+
+def ingest_csv(user, file, filename, file_hash, file_size, chunk_size=None, progress=None):
+    chunk_size = chunk_size or settings.INGEST_CHUNK_SIZE
+    
+    with transaction.atomic():
+        content = find_content(file_hash)
+        if content is None:
+            parser = CSVParser(profile=settings.CSV_PARSER_PROFILE)
+            content = _ingest_content(parser.iter_chunks(file, chunk_size), file_hash, file_size, progress)
+        
+        dataset = Dataset.objects.create(
+            user=user,
+            content=content,
+            filename=filename,
+            file_hash=file_hash,
+            file_size=file_size,
+            row_count=content.row_count
+        )
+    
+    return dataset
+
+def _commit_archive_batch(user, batch):
+    with transaction.atomic():
+        for result, file_hash, file_size, analysis in batch:
+            try:
+                with transaction.atomic():
+                    content = find_content(file_hash)
+                    if content is None:
+                        df, stats = analysis
+                        content = _ingest_content([df], file_hash, file_size, stats=stats)
+                    
+                    dataset = Dataset.objects.create(
+                        user=user,
+                        content=content,
+                        filename=result['filename'],
+                        file_hash=file_hash,
+                        file_size=file_size,
+                        row_count=content.row_count
+                    )
+            except (ValueError, IntegrityError) as e:
+                result.update(status='failed', error=str(e))
+            else:
+                result.update(status='created', dataset_id=dataset.id, row_count=dataset.row_count)
+
+def _commit_finished(user, futures, return_when):
+    done, _ = wait(futures, return_when=return_when)
+    batch = []
+    for future in done:
+        result, file_hash, file_size = futures.pop(future)
+        try:
+            batch.append((result, file_hash, file_size, future.result()))
+        except ValueError as e:
+            result.update(status='failed', error=str(e))
+    _commit_archive_batch(user, batch)
+
+def ingest_archive(user, file, filename):
+    results = []
+    futures = {}
+    seen = set()
+    
+    with ProcessPoolExecutor(max_workers=settings.ARCHIVE_WORKERS) as executor:
+        members = iter_archive_members(file, filename, settings.ARCHIVE_MAX_FILES, settings.MAX_UPLOAD_SIZE)
+        for member_name, data in members:
+            result = {'filename': member_name}
+            results.append(result)
+            
+            file_hash = hashlib.sha256(data).hexdigest()
+            if file_hash in seen or Dataset.objects.filter(user=user, file_hash=file_hash).exists():
+                result.update(status='duplicate', error='This file has already been uploaded.')
+                continue
+            seen.add(file_hash)
+            
+            if find_content(file_hash):
+                _commit_archive_batch(user, [(result, file_hash, len(data), None)])
+                continue
+            
+            futures[executor.submit(analyze_csv, data, settings.CSV_PARSER_PROFILE)] = (result, file_hash, len(data))
+            if len(futures) >= settings.ARCHIVE_MAX_IN_FLIGHT:
+                _commit_finished(user, futures, FIRST_COMPLETED)
+        
+        if futures:
+            _commit_finished(user, futures, ALL_COMPLETED)
+    
+    return results
+
+def _content_key(file_hash, appended_hash):
+    return hashlib.sha256(f'{file_hash}:{appended_hash}'.encode()).hexdigest()
+
+def _copy_fields(instance, exclude=('id', 'content')):
+    return {
+        field.attname: getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields
+        if field.name not in exclude
+    }
+
+def _clone_content(content, key):
+    clone = DatasetContent.objects.create(file_hash=key, file_size=content.file_size, row_count=content.row_count)
+    
+    table = connection.ops.quote_name(EquipmentData._meta.db_table)
+    columns = ', '.join(
+        connection.ops.quote_name(field)
+        for field in ['equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature', 'created_at']
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (content_id, {columns}) '
+            f'SELECT %s, {columns} FROM {table} WHERE content_id = %s ORDER BY id',
+            [clone.pk, content.pk]
+        )
+    
+    DatasetSummary.objects.create(content=clone, **_copy_fields(content.summary))
+    EquipmentTypeStats.objects.bulk_create([
+        EquipmentTypeStats(content=clone, **_copy_fields(type_stats))
+        for type_stats in content.type_stats.all()
+    ])
+    return clone
+
+def _save_statistics(content, stats):
+    DatasetSummary.objects.filter(content=content).update(**_summary_fields(stats))
+    
+    existing = {type_stats.equipment_type: type_stats for type_stats in content.type_stats.all()}
+    created, updated = [], []
+    for row in stats.get_type_stats():
+        type_stats = existing.get(row['equipment_type'])
+        if type_stats is None:
+            created.append(EquipmentTypeStats(content=content, **row))
+            continue
+        for field, value in row.items():
+            setattr(type_stats, field, value)
+        updated.append(type_stats)
+    
+    EquipmentTypeStats.objects.bulk_create(created)
+    if updated:
+        fields = [field for field in stats.get_type_stats()[0] if field != 'equipment_type']
+        EquipmentTypeStats.objects.bulk_update(updated, fields)
+
+def append_csv(dataset, file, file_hash, file_size, chunk_size=None):
+    parser = CSVParser(profile=settings.CSV_PARSER_PROFILE)
+    loader = ColumnarBulkLoader(batch_size=settings.INGEST_INSERT_BATCH_SIZE)
+    store = get_columnar_store()
+    chunk_size = chunk_size or settings.INGEST_CHUNK_SIZE
+    
+    with transaction.atomic():
+        dataset = Dataset.objects.select_related('content').get(pk=dataset.pk)
+        content = previous = dataset.content
+        key = _content_key(content.file_hash, file_hash)
+        
+        existing = find_content(key)
+        if existing is not None:
+            appended = existing.row_count - content.row_count
+            dataset.content = existing
+        else:
+            if content.datasets.exclude(pk=dataset.pk).exists():
+                content = _clone_content(content, key)
+                ids = EquipmentData.objects.filter(content=content).order_by('id').values_list('id', flat=True)
+                writer = store.cloner(previous.file_hash, key, ids.iterator()) if store else None
+            else:
+                writer = store.appender(content.file_hash, key) if store else None
+                content.file_hash = key
+            
+            stats = RunningStatistics.from_records(content.type_stats.values())
+            last_id = EquipmentData.objects.filter(content=content).order_by('-id').values_list('id', flat=True).first() or 0
+            appended = 0
+            
+            try:
+                for chunk in parser.iter_chunks(file, chunk_size):
+                    loader.load(content, chunk)
+                    stats.update(chunk)
+                    if writer:
+                        writer.append(chunk)
+                    appended += len(chunk)
+                
+                if appended == 0:
+                    raise ValueError("CSV file contains no data rows")
+                
+                _save_statistics(content, stats)
+                content.row_count = stats.count
+                content.file_size = (content.file_size or 0) + file_size
+                content.save(update_fields=['file_hash', 'row_count', 'file_size'])
+                
+                if writer:
+                    ids = EquipmentData.objects.filter(content=content, id__gt=last_id).order_by('id').values_list('id', flat=True)
+                    writer.write_ids(ids.iterator(chunk_size=settings.INGEST_INSERT_BATCH_SIZE))
+                    transaction.on_commit(writer.commit)
+            except Exception:
+                if writer:
+                    writer.abort()
+                raise
+            
+            dataset.content = content
+        
+        dataset.row_count = dataset.content.row_count
+        dataset.file_size = (dataset.file_size or 0) + file_size
+        dataset.save(update_fields=['content', 'row_count', 'file_size'])
+        
+        if existing is not None:
+            DatasetContent.objects.filter(pk=previous.pk, datasets__isnull=True).delete()
+    
+    return dataset, appended
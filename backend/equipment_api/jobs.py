@@ -0,0 +1,66 @@
+import logging
+from django.conf import settings
+from django.core.cache import caches
+from django.db import OperationalError
+from django.utils import timezone
+from .models import IngestionJob
+from .ingestion import ingest_csv
+from .workers import claim_next, requeue_interrupted
+
+logger = logging.getLogger(__name__)
+
+def _progress_key(job_id):
+    return f'ingest-job:{job_id}'
+
+def get_job_progress(job):
+    if job.status != IngestionJob.STATUS_RUNNING:
+        return job.stage, job.rows_processed
+    return caches['jobs'].get(_progress_key(job.id), (job.stage, job.rows_processed))
+
+def claim_next_job():
+    return claim_next(IngestionJob, stage='processing')
+
+def requeue_interrupted_jobs():
+    return requeue_interrupted(IngestionJob, stage='queued', rows_processed=0)
+
+def process_job(job):
+    cache = caches['jobs']
+    
+    def report(stage, rows_processed):
+        cache.set(_progress_key(job.id), (stage, rows_processed))
+    
+    try:
+        with job.upload.open('rb') as file:
+            dataset = ingest_csv(job.user, file, job.filename, job.file_hash, job.file_size, progress=report)
+        job.status = IngestionJob.STATUS_COMPLETED
+        job.stage = 'done'
+        job.dataset = dataset
+        job.rows_processed = dataset.row_count
+    except ValueError as e:
+        job.status = IngestionJob.STATUS_FAILED
+        job.stage = 'failed'
+        job.error = str(e)
+    except OperationalError:
+        if job.attempts < settings.INGEST_MAX_ATTEMPTS:
+            logger.warning('Ingestion job %s hit a locked database, requeueing', job.id)
+            job.status = IngestionJob.STATUS_PENDING
+            job.stage = 'queued'
+            job.started_at = None
+            job.save()
+            cache.delete(_progress_key(job.id))
+            return job
+        logger.exception('Ingestion job %s failed', job.id)
+        job.status = IngestionJob.STATUS_FAILED
+        job.stage = 'failed'
+        job.error = 'An error occurred while processing the file.'
+    except Exception:
+        logger.exception('Ingestion job %s failed', job.id)
+        job.status = IngestionJob.STATUS_FAILED
+        job.stage = 'failed'
+        job.error = 'An error occurred while processing the file.'
+    
+    job.finished_at = timezone.now()
+    job.save()
+    job.upload.delete(save=False)
+    cache.delete(_progress_key(job.id))
+    return job
@@ -0,0 +1,68 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from equipment_api.retention import RetentionPolicy, compact, database_size
+
+class Command(BaseCommand):
+    help = 'Hard-delete inactive datasets according to the retention policy and reclaim database space.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--max-age-days', type=int, help='Purge datasets deactivated at least this many days ago.')
+        parser.add_argument('--keep-inactive', type=int, help='Inactive datasets to keep per user.')
+        parser.add_argument('--user-row-quota', type=int, help='Purge oldest inactive datasets while a user stores more rows (0 disables).')
+        parser.add_argument('--batch-size', type=int, default=settings.RETENTION_BATCH_SIZE)
+        parser.add_argument('--pause', type=float, default=settings.RETENTION_PAUSE, help='Seconds to sleep between delete batches.')
+        parser.add_argument('--vacuum-pages', type=int, default=settings.RETENTION_VACUUM_PAGES)
+        parser.add_argument('--no-vacuum', action='store_true')
+        parser.add_argument('--enable-incremental-vacuum', action='store_true',
+                            help='Switch the database to incremental auto-vacuum with a one-off full VACUUM.')
+        parser.add_argument('--dry-run', action='store_true', help='List the datasets that would be purged.')
+        parser.add_argument('--interval', type=float, help='Keep running, compacting every N seconds.')
+    
+    def handle(self, *args, **options):
+        policy = RetentionPolicy.from_settings(
+            max_age_days=options['max_age_days'],
+            keep_inactive=options['keep_inactive'],
+            user_row_quota=options['user_row_quota'],
+        )
+        
+        while True:
+            self.run_once(policy, options)
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+    
+    def run_once(self, policy, options):
+        size_before = database_size() if connection.vendor == 'sqlite' else None
+        report = compact(
+            policy,
+            options['batch_size'],
+            pause=options['pause'],
+            dry_run=options['dry_run'],
+            vacuum=not options['no_vacuum'],
+            vacuum_pages=options['vacuum_pages'],
+            enable_incremental_vacuum=options['enable_incremental_vacuum'],
+        )
+        
+        verb = 'Would purge' if options['dry_run'] else 'Purged'
+        for dataset in report['datasets']:
+            self.stdout.write(
+                f"{verb} dataset {dataset['id']} ({dataset['filename']}, user {dataset['user_id']}, "
+                f"{dataset['row_count']} rows): {dataset['reason']}"
+            )
+        self.stdout.write(f"{verb} {len(report['datasets'])} dataset(s), deleted {report['rows_deleted']} equipment row(s)")
+        
+        vacuum = report['vacuum']
+        if vacuum is None:
+            return
+        if vacuum['mode'] == 'none':
+            self.stdout.write(
+                f"Incremental vacuum is not enabled; {vacuum['free_bytes']} free byte(s) will be reused. "
+                'Run with --enable-incremental-vacuum once to return space to the filesystem.'
+            )
+        elif vacuum['mode'] != 'unsupported':
+            self.stdout.write(
+                f"Reclaimed {vacuum['reclaimed_bytes']} byte(s) with {vacuum['mode']} vacuum "
+                f"({size_before} -> {database_size()} bytes)"
+            )
@@ -0,0 +1,33 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from equipment_api.retention import expire_chunked_uploads
+
+class Command(BaseCommand):
+    help = 'Delete resumable uploads that have not received a chunk recently, along with their part files.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--max-age-hours', type=int, default=settings.CHUNKED_UPLOAD_EXPIRY_HOURS,
+                            help='Expire uploads idle for at least this many hours.')
+        parser.add_argument('--dry-run', action='store_true', help='List the uploads that would be expired.')
+        parser.add_argument('--interval', type=float, help='Keep running, expiring uploads every N seconds.')
+    
+    def handle(self, *args, **options):
+        while True:
+            self.run_once(options)
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+    
+    def run_once(self, options):
+        report = expire_chunked_uploads(options['max_age_hours'], dry_run=options['dry_run'])
+        
+        verb = 'Would expire' if options['dry_run'] else 'Expired'
+        for upload in report['uploads']:
+            self.stdout.write(
+                f'{verb} upload {upload.upload_id} ({upload.filename}, user {upload.user_id}, '
+                f'{upload.received_bytes}/{upload.file_size} bytes)'
+            )
+        for path in report['orphaned']:
+            self.stdout.write(f'{verb} orphaned part file {path}')
+        self.stdout.write(f"{verb} {len(report['uploads'])} upload(s) and {len(report['orphaned'])} orphaned part file(s)")
@@ -0,0 +1,11 @@
+from equipment_api.jobs import claim_next_job, process_job, requeue_interrupted_jobs
+from equipment_api.workers import JobWorkerCommand
+
+class Command(JobWorkerCommand):
+    help = 'Process queued CSV ingestion jobs with a pool of local worker processes.'
+    job_name = 'ingestion'
+    workers_setting = 'INGEST_WORKERS'
+    poll_interval_setting = 'INGEST_POLL_INTERVAL'
+    claim = staticmethod(claim_next_job)
+    process = staticmethod(process_job)
+    requeue = staticmethod(requeue_interrupted_jobs)
@@ -0,0 +1,11 @@
+from equipment_api.report_jobs import claim_next_report_job, process_report_job, requeue_interrupted_report_jobs
+from equipment_api.workers import JobWorkerCommand
+
+class Command(JobWorkerCommand):
+    help = 'Render queued PDF reports with a pool of local worker processes.'
+    job_name = 'report'
+    workers_setting = 'REPORT_WORKERS'
+    poll_interval_setting = 'REPORT_POLL_INTERVAL'
+    claim = staticmethod(claim_next_report_job)
+    process = staticmethod(process_report_job)
+    requeue = staticmethod(requeue_interrupted_report_jobs)
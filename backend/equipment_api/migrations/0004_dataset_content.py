@@ -0,0 +1,144 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def attach_content(apps, schema_editor):
+    Dataset = apps.get_model('equipment_api', 'Dataset')
+    DatasetContent = apps.get_model('equipment_api', 'DatasetContent')
+    EquipmentData = apps.get_model('equipment_api', 'EquipmentData')
+    DatasetSummary = apps.get_model('equipment_api', 'DatasetSummary')
+    EquipmentTypeStats = apps.get_model('equipment_api', 'EquipmentTypeStats')
+
+    for dataset in Dataset.objects.all().iterator():
+        content = DatasetContent.objects.create(
+            file_hash=dataset.file_hash,
+            file_size=dataset.file_size,
+            row_count=dataset.row_count or 0,
+            created_at=dataset.upload_date,
+        )
+        Dataset.objects.filter(pk=dataset.pk).update(content=content)
+        EquipmentData.objects.filter(dataset=dataset).update(content=content)
+        DatasetSummary.objects.filter(dataset=dataset).update(content=content)
+        EquipmentTypeStats.objects.filter(dataset=dataset).update(content=content)
+
+
+def detach_content(apps, schema_editor):
+    Dataset = apps.get_model('equipment_api', 'Dataset')
+    EquipmentData = apps.get_model('equipment_api', 'EquipmentData')
+    DatasetSummary = apps.get_model('equipment_api', 'DatasetSummary')
+    EquipmentTypeStats = apps.get_model('equipment_api', 'EquipmentTypeStats')
+
+    for dataset in Dataset.objects.order_by('upload_date').iterator():
+        EquipmentData.objects.filter(content=dataset.content_id, dataset__isnull=True).update(dataset=dataset)
+        DatasetSummary.objects.filter(content=dataset.content_id, dataset__isnull=True).update(dataset=dataset)
+        EquipmentTypeStats.objects.filter(content=dataset.content_id, dataset__isnull=True).update(dataset=dataset)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0003_ingestion_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DatasetContent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_hash', models.CharField(max_length=64, unique=True)),
+                ('file_size', models.IntegerField(blank=True, null=True)),
+                ('row_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='dataset',
+            name='content',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='datasets', to='equipment_api.datasetcontent'),
+        ),
+        migrations.AddField(
+            model_name='equipmentdata',
+            name='content',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='equipment', to='equipment_api.datasetcontent'),
+        ),
+        migrations.AddField(
+            model_name='datasetsummary',
+            name='content',
+            field=models.OneToOneField(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='summary', to='equipment_api.datasetcontent'),
+        ),
+        migrations.AddField(
+            model_name='equipmenttypestats',
+            name='content',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='type_stats', to='equipment_api.datasetcontent'),
+        ),
+        migrations.AlterField(
+            model_name='equipmentdata',
+            name='dataset',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='equipment', to='equipment_api.dataset'),
+        ),
+        migrations.AlterField(
+            model_name='datasetsummary',
+            name='dataset',
+            field=models.OneToOneField(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='summary', to='equipment_api.dataset'),
+        ),
+        migrations.AlterField(
+            model_name='equipmenttypestats',
+            name='dataset',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='type_stats', to='equipment_api.dataset'),
+        ),
+        migrations.RunPython(attach_content, detach_content),
+        migrations.AlterUniqueTogether(
+            name='equipmenttypestats',
+            unique_together={('content', 'equipment_type')},
+        ),
+        migrations.RemoveIndex(
+            model_name='equipmentdata',
+            name='equipment_a_dataset_8a438a_idx',
+        ),
+        migrations.RemoveField(
+            model_name='equipmentdata',
+            name='dataset',
+        ),
+        migrations.RemoveField(
+            model_name='datasetsummary',
+            name='dataset',
+        ),
+        migrations.RemoveField(
+            model_name='equipmenttypestats',
+            name='dataset',
+        ),
+        migrations.AlterField(
+            model_name='equipmentdata',
+            name='content',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='equipment', to='equipment_api.datasetcontent'),
+        ),
+        migrations.AlterField(
+            model_name='datasetsummary',
+            name='content',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='summary', to='equipment_api.datasetcontent'),
+        ),
+        migrations.AlterField(
+            model_name='equipmenttypestats',
+            name='content',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='type_stats', to='equipment_api.datasetcontent'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentdata',
+            index=models.Index(fields=['content', 'equipment_type'], name='equipment_a_content_c7cee6_idx'),
+        ),
+        migrations.AlterField(
+            model_name='dataset',
+            name='file_hash',
+            field=models.CharField(max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='dataset',
+            name='content',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='datasets', to='equipment_api.datasetcontent'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='dataset',
+            unique_together={('user', 'file_hash')},
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:28
+
+from django.db import migrations, models
+from django.db.models import F, Max, Min, Sum
+
+METRICS = ['flowrate', 'pressure', 'temperature']
+
+
+def backfill_running_state(apps, schema_editor):
+    EquipmentData = apps.get_model('equipment_api', 'EquipmentData')
+    EquipmentTypeStats = apps.get_model('equipment_api', 'EquipmentTypeStats')
+
+    for stats in EquipmentTypeStats.objects.all().iterator():
+        aggregates = {}
+        for metric in METRICS:
+            aggregates[f'sum_{metric}'] = Sum(metric)
+            aggregates[f'sumsq_{metric}'] = Sum(F(metric) * F(metric))
+            aggregates[f'min_{metric}'] = Min(metric)
+            aggregates[f'max_{metric}'] = Max(metric)
+        totals = EquipmentData.objects.filter(
+            content=stats.content_id, equipment_type=stats.equipment_type
+        ).aggregate(**aggregates)
+
+        fields = {}
+        for metric in METRICS:
+            total, squares = totals[f'sum_{metric}'], totals[f'sumsq_{metric}']
+            if total is None:
+                continue
+            fields[f'sum_{metric}'] = float(total)
+            fields[f'sumsq_{metric}'] = float(squares)
+            fields[f'min_{metric}'] = totals[f'min_{metric}']
+            fields[f'max_{metric}'] = totals[f'max_{metric}']
+            if stats.count > 1:
+                variance = (float(squares) - float(total) ** 2 / stats.count) / (stats.count - 1)
+                fields[f'std_{metric}'] = round(max(variance, 0) ** 0.5, 2)
+        EquipmentTypeStats.objects.filter(pk=stats.pk).update(**fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0005_chunked_upload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipmenttypestats',
+            name='sum_flowrate',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='equipmenttypestats',
+            name='sum_pressure',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='equipmenttypestats',
+            name='sum_temperature',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='equipmenttypestats',
+            name='sumsq_flowrate',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='equipmenttypestats',
+            name='sumsq_pressure',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='equipmenttypestats',
+            name='sumsq_temperature',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_running_state, migrations.RunPython.noop),
+    ]
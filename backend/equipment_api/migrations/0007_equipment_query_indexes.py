@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0006_type_stats_running_state'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='equipmentdata',
+            name='equipment_a_content_c7cee6_idx',
+        ),
+        migrations.AddIndex(
+            model_name='equipmentdata',
+            index=models.Index(fields=['content', 'equipment_type', 'flowrate'], name='equipment_type_flowrate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentdata',
+            index=models.Index(fields=['content', 'equipment_type', 'pressure'], name='equipment_type_pressure_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentdata',
+            index=models.Index(fields=['content', 'equipment_type', 'temperature'], name='equipment_type_temp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentdata',
+            index=models.Index(fields=['content', 'equipment_name'], name='equipment_name_idx'),
+        ),
+    ]
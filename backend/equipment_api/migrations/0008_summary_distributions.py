@@ -0,0 +1,170 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:51
+
+import numpy as np
+import pandas as pd
+from django.db import migrations, models
+from django.db.models import Count, Max, Min
+
+# Frozen copy of the sketch and histogram logic in RunningStatistics at the
+# time of this migration, so later analyzer changes do not alter the backfill.
+METRICS = ['flowrate', 'pressure', 'temperature']
+QUANTILES = (5, 25, 50, 75, 95)
+GAMMA = 1.01 / 0.99
+SKETCH_LEVELS = ['equipment_type', 'metric', 'sign', 'bucket']
+BINS = 20
+CHUNK_SIZE = 50000
+
+
+def sketch_values(df):
+    values = df.astype({metric: 'float64' for metric in METRICS})
+    values = values.melt(id_vars='equipment_type', var_name='metric').dropna(subset=['value'])
+    x = values.pop('value').to_numpy(dtype='float64')
+    magnitude = np.abs(x)
+    nonzero = magnitude > 0
+    logs = np.log(np.where(nonzero, magnitude, 1)) / np.log(GAMMA)
+    values['sign'] = np.where(nonzero, np.sign(x), 0).astype('int64')
+    values['bucket'] = np.where(nonzero, np.ceil(logs), 0).astype('int64')
+    return values.groupby(SKETCH_LEVELS, sort=False).size()
+
+
+def serialize_sketch(sketch):
+    sketches = {}
+    for (eq_type, metric, sign), buckets in sketch.groupby(level=[0, 1, 2], sort=False):
+        indexes = buckets.index.get_level_values('bucket').to_numpy()
+        offset = int(indexes.min())
+        dense = np.zeros(int(indexes.max()) - offset + 1, dtype='int64')
+        dense[indexes - offset] = buckets.to_numpy()
+        sketches.setdefault(eq_type, {}).setdefault(metric, []).append([int(sign), offset, dense.tolist()])
+    return sketches
+
+
+def distribution(buckets, low, high):
+    low, high = round(float(low), 2), round(float(high), 2)
+    signs = buckets.index.get_level_values('sign').to_numpy()
+    indexes = buckets.index.get_level_values('bucket').to_numpy()
+    counts = buckets.to_numpy()
+
+    lower = np.where(signs > 0, GAMMA ** (indexes - 1), -GAMMA ** indexes) * (signs != 0)
+    upper = np.where(signs > 0, GAMMA ** indexes, -GAMMA ** (indexes - 1)) * (signs != 0)
+    lower, upper = np.clip(lower, low, high), np.clip(upper, low, high)
+    order = np.argsort(lower, kind='stable')
+    lower, upper, counts = lower[order], upper[order], counts[order]
+    width = upper - lower
+
+    cumulative = np.cumsum(counts)
+    ranks = np.array(QUANTILES) / 100 * cumulative[-1]
+    position = np.minimum(np.searchsorted(cumulative, ranks, side='left'), len(counts) - 1)
+    below = cumulative[position] - counts[position]
+    quantiles = lower[position] + (ranks - below) / counts[position] * width[position]
+
+    edges = np.linspace(low, high, BINS + 1)
+    fraction = np.where(
+        width > 0,
+        np.clip((edges[:, None] - lower) / np.where(width > 0, width, 1), 0, 1),
+        edges[:, None] >= lower
+    )
+    cdf = np.round(fraction @ counts)
+    cdf[0], cdf[-1] = 0, cumulative[-1]
+
+    return {
+        'edges': np.round(edges, 2).tolist(),
+        'counts': np.diff(cdf).astype(int).tolist(),
+        'quantiles': {f'p{q}': round(float(value), 2) for q, value in zip(QUANTILES, quantiles)},
+    }
+
+
+def metric_distributions(sketch, ranges):
+    by_metric = dict(list(sketch.groupby(level='metric', sort=False)))
+    return {
+        metric: distribution(by_metric[metric].droplevel('metric'), low, high)
+        if metric in by_metric and low is not None else None
+        for metric, (low, high) in ranges.items()
+    }
+
+
+def compute_distributions(sketch, type_ranges):
+    overall = sketch.groupby(level=['metric', 'sign', 'bucket'], sort=False).sum()
+    by_type = dict(list(sketch.groupby(level='equipment_type', sort=False)))
+    overall_ranges = {}
+    for metric in METRICS:
+        lows = [ranges[metric][0] for ranges in type_ranges.values() if ranges[metric][0] is not None]
+        highs = [ranges[metric][1] for ranges in type_ranges.values() if ranges[metric][1] is not None]
+        overall_ranges[metric] = (min(lows), max(highs)) if lows else (None, None)
+
+    return {
+        'bins': BINS,
+        'quantiles': [f'p{q}' for q in QUANTILES],
+        'overall': metric_distributions(overall, overall_ranges),
+        'types': {
+            eq_type: metric_distributions(
+                by_type[eq_type].droplevel('equipment_type') if eq_type in by_type else overall.iloc[:0], ranges
+            )
+            for eq_type, ranges in type_ranges.items()
+        },
+    }
+
+
+def backfill_distributions(apps, schema_editor):
+    DatasetContent = apps.get_model('equipment_api', 'DatasetContent')
+    DatasetSummary = apps.get_model('equipment_api', 'DatasetSummary')
+    EquipmentData = apps.get_model('equipment_api', 'EquipmentData')
+    EquipmentTypeStats = apps.get_model('equipment_api', 'EquipmentTypeStats')
+    columns = ['equipment_type'] + METRICS
+
+    for content in DatasetContent.objects.filter(summary__isnull=False).iterator():
+        equipment = EquipmentData.objects.filter(content=content)
+        aggregates = {'count': Count('id'), 'first_id': Min('id')}
+        for metric in METRICS:
+            aggregates[f'min_{metric}'] = Min(metric)
+            aggregates[f'max_{metric}'] = Max(metric)
+        types = sorted(
+            equipment.values('equipment_type').annotate(**aggregates).order_by('first_id'),
+            key=lambda row: -row['count']
+        )
+        if not types:
+            continue
+
+        sketches = []
+        rows = equipment.order_by('id').values_list(*columns).iterator(chunk_size=CHUNK_SIZE)
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= CHUNK_SIZE:
+                sketches.append(sketch_values(pd.DataFrame(chunk, columns=columns)))
+                chunk = []
+        if chunk:
+            sketches.append(sketch_values(pd.DataFrame(chunk, columns=columns)))
+        sketch = pd.concat(sketches).groupby(level=SKETCH_LEVELS, sort=False).sum()
+
+        type_ranges = {
+            row['equipment_type']: {
+                metric: (row[f'min_{metric}'], row[f'max_{metric}']) for metric in METRICS
+            }
+            for row in types
+        }
+        DatasetSummary.objects.filter(content=content).update(
+            distributions=compute_distributions(sketch, type_ranges)
+        )
+        for eq_type, type_sketch in serialize_sketch(sketch).items():
+            EquipmentTypeStats.objects.filter(content=content, equipment_type=eq_type).update(sketch=type_sketch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0007_equipment_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasetsummary',
+            name='distributions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='equipmenttypestats',
+            name='sketch',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_distributions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:59
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_deactivated_at(apps, schema_editor):
+    Dataset = apps.get_model('equipment_api', 'Dataset')
+    Dataset.objects.filter(is_active=False, deactivated_at__isnull=True).update(deactivated_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment_api', '0008_summary_distributions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='deactivated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_deactivated_at, migrations.RunPython.noop),
+    ]
@@ -1,18 +1,31 @@
+import uuid
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
 
+class DatasetContent(models.Model):
+    file_hash = models.CharField(max_length=64, unique=True)
+    file_size = models.IntegerField(null=True, blank=True)
+    row_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    def __str__(self):
+        return f"{self.file_hash[:12]} ({self.row_count} rows)"
+
 class Dataset(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='datasets')
     filename = models.CharField(max_length=255)
     upload_date = models.DateTimeField(default=timezone.now)
     file_size = models.IntegerField(null=True, blank=True)
     row_count = models.IntegerField(null=True, blank=True)
-    file_hash = models.CharField(max_length=64, unique=True)
+    file_hash = models.CharField(max_length=64)
     is_active = models.BooleanField(default=True)
+    deactivated_at = models.DateTimeField(null=True, blank=True)
+    content = models.ForeignKey(DatasetContent, on_delete=models.PROTECT, related_name='datasets')
     
     class Meta:
         ordering = ['-upload_date']
+        unique_together = [['user', 'file_hash']]
         indexes = [
             models.Index(fields=['user', 'upload_date']),
             models.Index(fields=['file_hash']),
@@ -28,11 +41,12 @@ class Dataset(models.Model):
             if user_datasets.count() >= 5:
                 oldest = user_datasets.order_by('upload_date').first()
                 oldest.is_active = False
+                oldest.deactivated_at = timezone.now()
                 oldest.save()
         super().save(*args, **kwargs)
 
 class EquipmentData(models.Model):
-    dataset = models.ForeignKey(Dataset, on_delete=models.CASCADE, related_name='equipment')
+    content = models.ForeignKey(DatasetContent, on_delete=models.CASCADE, related_name='equipment')
     equipment_name = models.CharField(max_length=100)
     equipment_type = models.CharField(max_length=50)
     flowrate = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
@@ -42,14 +56,17 @@ class EquipmentData(models.Model):
     
     class Meta:
         indexes = [
-            models.Index(fields=['dataset', 'equipment_type']),
+            models.Index(fields=['content', 'equipment_type', 'flowrate'], name='equipment_type_flowrate_idx'),
+            models.Index(fields=['content', 'equipment_type', 'pressure'], name='equipment_type_pressure_idx'),
+            models.Index(fields=['content', 'equipment_type', 'temperature'], name='equipment_type_temp_idx'),
+            models.Index(fields=['content', 'equipment_name'], name='equipment_name_idx'),
         ]
     
     def __str__(self):
         return f"{self.equipment_name} ({self.equipment_type})"
 
 class DatasetSummary(models.Model):
-    dataset = models.OneToOneField(Dataset, on_delete=models.CASCADE, related_name='summary')
+    content = models.OneToOneField(DatasetContent, on_delete=models.CASCADE, related_name='summary')
     total_count = models.IntegerField()
     avg_flowrate = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     avg_pressure = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
@@ -60,22 +77,134 @@ class DatasetSummary(models.Model):
     max_pressure = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     min_temperature = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     max_temperature = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    distributions = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(default=timezone.now)
     
     def __str__(self):
-        return f"Summary for {self.dataset.filename}"
+        return f"Summary for {self.content}"
 
 class EquipmentTypeStats(models.Model):
-    dataset = models.ForeignKey(Dataset, on_delete=models.CASCADE, related_name='type_stats')
+    content = models.ForeignKey(DatasetContent, on_delete=models.CASCADE, related_name='type_stats')
     equipment_type = models.CharField(max_length=50)
     count = models.IntegerField()
     percentage = models.DecimalField(max_digits=5, decimal_places=2)
     avg_flowrate = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     avg_pressure = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     avg_temperature = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    min_flowrate = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    max_flowrate = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    std_flowrate = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    min_pressure = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    max_pressure = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    std_pressure = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    min_temperature = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    max_temperature = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    std_temperature = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    sum_flowrate = models.FloatField(null=True, blank=True)
+    sumsq_flowrate = models.FloatField(null=True, blank=True)
+    sum_pressure = models.FloatField(null=True, blank=True)
+    sumsq_pressure = models.FloatField(null=True, blank=True)
+    sum_temperature = models.FloatField(null=True, blank=True)
+    sumsq_temperature = models.FloatField(null=True, blank=True)
+    sketch = models.JSONField(null=True, blank=True)
     
     class Meta:
-        unique_together = [['dataset', 'equipment_type']]
+        unique_together = [['content', 'equipment_type']]
     
     def __str__(self):
-        return f"{self.equipment_type}: {self.count} ({self.percentage}%)"
\ No newline at end of file
+        return f"{self.equipment_type}: {self.count} ({self.percentage}%)"
+
+class IngestionJob(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='ingestion_jobs')
+    upload = models.FileField(upload_to='ingest/')
+    filename = models.CharField(max_length=255)
+    file_hash = models.CharField(max_length=64)
+    file_size = models.IntegerField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    stage = models.CharField(max_length=20, default='queued')
+    rows_processed = models.IntegerField(default=0)
+    attempts = models.IntegerField(default=0)
+    error = models.TextField(blank=True)
+    dataset = models.ForeignKey(Dataset, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.filename} ({self.status})"
+
+
+class ReportJob(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='report_jobs')
+    dataset = models.ForeignKey(Dataset, on_delete=models.CASCADE, related_name='report_jobs')
+    full = models.BooleanField(default=False)
+    content_hash = models.CharField(max_length=64)
+    template_version = models.IntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.IntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"Report for dataset {self.dataset_id} ({self.status})"
+
+class ChunkedUpload(models.Model):
+    STATUS_ACTIVE = 'active'
+    STATUS_COMPLETE = 'complete'
+    STATUS_CHOICES = [
+        (STATUS_ACTIVE, 'Active'),
+        (STATUS_COMPLETE, 'Complete'),
+    ]
+    
+    upload_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='chunked_uploads')
+    filename = models.CharField(max_length=255)
+    file_size = models.BigIntegerField()
+    sha256 = models.CharField(max_length=64, blank=True)
+    received_bytes = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_ACTIVE)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.filename} ({self.received_bytes}/{self.file_size})"
+    
+    @property
+    def storage_name(self):
+        return f'chunked/{self.upload_id}.part'
@@ -0,0 +1,50 @@
+from decimal import Decimal, InvalidOperation
+from .models import EquipmentData
+
+RANGE_FIELDS = ['flowrate', 'pressure', 'temperature']
+SORT_FIELDS = ['id', 'equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature']
+
+def _decimal_param(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"{name} must be a number")
+
+def _prefix_upper_bound(prefix):
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+def build_equipment_query(content, params, default_limit, max_limit):
+    queryset = EquipmentData.objects.filter(content=content)
+    
+    types = [eq_type for value in params.getlist('type') for eq_type in value.split(',') if eq_type]
+    if len(types) == 1:
+        queryset = queryset.filter(equipment_type=types[0])
+    elif types:
+        queryset = queryset.filter(equipment_type__in=types)
+    
+    for field in RANGE_FIELDS:
+        minimum = _decimal_param(params, f'{field}_min')
+        maximum = _decimal_param(params, f'{field}_max')
+        if minimum is not None:
+            queryset = queryset.filter(**{f'{field}__gte': minimum})
+        if maximum is not None:
+            queryset = queryset.filter(**{f'{field}__lte': maximum})
+    
+    prefix = params.get('name_prefix')
+    if prefix:
+        queryset = queryset.filter(equipment_name__gte=prefix, equipment_name__lt=_prefix_upper_bound(prefix))
+    
+    sort = params.get('sort', 'id')
+    if sort.lstrip('-') not in SORT_FIELDS:
+        raise ValueError(f"sort must be one of: {', '.join(SORT_FIELDS)}")
+    ordering = [sort] if sort.lstrip('-') == 'id' else [sort, '-id' if sort.startswith('-') else 'id']
+    
+    try:
+        limit = int(params.get('limit', default_limit))
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    
+    return queryset.order_by(*ordering)[:max(1, min(limit, max_limit))]
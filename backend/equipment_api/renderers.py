@@ -0,0 +1,106 @@
+from rest_framework.renderers import BaseRenderer, BrowsableAPIRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+_encoder = JSONEncoder()
+
+class ColumnarData(dict):
+    pass
+
+def json_dumps(data):
+    if orjson is None:
+        return JSONRenderer().render(data)
+    
+    ret = orjson.dumps(
+        data,
+        default=_encoder.default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY
+    )
+    return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+def _split_columns(data):
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if isinstance(value, ColumnarData):
+                return key, value, {k: v for k, v in data.items() if k != key}
+    return None, ColumnarData(), data
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        return json_dumps(data)
+
+class ColumnarJSONRenderer(FastJSONRenderer):
+    media_type = 'application/vnd.equipment.columns+json'
+    format = 'columns'
+    columnar = True
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    columnar = True
+    
+    def _default(self, obj):
+        if hasattr(obj, 'tolist'):
+            return obj.tolist()
+        return _encoder.default(obj)
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=self._default, use_bin_type=True)
+
+class ArrowStreamRenderer(BaseRenderer):
+    media_type = 'application/vnd.apache.arrow.stream'
+    format = 'arrow'
+    charset = None
+    render_style = 'binary'
+    columnar = True
+    DICTIONARY_COLUMNS = {'equipment_type'}
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        
+        key, columns, payload = _split_columns(data)
+        arrays = {}
+        for name, values in columns.items():
+            array = pa.array(values)
+            arrays[name] = array.dictionary_encode() if name in self.DICTIONARY_COLUMNS else array
+        
+        table = pa.table(arrays).replace_schema_metadata({
+            'payload': json_dumps(payload),
+            'columns': key or '',
+        })
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+DATASET_RENDERER_CLASSES = [FastJSONRenderer, BrowsableAPIRenderer]
+if pa is not None:
+    DATASET_RENDERER_CLASSES.append(ArrowStreamRenderer)
+if msgpack is not None:
+    DATASET_RENDERER_CLASSES.append(MessagePackRenderer)
+DATASET_RENDERER_CLASSES.append(ColumnarJSONRenderer)
@@ -0,0 +1,90 @@
+import os
+import zipfile
+from django.conf import settings
+from .models import ReportJob
+from .report_jobs import queue_report_job
+from .storage import get_report_store
+from data_processor.pdf_generator import PDFReportGenerator
+
+class _ArchiveStream:
+    def __init__(self):
+        self.chunks = []
+    
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+def archive_name(dataset):
+    stem = os.path.splitext(os.path.basename(dataset.filename))[0]
+    return f'{dataset.id}_{stem}_report.pdf'
+
+def stored_reports(datasets, full=False):
+    store = get_report_store()
+    return [
+        (dataset, store.get(dataset.id, PDFReportGenerator.TEMPLATE_VERSION, dataset.content.file_hash, full=full))
+        for dataset in datasets
+    ]
+
+def estimated_report_size(dataset, path, full=False):
+    if path is not None:
+        try:
+            return os.path.getsize(path)
+        except FileNotFoundError:
+            pass
+    rows = (dataset.row_count or 0) if full else 0
+    return settings.REPORT_BASE_BYTES + rows * settings.REPORT_FULL_BYTES_PER_ROW
+
+def failed_reports(datasets, full=False):
+    latest = {}
+    jobs = ReportJob.objects.filter(
+        dataset__in=datasets, full=full, template_version=PDFReportGenerator.TEMPLATE_VERSION
+    ).order_by('created_at', 'id')
+    for job in jobs:
+        latest[job.dataset_id] = job
+    return {
+        dataset.id for dataset in datasets
+        if dataset.id in latest
+        and latest[dataset.id].status == ReportJob.STATUS_FAILED
+        and latest[dataset.id].content_hash == dataset.content.file_hash
+    }
+
+def queue_missing_reports(user, datasets, full=False):
+    jobs = []
+    for dataset in datasets:
+        job, _ = queue_report_job(user, dataset, full)
+        if job is None:
+            break
+        jobs.append(job)
+    return jobs
+
+def _add_report(archive, stream, name, path):
+    with open(path, 'rb') as report, archive.open(name, 'w') as entry:
+        while True:
+            chunk = report.read(1024 * 1024)
+            if not chunk:
+                break
+            entry.write(chunk)
+            yield stream.drain()
+
+def stream_report_archive(reports, failed=()):
+    stream = _ArchiveStream()
+    errors = [f'{dataset.id} {dataset.filename}: failed to render report' for dataset in failed]
+    
+    with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for dataset, path in reports:
+            try:
+                yield from _add_report(archive, stream, archive_name(dataset), path)
+            except FileNotFoundError:
+                errors.append(f'{dataset.id} {dataset.filename}: report was evicted before it could be exported')
+        
+        if errors:
+            archive.writestr('errors.txt', '\n'.join(errors) + '\n')
+    yield stream.drain()
@@ -0,0 +1,81 @@
+import logging
+from django.conf import settings
+from django.db import OperationalError
+from django.utils import timezone
+from .models import Dataset, ReportJob
+from .storage import get_report_store
+from .workers import claim_next, requeue_interrupted
+from data_processor.pdf_generator import PDFReportGenerator
+
+logger = logging.getLogger(__name__)
+
+IN_FLIGHT = [ReportJob.STATUS_PENDING, ReportJob.STATUS_RUNNING]
+
+def stored_report(job):
+    return get_report_store().get(job.dataset_id, job.template_version, job.content_hash, full=job.full)
+
+def queue_report_job(user, dataset, full):
+    job_fields = {
+        'dataset': dataset,
+        'full': full,
+        'content_hash': dataset.content.file_hash,
+        'template_version': PDFReportGenerator.TEMPLATE_VERSION,
+    }
+    job = ReportJob.objects.filter(status__in=IN_FLIGHT, **job_fields).first()
+    if job is not None:
+        return job, False
+    
+    job = ReportJob(user=user, **job_fields)
+    if stored_report(job) is not None:
+        job.status = ReportJob.STATUS_COMPLETED
+        job.finished_at = timezone.now()
+    elif ReportJob.objects.filter(user=user, status__in=IN_FLIGHT).count() >= settings.REPORT_MAX_QUEUED_JOBS:
+        return None, False
+    job.save()
+    return job, True
+
+def claim_next_report_job():
+    return claim_next(ReportJob)
+
+def requeue_interrupted_report_jobs():
+    return requeue_interrupted(ReportJob)
+
+def _render(job):
+    dataset = Dataset.objects.select_related('content').get(pk=job.dataset_id)
+    job.content_hash = dataset.content.file_hash
+    job.template_version = PDFReportGenerator.TEMPLATE_VERSION
+    if stored_report(job) is not None:
+        return
+    
+    generator = PDFReportGenerator()
+    get_report_store().write(
+        job.dataset_id, job.template_version, job.content_hash,
+        lambda report: generator.write_report(
+            dataset, report, full=job.full, chunk_size=settings.EQUIPMENT_STREAM_CHUNK_SIZE
+        ),
+        full=job.full
+    )
+    if not Dataset.objects.filter(pk=job.dataset_id).exists():
+        get_report_store().delete(job.dataset_id)
+
+def process_report_job(job):
+    fields = {}
+    try:
+        _render(job)
+        fields.update(status=ReportJob.STATUS_COMPLETED, content_hash=job.content_hash,
+                      template_version=job.template_version)
+    except Dataset.DoesNotExist:
+        return job
+    except OperationalError:
+        if job.attempts < settings.REPORT_MAX_ATTEMPTS:
+            logger.warning('Report job %s hit a locked database, requeueing', job.id)
+            ReportJob.objects.filter(pk=job.pk).update(status=ReportJob.STATUS_PENDING, started_at=None)
+            return job
+        logger.exception('Report job %s failed', job.id)
+        fields.update(status=ReportJob.STATUS_FAILED, error='An error occurred while rendering the report.')
+    except Exception:
+        logger.exception('Report job %s failed', job.id)
+        fields.update(status=ReportJob.STATUS_FAILED, error='An error occurred while rendering the report.')
+    
+    ReportJob.objects.filter(pk=job.pk).update(finished_at=timezone.now(), **fields)
+    return job
@@ -0,0 +1,187 @@
+import logging
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+from .models import ChunkedUpload, DatasetContent, Dataset, EquipmentData, IngestionJob
+from .storage import get_columnar_store
+
+logger = logging.getLogger(__name__)
+
+PURGED_PREFIX = 'purged-'
+
+class RetentionPolicy:
+    def __init__(self, max_age_days, keep_inactive, user_row_quota):
+        self.max_age_days = max_age_days
+        self.keep_inactive = keep_inactive
+        self.user_row_quota = user_row_quota
+    
+    @classmethod
+    def from_settings(cls, **overrides):
+        values = {
+            'max_age_days': settings.RETENTION_MAX_AGE_DAYS,
+            'keep_inactive': settings.RETENTION_KEEP_INACTIVE,
+            'user_row_quota': settings.RETENTION_USER_ROW_QUOTA,
+        }
+        values.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(**values)
+    
+    def select(self, now=None):
+        cutoff = (now or timezone.now()) - timedelta(days=self.max_age_days)
+        totals = dict(Dataset.objects.values('user').annotate(rows=Sum('row_count')).values_list('user', 'rows'))
+        inactive = Dataset.objects.filter(is_active=False).order_by('user_id', '-deactivated_at', '-id').values_list(
+            'id', 'user_id', 'deactivated_at', 'row_count'
+        )
+        
+        expired = {}
+        by_user = {}
+        for dataset_id, user_id, deactivated_at, row_count in inactive:
+            by_user.setdefault(user_id, []).append((dataset_id, deactivated_at, row_count or 0))
+        
+        for user_id, datasets in by_user.items():
+            for rank, (dataset_id, deactivated_at, row_count) in enumerate(datasets):
+                if deactivated_at is not None and deactivated_at <= cutoff:
+                    expired[dataset_id] = 'age'
+                elif rank >= self.keep_inactive:
+                    expired[dataset_id] = 'count'
+            
+            if self.user_row_quota:
+                remaining = (totals.get(user_id) or 0) - sum(rows for dataset_id, _, rows in datasets if dataset_id in expired)
+                for dataset_id, _, row_count in reversed(datasets):
+                    if remaining <= self.user_row_quota:
+                        break
+                    if dataset_id not in expired:
+                        expired[dataset_id] = 'quota'
+                        remaining -= row_count
+        
+        for dataset_id in Dataset.objects.filter(content__file_hash__startswith=PURGED_PREFIX).values_list('id', flat=True):
+            expired.setdefault(dataset_id, 'resume')
+        return expired
+
+def _detach_content(content_id, dataset_id=None):
+    with transaction.atomic():
+        content = DatasetContent.objects.filter(pk=content_id).first()
+        if content is None:
+            return False
+        if content.datasets.exclude(pk=dataset_id).exists():
+            return False
+        if not content.file_hash.startswith(PURGED_PREFIX):
+            store = get_columnar_store()
+            if store:
+                transaction.on_commit(lambda file_hash=content.file_hash: store.delete(file_hash))
+            DatasetContent.objects.filter(pk=content_id).update(file_hash=f'{PURGED_PREFIX}{content_id}')
+    return True
+
+def _delete_rows(content_id, batch_size, pause):
+    deleted = 0
+    while True:
+        ids = list(
+            EquipmentData.objects.filter(content=content_id).order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            count, _ = EquipmentData.objects.filter(content=content_id, id__gte=ids[0], id__lte=ids[-1]).delete()
+        deleted += count
+        if pause:
+            time.sleep(pause)
+
+def purge_dataset(dataset, batch_size, pause=0):
+    rows = 0
+    if _detach_content(dataset.content_id, dataset.pk):
+        rows = _delete_rows(dataset.content_id, batch_size, pause)
+    
+    with transaction.atomic():
+        Dataset.objects.filter(pk=dataset.pk).delete()
+    return rows
+
+def purge_orphaned_content(batch_size, pause=0):
+    rows = 0
+    for content_id in DatasetContent.objects.filter(datasets__isnull=True).values_list('id', flat=True):
+        if not _detach_content(content_id):
+            continue
+        rows += _delete_rows(content_id, batch_size, pause)
+        with transaction.atomic():
+            DatasetContent.objects.filter(pk=content_id, datasets__isnull=True).delete()
+    return rows
+
+def _pragma(name):
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+def database_size():
+    return _pragma('page_count') * _pragma('page_size')
+
+def vacuum_database(pages_per_step, pause=0, enable_incremental=False):
+    if connection.vendor != 'sqlite':
+        return {'mode': 'unsupported', 'reclaimed_bytes': 0, 'free_bytes': 0}
+    
+    before = database_size()
+    if _pragma('auto_vacuum') != 2:
+        if not enable_incremental:
+            return {'mode': 'none', 'reclaimed_bytes': 0, 'free_bytes': _pragma('freelist_count') * _pragma('page_size')}
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            cursor.execute('VACUUM')
+        return {'mode': 'full', 'reclaimed_bytes': before - database_size(), 'free_bytes': 0}
+    
+    while _pragma('freelist_count'):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA incremental_vacuum({int(pages_per_step)})')
+            cursor.fetchall()
+        if pause:
+            time.sleep(pause)
+    return {'mode': 'incremental', 'reclaimed_bytes': before - database_size(), 'free_bytes': 0}
+
+def compact(policy, batch_size, pause=0, dry_run=False, vacuum=True, vacuum_pages=None, enable_incremental_vacuum=False):
+    expired = policy.select()
+    datasets = Dataset.objects.filter(pk__in=expired).order_by('deactivated_at', 'id')
+    report = {
+        'datasets': [
+            {'id': dataset.id, 'user_id': dataset.user_id, 'filename': dataset.filename,
+             'row_count': dataset.row_count, 'reason': expired[dataset.id]}
+            for dataset in datasets
+        ],
+        'rows_deleted': 0,
+        'vacuum': None,
+    }
+    if dry_run:
+        return report
+    
+    for dataset in datasets:
+        report['rows_deleted'] += purge_dataset(dataset, batch_size, pause)
+        logger.info('Purged dataset %s (%s)', dataset.id, expired[dataset.id])
+    report['rows_deleted'] += purge_orphaned_content(batch_size, pause)
+    
+    if vacuum:
+        report['vacuum'] = vacuum_database(
+            vacuum_pages or settings.RETENTION_VACUUM_PAGES, pause, enable_incremental_vacuum
+        )
+    return report
+
+def expire_chunked_uploads(max_age_hours, dry_run=False, now=None):
+    cutoff = (now or timezone.now()) - timedelta(hours=max_age_hours)
+    stale = ChunkedUpload.objects.filter(updated_at__lt=cutoff)
+    expired = list(stale.filter(status=ChunkedUpload.STATUS_ACTIVE))
+    
+    kept = {upload.storage_name for upload in ChunkedUpload.objects.filter(status=ChunkedUpload.STATUS_ACTIVE)}
+    kept.update(IngestionJob.objects.filter(upload__startswith='chunked/').values_list('upload', flat=True))
+    kept.difference_update(upload.storage_name for upload in expired)
+    
+    orphaned = []
+    if default_storage.exists('chunked'):
+        for name in default_storage.listdir('chunked')[1]:
+            path = f'chunked/{name}'
+            if name.endswith('.part') and path not in kept and default_storage.get_modified_time(path) < cutoff:
+                orphaned.append(path)
+    
+    if not dry_run:
+        for path in [upload.storage_name for upload in expired] + orphaned:
+            default_storage.delete(path)
+        stale.delete()
+        logger.info('Expired %s chunked upload(s) and %s orphaned part file(s)', len(expired), len(orphaned))
+    return {'uploads': expired, 'orphaned': orphaned}
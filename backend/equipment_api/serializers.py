@@ -12,7 +12,7 @@ class DatasetListSerializer(serializers.ModelSerializer):
         fields = ['id', 'filename', 'upload_date', 'row_count', 'file_size', 'is_active']
 
 class DatasetDetailSerializer(serializers.ModelSerializer):
-    equipment = EquipmentDataSerializer(many=True, read_only=True)
+    equipment = EquipmentDataSerializer(source='content.equipment', many=True, read_only=True)
     
     class Meta:
         model = Dataset
@@ -0,0 +1,28 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import DatasetContent, Dataset
+from .storage import get_columnar_store, get_report_store
+from .summary_cache import invalidate_dataset_summaries
+
+@receiver(post_delete, sender=Dataset)
+def release_dataset_content(sender, instance, **kwargs):
+    DatasetContent.objects.filter(pk=instance.content_id, datasets__isnull=True).delete()
+
+
+@receiver(post_delete, sender=Dataset)
+@receiver(post_save, sender=Dataset)
+def invalidate_summary_cache(sender, instance, created=False, **kwargs):
+    if not created:
+        invalidate_dataset_summaries(instance.id)
+
+
+@receiver(post_delete, sender=Dataset)
+def delete_stored_reports(sender, instance, **kwargs):
+    get_report_store().delete(instance.id)
+
+
+@receiver(post_delete, sender=DatasetContent)
+def delete_columnar_files(sender, instance, **kwargs):
+    store = get_columnar_store()
+    if store:
+        store.delete(instance.file_hash)
@@ -0,0 +1,17 @@
+from django.conf import settings
+from data_processor.columnar_store import ColumnarStore
+from data_processor.report_store import ReportStore
+
+def get_columnar_store():
+    if not settings.COLUMNAR_STORE_ENABLED:
+        return None
+    return ColumnarStore(settings.COLUMNAR_STORE_ROOT)
+
+def open_columns(content):
+    store = get_columnar_store()
+    if store is None:
+        return None
+    return store.open(content.file_hash)
+
+def get_report_store():
+    return ReportStore(settings.REPORT_STORE_ROOT, settings.REPORT_STORE_MAX_BYTES)
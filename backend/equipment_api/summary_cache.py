@@ -0,0 +1,45 @@
+import hashlib
+from urllib.parse import urlencode
+from django.core.cache import caches
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from .renderers import json_dumps
+
+SUMMARY_KINDS = ('summary', 'types', 'distribution')
+
+def _cache_key(kind, dataset_id):
+    return f'dataset-{kind}:{dataset_id}'
+
+def _cached_entry(key, version, build):
+    cache = caches['summaries']
+    entry = cache.get(key)
+    if entry is None or entry['version'] != version:
+        data = build()
+        entry = {
+            'version': version,
+            'etag': f'"{hashlib.sha256(json_dumps(data)).hexdigest()}"',
+            'data': data,
+        }
+        cache.set(key, entry)
+    return entry
+
+def _entry_response(request, entry):
+    headers = {'ETag': entry['etag'], 'Cache-Control': 'private, no-cache'}
+    etags = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+    if entry['etag'] in etags or '*' in etags:
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(entry['data'], headers=headers)
+
+def get_cached_summary(dataset, kind, build):
+    return _cached_entry(_cache_key(kind, dataset.id), dataset.content.file_hash, lambda: build(dataset))
+
+def cached_summary_response(request, dataset, kind, build):
+    return _entry_response(request, get_cached_summary(dataset, kind, build))
+
+def cached_chart_response(request, content, chart, options, build):
+    key = f'chart-{chart}:{content.file_hash}:{urlencode(sorted(options.items()))}'
+    return _entry_response(request, _cached_entry(key, content.file_hash, lambda: build(content, **options)))
+
+def invalidate_dataset_summaries(dataset_id):
+    caches['summaries'].delete_many([_cache_key(kind, dataset_id) for kind in SUMMARY_KINDS])
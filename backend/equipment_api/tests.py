@@ -0,0 +1,1343 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+import zipfile
+from datetime import timedelta
+from decimal import Decimal
+from importlib import import_module
+from pathlib import Path
+from unittest import mock, skipIf
+import numpy as np
+import pandas as pd
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import OperationalError, connection
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from data_processor.analyzer import RunningStatistics
+from data_processor.csv_parser import CSVParser
+from data_processor.bulk_loader import ColumnarBulkLoader
+from data_processor.pdf_generator import PDFReportGenerator
+from data_processor.report_store import ReportStore
+from .models import ChunkedUpload, DatasetContent, Dataset, DatasetSummary, EquipmentData, EquipmentTypeStats, IngestionJob, ReportJob
+from .chart_data import CHART_BUILDERS
+from .queries import build_equipment_query
+from .renderers import msgpack, pa
+from .serializers import DatasetDetailSerializer
+from .equipment_rows import EQUIPMENT_FIELDS
+from .storage import get_columnar_store, open_columns
+from .retention import PURGED_PREFIX, RetentionPolicy
+from .ingestion import _copy_fields, ingest_csv
+from .jobs import claim_next_job, process_job, requeue_interrupted_jobs
+from .workers import work
+from .report_jobs import claim_next_report_job, process_report_job
+
+EQUIPMENT_TYPES = ['Pump', 'Compressor', 'Valve', 'Reactor']
+
+def synthetic_frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Equipment Name': [f'{eq_type[0]}-{i:05d}' for i, eq_type in enumerate(rng.choice(EQUIPMENT_TYPES, rows))],
+        'Type': rng.choice(EQUIPMENT_TYPES, rows),
+        'Flowrate': rng.uniform(10, 250, rows).round(2),
+        'Pressure': rng.uniform(1, 12, rows).round(2),
+        'Temperature': rng.uniform(40, 180, rows).round(2),
+    })
+
+def csv_file(df, name='plant.csv'):
+    return SimpleUploadedFile(name, df.to_csv(index=False).encode(), content_type='text/csv')
+
+class IsolatedStorageMixin:
+    def setUp(self):
+        super().setUp()
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.storage_root = Path(root.name)
+        caches = {alias: dict(config) for alias, config in settings.CACHES.items()}
+        for alias in ('jobs', 'summaries'):
+            caches[alias]['LOCATION'] = self.storage_root / 'cache' / alias
+        overrides = override_settings(
+            COLUMNAR_STORE_ROOT=self.storage_root / 'columnar',
+            REPORT_STORE_ROOT=self.storage_root / 'reports',
+            MEDIA_ROOT=self.storage_root / 'media',
+            CACHES=caches,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        
+        self.user = User.objects.create_user('analyst', password='secret')
+        self.client = self.client_for(self.user)
+    
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+    
+    def upload(self, df, name='plant.csv', client=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return (client or self.client).post('/api/upload/', {'file': csv_file(df, name)}, format='multipart')
+    
+    def append(self, dataset_id, df, client=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return (client or self.client).post(
+                f'/api/datasets/{dataset_id}/append/', {'file': csv_file(df, 'more.csv')}, format='multipart'
+            )
+    
+    def columns(self, dataset_id):
+        return open_columns(Dataset.objects.select_related('content').get(pk=dataset_id).content)
+
+class EquipmentQueryTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('analyst', password='secret')
+        cls.df = synthetic_frame(3000)
+        cls.content = DatasetContent.objects.create(file_hash='a' * 64, row_count=len(cls.df))
+        ColumnarBulkLoader().load(cls.content, cls.df)
+        cls.dataset = Dataset.objects.create(
+            user=cls.user, content=cls.content, filename='plant.csv', file_hash='a' * 64, row_count=len(cls.df)
+        )
+        
+        other = DatasetContent.objects.create(file_hash='b' * 64)
+        ColumnarBulkLoader().load(other, synthetic_frame(500, seed=1))
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+    
+    def query(self, **params):
+        query = QueryDict(mutable=True)
+        for key, value in params.items():
+            query.setlist(key, value if isinstance(value, list) else [value])
+        return build_equipment_query(self.content.pk, query, 100, 10000)
+    
+    def plan(self, queryset):
+        return queryset.values_list(*EQUIPMENT_FIELDS).explain()
+    
+    def expected(self, mask, sort_column, ascending=True):
+        return self.df[mask].sort_values(sort_column, ascending=ascending, kind='stable')
+
+class EquipmentQueryPlanTests(EquipmentQueryTestCase):
+    def test_type_and_pressure_range_uses_composite_index(self):
+        plan = self.plan(self.query(type='Pump', pressure_min='8', sort='-pressure', limit='50'))
+        self.assertIn('USING INDEX equipment_type_pressure_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+    
+    def test_type_and_flowrate_range_uses_composite_index(self):
+        plan = self.plan(self.query(type='Valve', flowrate_min='50', flowrate_max='100', sort='flowrate'))
+        self.assertIn('USING INDEX equipment_type_flowrate_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+    
+    def test_type_and_temperature_range_uses_composite_index(self):
+        plan = self.plan(self.query(type='Reactor', temperature_max='60', sort='temperature'))
+        self.assertIn('USING INDEX equipment_type_temp_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+    
+    def test_name_prefix_uses_name_index(self):
+        plan = self.plan(self.query(name_prefix='P-00', sort='equipment_name'))
+        self.assertIn('USING INDEX equipment_name_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+    
+    def test_no_query_scans_the_whole_table(self):
+        for params in [{'type': 'Pump'}, {'type': ['Pump', 'Valve'], 'pressure_min': '5'}, {'name_prefix': 'C-'}]:
+            plan = self.plan(self.query(**params))
+            self.assertNotRegex(plan, r'SCAN equipment_api_equipmentdata(?! USING)')
+
+class EquipmentQueryResultTests(EquipmentQueryTestCase):
+    def test_type_and_pressure_range(self):
+        rows = list(self.query(type='Pump', pressure_min='8', sort='-pressure', limit='10000').values_list(
+            'equipment_name', 'pressure'
+        ))
+        mask = (self.df['Type'] == 'Pump') & (self.df['Pressure'] >= 8)
+        expected = self.expected(mask, 'Pressure', ascending=False)
+        self.assertEqual(len(rows), len(expected))
+        self.assertEqual([float(pressure) for _, pressure in rows], expected['Pressure'].tolist())
+    
+    def test_multiple_types_and_ranges(self):
+        queryset = self.query(type='Pump,Valve', flowrate_min='100', temperature_max='90', limit='10000')
+        mask = (
+            self.df['Type'].isin(['Pump', 'Valve'])
+            & (self.df['Flowrate'] >= 100)
+            & (self.df['Temperature'] <= 90)
+        )
+        self.assertEqual(queryset.count(), int(mask.sum()))
+    
+    def test_name_prefix(self):
+        names = list(self.query(name_prefix='C-01', sort='equipment_name', limit='10000').values_list(
+            'equipment_name', flat=True
+        ))
+        expected = sorted(name for name in self.df['Equipment Name'] if name.startswith('C-01'))
+        self.assertEqual(names, expected)
+    
+    def test_limit_is_capped(self):
+        self.assertEqual(len(self.query(limit='50000')), 3000)
+        self.assertEqual(len(self.query()), 100)
+    
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            self.query(sort='created_at')
+        with self.assertRaises(ValueError):
+            self.query(pressure_min='high')
+        with self.assertRaises(ValueError):
+            self.query(limit='ten')
+
+class EquipmentQueryEndpointTests(EquipmentQueryTestCase):
+    def test_returns_filtered_rows(self):
+        response = self.client.get(f'/api/datasets/{self.dataset.id}/query/', {
+            'type': 'Compressor', 'pressure_min': '11', 'sort': '-pressure', 'limit': '5'
+        })
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(row['equipment_type'] == 'Compressor' for row in results))
+        pressures = [float(row['pressure']) for row in results]
+        self.assertEqual(pressures, sorted(pressures, reverse=True))
+    
+    def test_columnar_response(self):
+        response = self.client.get(
+            f'/api/datasets/{self.dataset.id}/query/', {'type': 'Valve', 'limit': '20'},
+            HTTP_ACCEPT='application/vnd.equipment.columns+json'
+        )
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(len(results['id']), 20)
+        self.assertEqual(set(results['equipment_type']), {'Valve'})
+    
+    def test_invalid_sort(self):
+        response = self.client.get(f'/api/datasets/{self.dataset.id}/query/', {'sort': 'content'})
+        self.assertEqual(response.status_code, 400)
+    
+    def test_other_users_dataset(self):
+        other = User.objects.create_user('other', password='secret')
+        self.client.force_authenticate(other)
+        response = self.client.get(f'/api/datasets/{self.dataset.id}/query/')
+        self.assertEqual(response.status_code, 404)
+
+class DatasetComparisonTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('analyst', password='secret')
+        cls.frames = [synthetic_frame(400, seed=seed) for seed in range(3)]
+        cls.frames[2] = cls.frames[2][cls.frames[2]['Type'] != 'Reactor']
+        cls.datasets = []
+        for index, df in enumerate(cls.frames):
+            stats = RunningStatistics()
+            stats.update(df)
+            content = DatasetContent.objects.create(file_hash=str(index) * 64, row_count=len(df))
+            DatasetSummary.objects.create(content=content, **stats.compute_statistics())
+            EquipmentTypeStats.objects.bulk_create([
+                EquipmentTypeStats(content=content, **type_stats) for type_stats in stats.get_type_stats()
+            ])
+            cls.datasets.append(Dataset.objects.create(
+                user=cls.user, content=content, filename=f'plant-{index}.csv', file_hash=str(index) * 64
+            ))
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+    
+    def compare(self, datasets):
+        return self.client.get('/api/datasets/compare/', {'ids': ','.join(str(dataset.id) for dataset in datasets)})
+    
+    def test_uses_one_query_per_table(self):
+        with self.assertNumQueries(3):
+            response = self.compare(self.datasets)
+        self.assertEqual(response.status_code, 200)
+    
+    def test_metric_deltas_against_first_dataset(self):
+        metrics = self.compare(self.datasets).json()['metrics']
+        means = [df['Pressure'].astype('float64').mean() for df in self.frames]
+        self.assertEqual(metrics['total_count']['values'], [len(df) for df in self.frames])
+        for value, delta, mean in zip(metrics['avg_pressure']['values'], metrics['avg_pressure']['deltas'], means):
+            self.assertAlmostEqual(value, mean, places=2)
+            self.assertAlmostEqual(delta, mean - means[0], places=2)
+    
+    def test_type_shifts_include_missing_types(self):
+        types = {row['equipment_type']: row for row in self.compare(self.datasets).json()['types']}
+        reactor = types['Reactor']
+        self.assertEqual(reactor['count']['values'][2], 0)
+        self.assertIsNone(reactor['avg_flowrate']['values'][2])
+        self.assertEqual(reactor['count']['deltas'][2], -reactor['count']['values'][0])
+    
+    def test_invalid_requests(self):
+        self.assertEqual(self.compare(self.datasets[:1]).status_code, 400)
+        self.assertEqual(self.client.get('/api/datasets/compare/', {'ids': 'a,b'}).status_code, 400)
+        other = User.objects.create_user('other', password='secret')
+        self.client.force_authenticate(other)
+        self.assertEqual(self.compare(self.datasets).status_code, 404)
+
+class PDFReportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('analyst', password='secret')
+        df = synthetic_frame(200)
+        stats = RunningStatistics()
+        stats.update(df)
+        content = DatasetContent.objects.create(file_hash='c' * 64, row_count=len(df))
+        ColumnarBulkLoader().load(content, df)
+        DatasetSummary.objects.create(content=content, **stats.compute_statistics())
+        cls.dataset = Dataset.objects.create(
+            user=cls.user, content=content, filename='plant.csv', file_hash='c' * 64, row_count=len(df)
+        )
+    
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        settings = override_settings(REPORT_STORE_ROOT=self.root.name, REPORT_ACCEL_REDIRECT_PREFIX='/protected-reports/')
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+    
+    def report(self):
+        return self.client.get(f'/api/report/{self.dataset.id}/pdf/')
+    
+    def stored(self, response):
+        path = os.path.join(self.root.name, response['X-Accel-Redirect'].removeprefix('/protected-reports/'))
+        with open(path, 'rb') as report:
+            return report.read()
+    
+    def test_misses_are_queued_and_hits_are_served_by_nginx(self):
+        response = self.report()
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['status'], ReportJob.STATUS_PENDING)
+        self.assertFalse(response.json()['full'])
+        self.assertEqual(self.report().json()['job_id'], response.json()['job_id'])
+        self.assertEqual(os.listdir(self.root.name), [])
+        
+        self.run_report_jobs()
+        response = self.report()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'')
+        self.assertRegex(response['X-Accel-Redirect'], rf'^/protected-reports/{self.dataset.id}/v\d+-c{{16}}\.pdf$')
+        self.assertIn('attachment', response['Content-Disposition'])
+        self.assertTrue(self.stored(response).startswith(b'%PDF'))
+    
+    def test_full_report_lists_every_row(self):
+        response = self.client.get(f'/api/report/{self.dataset.id}/pdf/', {'full': 'true'})
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['status'], ReportJob.STATUS_PENDING)
+        self.assertTrue(response.json()['full'])
+        self.assertEqual(os.listdir(self.root.name), [])
+        
+        self.run_report_jobs()
+        response = self.client.get(f'/api/report/{self.dataset.id}/pdf/', {'full': 'true'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('_full.pdf', response['Content-Disposition'])
+        self.assertRegex(response['X-Accel-Redirect'], r'-full\.pdf$')
+        content = self.stored(response)
+        self.assertTrue(content.startswith(b'%PDF'))
+        self.assertGreaterEqual(content.count(b'/Type /Page\n'), 200 // PDFReportGenerator.FULL_TABLE_ROWS + 1)
+    
+    @override_settings(REPORT_MAX_QUEUED_JOBS=0)
+    def test_report_respects_queue_limit(self):
+        self.assertEqual(self.report().status_code, 429)
+        response = self.client.get(f'/api/report/{self.dataset.id}/pdf/', {'full': 'true'})
+        self.assertEqual(response.status_code, 429)
+    
+    def run_report_jobs(self):
+        job = claim_next_report_job()
+        while job is not None:
+            process_report_job(job)
+            job = claim_next_report_job()
+    
+    def submit(self, **data):
+        return self.client.post(f'/api/report/{self.dataset.id}/jobs/', data, format='json')
+    
+    def test_report_job_is_rendered_by_worker(self):
+        response = self.submit(full=True)
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()['job_id']
+        self.assertEqual(self.submit(full=True).json()['job_id'], job_id)
+        self.assertNotEqual(self.submit().json()['job_id'], job_id)
+        
+        self.assertEqual(self.client.get(f'/api/report/jobs/{job_id}/download/').status_code, 409)
+        self.run_report_jobs()
+        
+        status = self.client.get(f'/api/report/jobs/{job_id}/').json()
+        self.assertEqual(status['status'], ReportJob.STATUS_COMPLETED)
+        response = self.client.get(status['download_url'])
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response['X-Accel-Redirect'], r'-full\.pdf$')
+        
+        response = self.submit(full=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], ReportJob.STATUS_COMPLETED)
+    
+    @override_settings(REPORT_MAX_QUEUED_JOBS=1)
+    def test_queued_jobs_are_limited(self):
+        self.assertEqual(self.submit().status_code, 202)
+        self.assertEqual(self.submit(full=True).status_code, 429)
+    
+    def test_export_streams_stored_reports_as_zip(self):
+        self.report()
+        self.run_report_jobs()
+        stored = self.stored(self.report())
+        response = self.export({'dataset_ids': [self.dataset.id]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(archive.namelist(), [f'{self.dataset.id}_plant_report.pdf'])
+        self.assertEqual(archive.read(archive.namelist()[0]), stored)
+    
+    def export(self, data):
+        return self.client.post('/api/report/export/', data, format='json')
+    
+    def test_export_validation(self):
+        self.assertEqual(self.export({'dataset_ids': []}).status_code, 400)
+        self.assertEqual(self.export({'dataset_ids': ['a']}).status_code, 400)
+        self.assertEqual(self.export({'dataset_ids': [self.dataset.id, 999]}).status_code, 404)
+        with override_settings(REPORT_EXPORT_MAX_DATASETS=0):
+            self.assertEqual(self.export({'all': True}).status_code, 400)
+    
+    def test_export_queues_missing_reports(self):
+        response = self.export({'dataset_ids': [self.dataset.id], 'full': True})
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response['Retry-After'], str(settings.REPORT_EXPORT_RETRY_AFTER))
+        self.assertEqual(response.json()['pending_count'], 1)
+        [job] = response.json()['jobs']
+        self.assertEqual(job['dataset_id'], self.dataset.id)
+        self.assertEqual(self.export({'dataset_ids': [self.dataset.id], 'full': True}).json()['jobs'], [job])
+        
+        self.run_report_jobs()
+        response = self.export({'dataset_ids': [self.dataset.id], 'full': True})
+        self.assertEqual(response.status_code, 200)
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(archive.namelist(), [f'{self.dataset.id}_plant_report.pdf'])
+        self.assertTrue(archive.read(archive.namelist()[0]).startswith(b'%PDF'))
+    
+    @override_settings(REPORT_MAX_QUEUED_JOBS=1)
+    def test_export_respects_queue_limit(self):
+        other = Dataset.objects.create(
+            user=self.user, content=self.dataset.content, filename='other.csv', file_hash='d' * 64, row_count=200
+        )
+        response = self.export({'dataset_ids': [self.dataset.id, other.id]})
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['pending_count'], 2)
+        self.assertEqual([job['dataset_id'] for job in response.json()['jobs']], [self.dataset.id])
+    
+    @override_settings(REPORT_EXPORT_MAX_BYTES=20000, REPORT_BASE_BYTES=8000, REPORT_FULL_BYTES_PER_ROW=100)
+    def test_export_is_capped_by_store_budget(self):
+        response = self.export({'dataset_ids': [self.dataset.id], 'full': True})
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(ReportJob.objects.exists())
+        self.assertEqual(self.export({'dataset_ids': [self.dataset.id]}).status_code, 202)
+        
+        self.run_report_jobs()
+        self.assertEqual(self.export({'dataset_ids': [self.dataset.id]}).status_code, 200)
+        with override_settings(REPORT_EXPORT_MAX_BYTES=1000):
+            self.assertEqual(self.export({'dataset_ids': [self.dataset.id]}).status_code, 413)
+    
+    def test_export_lists_failed_reports(self):
+        self.export({'dataset_ids': [self.dataset.id]})
+        with mock.patch.object(PDFReportGenerator, 'write_report', side_effect=RuntimeError), \
+                self.assertLogs('equipment_api.report_jobs', 'ERROR'):
+            self.run_report_jobs()
+        
+        response = self.export({'dataset_ids': [self.dataset.id]})
+        self.assertEqual(response.status_code, 200)
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(archive.namelist(), ['errors.txt'])
+        self.assertIn(b'failed to render report', archive.read('errors.txt'))
+    
+    def test_deleting_dataset_removes_reports(self):
+        self.report()
+        self.run_report_jobs()
+        self.assertTrue(os.listdir(self.root.name))
+        self.dataset.delete()
+        self.assertFalse(os.path.exists(os.path.join(self.root.name, str(self.dataset.id))))
+    
+    def test_evicts_least_recently_used(self):
+        store = ReportStore(self.root.name, max_bytes=350)
+        for dataset_id in range(3):
+            store.put(dataset_id, 1, 'a' * 64, b'x' * 100)
+            os.utime(store.path(dataset_id, 1, 'a' * 64), (dataset_id, dataset_id))
+        
+        self.assertIsNotNone(store.get(0, 1, 'a' * 64))
+        store.put(3, 1, 'a' * 64, b'x' * 100)
+        self.assertIsNotNone(store.get(0, 1, 'a' * 64))
+        self.assertIsNone(store.get(1, 1, 'a' * 64))
+        self.assertIsNotNone(store.get(2, 1, 'a' * 64))
+        self.assertIsNotNone(store.get(3, 1, 'a' * 64))
+    
+    def test_new_content_replaces_stale_report(self):
+        store = ReportStore(self.root.name, max_bytes=1000)
+        store.put(1, 1, 'a' * 64, b'old')
+        store.put(1, 1, 'b' * 64, b'new')
+        self.assertIsNone(store.get(1, 1, 'a' * 64))
+        self.assertEqual(os.listdir(os.path.join(self.root.name, '1')), [os.path.basename(store.path(1, 1, 'b' * 64))])
+
+
+class CSVParsingTests(IsolatedStorageMixin, TestCase):
+    def test_large_readings_round_trip_exactly(self):
+        df = pd.DataFrame({
+            'Equipment Name': ['P-1', 'P-2', 'P-3'],
+            'Type': ['Pump', 'Pump', 'Valve'],
+            'Flowrate': [150000.01, 262143.99, 1234567.89],
+            'Pressure': [131072.01, 5.5, 99999.99],
+            'Temperature': [1234567.89, 40.01, 180.5],
+        })
+        for profile in CSVParser.PROFILES:
+            with self.subTest(profile=profile), override_settings(CSV_PARSER_PROFILE=profile):
+                named = df.assign(**{'Equipment Name': df['Equipment Name'] + f'-{profile}'})
+                dataset_id = self.upload(named, name=f'{profile}.csv').json()['dataset_id']
+                rows = self.client.get(f'/api/datasets/{dataset_id}/equipment/', {'limit': 10}).json()['results']
+                self.assertEqual([row['flowrate'] for row in rows], ['150000.01', '262143.99', '1234567.89'])
+                self.assertEqual([row['pressure'] for row in rows], ['131072.01', '5.50', '99999.99'])
+                self.assertEqual([row['temperature'] for row in rows], ['1234567.89', '40.01', '180.50'])
+                self.assertEqual(
+                    list(EquipmentData.objects.filter(content__datasets=dataset_id).order_by('id').values_list(
+                        'flowrate', flat=True
+                    )),
+                    [Decimal('150000.01'), Decimal('262143.99'), Decimal('1234567.89')]
+                )
+                self.assertEqual(self.columns(dataset_id).column('flowrate').tolist(), [150000.01, 262143.99, 1234567.89])
+    
+    def test_typed_profile_matches_default(self):
+        data = synthetic_frame(500).to_csv(index=False).encode()
+        default = CSVParser(profile='default').parse_file(io.BytesIO(data))
+        typed = CSVParser(profile='typed').parse_file(io.BytesIO(data))
+        self.assertEqual(str(typed['Type'].dtype), 'category')
+        for column in CSVParser.NUMERIC_COLUMNS:
+            self.assertEqual(typed[column].dtype, np.float64)
+            self.assertTrue((typed[column] == default[column]).all())
+
+class DatasetAppendTests(IsolatedStorageMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.first = synthetic_frame(1200, seed=3)
+        self.second = synthetic_frame(800, seed=4)
+        self.dataset_id = self.upload(self.first).json()['dataset_id']
+    
+    def assertColumnsMatchDatabase(self, dataset_id):
+        dataset = Dataset.objects.select_related('content').get(pk=dataset_id)
+        rows = EquipmentData.objects.filter(content=dataset.content).order_by('id')
+        columns = self.columns(dataset_id)
+        self.assertEqual(columns.column('id').tolist(), list(rows.values_list('id', flat=True)))
+        self.assertEqual(columns.equipment_names(), list(rows.values_list('equipment_name', flat=True)))
+    
+    def statistics(self, dataset_id):
+        content = Dataset.objects.get(pk=dataset_id).content
+        exclude = ('id', 'content', 'created_at')
+        return (
+            _copy_fields(content.summary, exclude),
+            [_copy_fields(type_stats, exclude) for type_stats in content.type_stats.order_by('equipment_type')],
+        )
+    
+    def test_appends_in_place(self):
+        content = Dataset.objects.get(pk=self.dataset_id).content
+        response = self.append(self.dataset_id, self.second)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['rows_appended'], 800)
+        self.assertEqual(response.json()['row_count'], 2000)
+        dataset = Dataset.objects.select_related('content').get(pk=self.dataset_id)
+        self.assertEqual(dataset.content.pk, content.pk)
+        self.assertNotEqual(dataset.content.file_hash, content.file_hash)
+        self.assertEqual(self.columns(self.dataset_id).row_count, 2000)
+        self.assertColumnsMatchDatabase(self.dataset_id)
+    
+    def test_clones_shared_content(self):
+        other = self.client_for(User.objects.create_user('other', password='secret'))
+        other_id = self.upload(self.first, client=other).json()['dataset_id']
+        shared = Dataset.objects.get(pk=other_id).content
+        
+        self.append(self.dataset_id, self.second)
+        
+        dataset = Dataset.objects.get(pk=self.dataset_id)
+        self.assertNotEqual(dataset.content_id, shared.pk)
+        self.assertEqual(dataset.row_count, 2000)
+        shared.refresh_from_db()
+        self.assertEqual(shared.row_count, 1200)
+        self.assertEqual(EquipmentData.objects.filter(content=shared).count(), 1200)
+        self.assertEqual(self.columns(other_id).row_count, 1200)
+        self.assertColumnsMatchDatabase(other_id)
+        self.assertColumnsMatchDatabase(self.dataset_id)
+    
+    def test_reuses_existing_appended_content(self):
+        other = self.client_for(User.objects.create_user('other', password='secret'))
+        other_id = self.upload(self.first, client=other).json()['dataset_id']
+        shared_pk = Dataset.objects.get(pk=other_id).content_id
+        self.append(self.dataset_id, self.second)
+        rows = EquipmentData.objects.count()
+        
+        response = self.append(other_id, self.second, client=other)
+        
+        self.assertEqual(response.json()['rows_appended'], 800)
+        self.assertEqual(
+            Dataset.objects.get(pk=other_id).content_id, Dataset.objects.get(pk=self.dataset_id).content_id
+        )
+        self.assertFalse(DatasetContent.objects.filter(pk=shared_pk).exists())
+        self.assertEqual(EquipmentData.objects.count(), rows - 1200)
+    
+    def assertStatisticsMatchFullRecompute(self):
+        combined = pd.concat([self.first, self.second], ignore_index=True)
+        full_id = self.upload(combined, name='combined.csv').json()['dataset_id']
+        
+        appended, full = self.statistics(self.dataset_id), self.statistics(full_id)
+        self.assertEqual(appended[0], full[0])
+        self.assertEqual(len(appended[1]), len(full[1]))
+        for appended_type, full_type in zip(appended[1], full[1]):
+            for field, value in full_type.items():
+                if isinstance(value, float):
+                    self.assertAlmostEqual(appended_type[field], value, places=6, msg=field)
+                else:
+                    self.assertEqual(appended_type[field], value, msg=field)
+    
+    def test_statistics_match_full_recompute(self):
+        self.append(self.dataset_id, self.second)
+        self.assertStatisticsMatchFullRecompute()
+    
+    def test_appends_to_backfilled_legacy_stats(self):
+        content = Dataset.objects.get(pk=self.dataset_id).content
+        content.type_stats.update(**{
+            f'{stat}_{metric}': None
+            for stat in ('sum', 'sumsq', 'min', 'max', 'std') for metric in ('flowrate', 'pressure', 'temperature')
+        })
+        import_module('equipment_api.migrations.0006_type_stats_running_state').backfill_running_state(django_apps, None)
+        
+        self.append(self.dataset_id, self.second)
+        self.assertStatisticsMatchFullRecompute()
+    
+    def test_ignores_rows_ingested_concurrently(self):
+        other = DatasetContent.objects.create(file_hash='c' * 64)
+        load = ColumnarBulkLoader.load
+        
+        def interleaved_load(loader, content, df):
+            load(loader, other, synthetic_frame(10, seed=5))
+            load(loader, content, df)
+        
+        with mock.patch.object(ColumnarBulkLoader, 'load', interleaved_load):
+            self.append(self.dataset_id, self.second)
+        
+        self.assertEqual(self.columns(self.dataset_id).row_count, 2000)
+        self.assertColumnsMatchDatabase(self.dataset_id)
+
+class ArchiveUploadTests(IsolatedStorageMixin, TestCase):
+    def archive(self, members, name='batch.zip'):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            for member_name, data in members.items():
+                archive.writestr(member_name, data)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                '/api/upload/archive/', {'file': SimpleUploadedFile(name, buffer.getvalue())}, format='multipart'
+            )
+    
+    def test_reports_result_per_member(self):
+        uploaded = synthetic_frame(50, seed=1).to_csv(index=False).encode()
+        fresh = synthetic_frame(80, seed=2).to_csv(index=False).encode()
+        self.upload(synthetic_frame(50, seed=1))
+        
+        response = self.archive({
+            'plants/uploaded.csv': uploaded,
+            'plants/fresh.csv': fresh,
+            'plants/fresh_copy.csv': fresh,
+            'plants/broken.csv': b'Equipment Name,Type\nP-1,Pump\n',
+            'plants/empty.csv': b'Equipment Name,Type,Flowrate,Pressure,Temperature\n',
+            'plants/notes.txt': b'not a csv',
+        })
+        
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['file_count'], 5)
+        self.assertEqual(response.json()['created_count'], 1)
+        results = {result['filename']: result for result in response.json()['results']}
+        self.assertEqual({name: result['status'] for name, result in results.items()}, {
+            'uploaded.csv': 'duplicate',
+            'fresh.csv': 'created',
+            'fresh_copy.csv': 'duplicate',
+            'broken.csv': 'failed',
+            'empty.csv': 'failed',
+        })
+        self.assertEqual(results['fresh.csv']['row_count'], 80)
+        self.assertIn('no data rows', results['empty.csv']['error'])
+        dataset_id = results['fresh.csv']['dataset_id']
+        self.assertEqual(self.columns(dataset_id).row_count, 80)
+        self.assertEqual(EquipmentData.objects.filter(content__datasets=dataset_id).count(), 80)
+    
+    def test_reuses_content_from_other_users(self):
+        other = self.client_for(User.objects.create_user('other', password='secret'))
+        other_id = self.upload(synthetic_frame(50, seed=1), client=other).json()['dataset_id']
+        
+        response = self.archive({'shared.csv': synthetic_frame(50, seed=1).to_csv(index=False)})
+        
+        [result] = response.json()['results']
+        self.assertEqual(result['status'], 'created')
+        self.assertEqual(
+            Dataset.objects.get(pk=result['dataset_id']).content_id, Dataset.objects.get(pk=other_id).content_id
+        )
+        self.assertEqual(DatasetContent.objects.count(), 1)
+    
+    @override_settings(ARCHIVE_MAX_IN_FLIGHT=1, ARCHIVE_WORKERS=1)
+    def test_commits_while_members_are_parsed(self):
+        members = {f'plant_{seed}.csv': synthetic_frame(30, seed=seed).to_csv(index=False) for seed in range(4)}
+        
+        response = self.archive(members)
+        
+        self.assertEqual(response.json()['created_count'], 4)
+        self.assertEqual(Dataset.objects.filter(user=self.user).count(), 4)
+    
+    def test_limits(self):
+        members = {f'plant_{seed}.csv': synthetic_frame(30, seed=seed).to_csv(index=False) for seed in range(2)}
+        with override_settings(ARCHIVE_MAX_FILES=1):
+            response = self.archive(members)
+            self.assertEqual(response.status_code, 422)
+            self.assertIn('more than 1 CSV files', response.json()['error'])
+        with override_settings(MAX_UPLOAD_SIZE=100):
+            response = self.archive(members)
+            self.assertEqual(response.status_code, 422)
+            self.assertIn('exceeds maximum limit of 100 bytes', response.json()['error'])
+        with override_settings(ARCHIVE_MAX_SIZE=100):
+            self.assertEqual(self.archive(members).status_code, 413)
+        self.assertEqual(self.archive({}, name='batch.txt').status_code, 400)
+        self.assertFalse(Dataset.objects.exists())
+
+@override_settings(CHUNKED_UPLOAD_CHUNK_SIZE=1024)
+class ChunkedUploadTests(IsolatedStorageMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.data = synthetic_frame(100).to_csv(index=False).encode()
+        self.chunks = [self.data[start:start + 1024] for start in range(0, len(self.data), 1024)]
+    
+    def start(self, sha256=None):
+        response = self.client.post('/api/upload/chunked/', {
+            'filename': 'plant.csv',
+            'file_size': len(self.data),
+            'sha256': sha256 or hashlib.sha256(self.data).hexdigest(),
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.json()['upload_id']
+    
+    def send(self, upload_id, index, checksum=None, offset=None):
+        chunk = self.chunks[index]
+        return self.client.put(
+            f'/api/upload/chunked/{upload_id}/?offset={index * 1024 if offset is None else offset}',
+            data=chunk,
+            content_type='application/octet-stream',
+            HTTP_X_CHUNK_SHA256=checksum or hashlib.sha256(chunk).hexdigest()
+        )
+    
+    def finalize(self, upload_id):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(f'/api/upload/chunked/{upload_id}/finalize/')
+    
+    def part_path(self, upload_id):
+        return self.storage_root / 'media' / 'chunked' / f'{upload_id}.part'
+    
+    def test_resumes_from_offset_and_finalizes(self):
+        upload_id = self.start()
+        self.assertEqual(self.send(upload_id, 0).json()['offset'], 1024)
+        self.assertEqual(self.send(upload_id, 0).json()['offset'], 1024)
+        
+        response = self.send(upload_id, 2)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], 1024)
+        self.assertEqual(self.client.get(f'/api/upload/chunked/{upload_id}/').json()['offset'], 1024)
+        self.assertEqual(self.finalize(upload_id).status_code, 409)
+        
+        for index in range(1, len(self.chunks)):
+            self.assertEqual(self.send(upload_id, index).status_code, 200)
+        self.assertEqual(self.part_path(upload_id).read_bytes(), self.data)
+        
+        response = self.finalize(upload_id)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(self.client.get(f'/api/upload/chunked/{upload_id}/').status_code, 404)
+        self.assertTrue(self.part_path(upload_id).exists())
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            work(claim_next_job, process_job, 0, once=True)
+        job = self.client.get(f"/api/jobs/{response.json()['job_id']}/").json()
+        self.assertEqual(job['status'], IngestionJob.STATUS_COMPLETED)
+        self.assertEqual(Dataset.objects.get(pk=job['dataset_id']).row_count, 100)
+        self.assertEqual(Dataset.objects.get().file_hash, hashlib.sha256(self.data).hexdigest())
+        self.assertFalse(self.part_path(upload_id).exists())
+    
+    def test_finalize_failure_keeps_upload(self):
+        upload_id = self.start()
+        for index in range(len(self.chunks)):
+            self.send(upload_id, index)
+        
+        with mock.patch('equipment_api.views.IngestionJob.objects.create', side_effect=OperationalError('database is locked')):
+            with self.assertLogs('equipment_api.views', 'ERROR'):
+                self.assertEqual(self.finalize(upload_id).status_code, 500)
+        self.assertEqual(self.client.get(f'/api/upload/chunked/{upload_id}/').json()['offset'], len(self.data))
+        self.assertEqual(self.part_path(upload_id).read_bytes(), self.data)
+        
+        self.assertEqual(self.finalize(upload_id).status_code, 202)
+    
+    def test_rejects_corrupted_chunk(self):
+        upload_id = self.start()
+        response = self.send(upload_id, 0, checksum='0' * 64)
+        
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(self.client.get(f'/api/upload/chunked/{upload_id}/').json()['offset'], 0)
+        self.assertEqual(self.part_path(upload_id).stat().st_size, 0)
+        self.assertEqual(self.send(upload_id, 0).json()['offset'], 1024)
+    
+    def test_finalize_rejects_checksum_mismatch(self):
+        upload_id = self.start(sha256='0' * 64)
+        for index in range(len(self.chunks)):
+            self.send(upload_id, index)
+        
+        response = self.finalize(upload_id)
+        
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json()['error'], 'File checksum mismatch')
+        self.assertFalse(Dataset.objects.exists())
+        self.assertFalse(self.part_path(upload_id).exists())
+    
+    def test_expires_abandoned_uploads(self):
+        stale_id, fresh_id = self.start(), self.start()
+        self.send(stale_id, 0)
+        ChunkedUpload.objects.filter(upload_id=stale_id).update(updated_at=timezone.now() - timedelta(hours=25))
+        orphan = self.part_path('orphan')
+        orphan.write_bytes(b'x')
+        os.utime(orphan, (0, 0))
+        
+        output = io.StringIO()
+        call_command('expire_chunked_uploads', '--dry-run', stdout=output)
+        self.assertIn(f'Would expire upload {stale_id}', output.getvalue())
+        self.assertTrue(self.part_path(stale_id).exists())
+        
+        call_command('expire_chunked_uploads', stdout=io.StringIO())
+        self.assertFalse(self.part_path(stale_id).exists())
+        self.assertFalse(orphan.exists())
+        self.assertTrue(self.part_path(fresh_id).exists())
+        self.assertEqual([str(upload.upload_id) for upload in ChunkedUpload.objects.all()], [fresh_id])
+
+class RetentionTests(IsolatedStorageMixin, TestCase):
+    def dataset(self, seed, deactivated_days=None, client=None):
+        dataset_id = self.upload(synthetic_frame(20, seed=seed), name=f'plant_{seed}.csv', client=client).json()['dataset_id']
+        if deactivated_days is not None:
+            Dataset.objects.filter(pk=dataset_id).update(
+                is_active=False, deactivated_at=timezone.now() - timedelta(days=deactivated_days)
+            )
+        return Dataset.objects.select_related('content').get(pk=dataset_id)
+    
+    def compact(self, *args):
+        output = io.StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('compact_datasets', *args, stdout=output)
+        return output.getvalue()
+    
+    def test_selects_by_age_count_and_quota(self):
+        old, older, *_ = [self.dataset(seed, days) for seed, days in [(1, 40), (2, 3), (3, 2), (4, 1)]]
+        self.dataset(5)
+        
+        self.assertEqual(RetentionPolicy(30, 2, 0).select(), {old.id: 'age', older.id: 'count'})
+        self.assertEqual(RetentionPolicy(30, 10, 70).select(), {old.id: 'age', older.id: 'quota'})
+        self.assertEqual(RetentionPolicy(60, 10, 0).select(), {})
+    
+    def test_dry_run_then_purge_keeps_shared_content(self):
+        other = self.client_for(User.objects.create_user('other', password='secret'))
+        shared = self.dataset(1, 40)
+        self.dataset(1, client=other)
+        unique = self.dataset(2, 40)
+        store = get_columnar_store()
+        
+        output = self.compact('--dry-run', '--no-vacuum')
+        self.assertIn(f'Would purge dataset {shared.id} (plant_1.csv', output)
+        self.assertIn('Would purge 2 dataset(s)', output)
+        self.assertEqual(Dataset.objects.count(), 3)
+        
+        output = self.compact('--no-vacuum')
+        self.assertIn('Purged 2 dataset(s), deleted 20 equipment row(s)', output)
+        self.assertFalse(Dataset.objects.filter(pk__in=[shared.id, unique.id]).exists())
+        self.assertEqual(EquipmentData.objects.filter(content=shared.content).count(), 20)
+        self.assertEqual(DatasetContent.objects.get(pk=shared.content_id).file_hash, shared.content.file_hash)
+        self.assertIsNotNone(store.open(shared.content.file_hash))
+        self.assertFalse(DatasetContent.objects.filter(pk=unique.content_id).exists())
+        self.assertIsNone(store.open(unique.content.file_hash))
+    
+    def test_resumes_interrupted_purge(self):
+        dataset = self.dataset(1, 40)
+        with mock.patch('equipment_api.retention.time.sleep', side_effect=KeyboardInterrupt), \
+                self.assertRaises(KeyboardInterrupt):
+            self.compact('--no-vacuum', '--batch-size', '5', '--pause', '1')
+        
+        content = DatasetContent.objects.get(pk=dataset.content_id)
+        self.assertTrue(content.file_hash.startswith(PURGED_PREFIX))
+        self.assertEqual(EquipmentData.objects.filter(content=content).count(), 15)
+        self.assertEqual(RetentionPolicy(1000, 10, 0).select(), {dataset.id: 'resume'})
+        
+        self.compact('--no-vacuum', '--max-age-days', '1000', '--keep-inactive', '10')
+        self.assertFalse(Dataset.objects.exists())
+        self.assertFalse(EquipmentData.objects.exists())
+    
+    def test_reports_missing_incremental_vacuum(self):
+        self.dataset(1, 40)
+        output = self.compact()
+        self.assertIn('Incremental vacuum is not enabled', output)
+        self.assertIn('--enable-incremental-vacuum', output)
+
+class IngestionTests(IsolatedStorageMixin, TestCase):
+    def ingest(self, data, chunk_size=None, user=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return ingest_csv(
+                user or self.user, io.BytesIO(data), 'plant.csv', hashlib.sha256(data).hexdigest(), len(data),
+                chunk_size=chunk_size
+            )
+    
+    def test_chunked_ingest_matches_single_chunk(self):
+        df = synthetic_frame(1000, seed=1)
+        chunked = self.ingest(df.to_csv(index=False).encode(), chunk_size=128)
+        whole = self.ingest(df.assign(**{'Equipment Name': df['Equipment Name'] + '-whole'}).to_csv(index=False).encode())
+        
+        self.assertEqual(chunked.row_count, 1000)
+        self.assertEqual(
+            _copy_fields(chunked.content.summary, ('id', 'content', 'created_at')),
+            _copy_fields(whole.content.summary, ('id', 'content', 'created_at'))
+        )
+        rows = EquipmentData.objects.filter(content=chunked.content).order_by('id')
+        self.assertEqual(list(rows.values_list('equipment_name', flat=True)), df['Equipment Name'].tolist())
+        self.assertEqual(self.columns(chunked.id).column('id').tolist(), list(rows.values_list('id', flat=True)))
+    
+    def test_identical_files_share_content_across_users(self):
+        data = synthetic_frame(200).to_csv(index=False).encode()
+        first = self.ingest(data)
+        second = self.ingest(data, user=User.objects.create_user('other', password='secret'))
+        
+        self.assertEqual(first.content_id, second.content_id)
+        self.assertEqual(DatasetContent.objects.count(), 1)
+        self.assertEqual(EquipmentData.objects.count(), 200)
+        response = self.upload(synthetic_frame(200))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], 'This file has already been uploaded.')
+    
+    def test_empty_file_is_rejected(self):
+        response = self.upload(synthetic_frame(0))
+        
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json()['error'], 'CSV file contains no data rows')
+        self.assertFalse(DatasetContent.objects.exists())
+    
+    def test_failed_ingest_aborts_columnar_writer(self):
+        df = synthetic_frame(300).astype({'Pressure': object})
+        df.loc[250, 'Pressure'] = 'n/a'
+        
+        with self.assertRaises(ValueError):
+            self.ingest(df.to_csv(index=False).encode(), chunk_size=100)
+        
+        self.assertFalse(DatasetContent.objects.exists())
+        self.assertFalse(EquipmentData.objects.exists())
+        self.assertEqual(os.listdir(settings.COLUMNAR_STORE_ROOT), [])
+
+class UploadHashTests(IsolatedStorageMixin, TestCase):
+    def assertHashedWhileReceived(self, df, name):
+        data = df.to_csv(index=False).encode()
+        with mock.patch.object(CSVParser, 'generate_hash', side_effect=AssertionError('file was hashed twice')):
+            response = self.upload(df, name=name)
+        
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Dataset.objects.get(pk=response.json()['dataset_id']).file_hash, hashlib.sha256(data).hexdigest())
+    
+    def test_in_memory_upload(self):
+        self.assertHashedWhileReceived(synthetic_frame(5000, seed=1), 'memory.csv')
+    
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=1024)
+    def test_temporary_file_upload(self):
+        self.assertHashedWhileReceived(synthetic_frame(5000, seed=2), 'temporary.csv')
+
+class BulkLoaderTests(TestCase):
+    def load(self, rows, batch_size=4):
+        content = DatasetContent.objects.create(file_hash=f'{rows:064d}')
+        df = synthetic_frame(rows, seed=rows)
+        with CaptureQueriesContext(connection) as queries:
+            inserted = ColumnarBulkLoader(batch_size=batch_size).load(content, df)
+        inserts = [query for query in queries.captured_queries if 'INSERT INTO' in query['sql']]
+        return content, df, inserted, len(inserts)
+    
+    def test_batch_boundaries(self):
+        for rows, batches in [(0, 0), (3, 1), (4, 1), (5, 2), (9, 3)]:
+            with self.subTest(rows=rows):
+                content, df, inserted, inserts = self.load(rows)
+                self.assertEqual(inserted, rows)
+                self.assertEqual(inserts, batches)
+                stored = EquipmentData.objects.filter(content=content).order_by('id')
+                self.assertEqual(list(stored.values_list('equipment_name', flat=True)), df['Equipment Name'].tolist())
+                self.assertEqual(
+                    [float(value) for value in stored.values_list('pressure', flat=True)], df['Pressure'].round(2).tolist()
+                )
+
+class IngestJobTests(IsolatedStorageMixin, TestCase):
+    def submit(self, df, name='plant.csv'):
+        return self.client.post('/api/upload/?async=true', {'file': csv_file(df, name)}, format='multipart')
+    
+    def job(self, job_id):
+        return self.client.get(f'/api/jobs/{job_id}/').json()
+    
+    def test_async_upload_is_processed_by_worker(self):
+        response = self.submit(synthetic_frame(300))
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()['job_id']
+        self.assertEqual(self.submit(synthetic_frame(300)).json()['error'], 'This file is already being processed.')
+        self.assertEqual(self.job(job_id)['status'], IngestionJob.STATUS_PENDING)
+        upload = IngestionJob.objects.get(pk=job_id).upload.path
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            work(claim_next_job, process_job, 0, once=True)
+        
+        job = self.job(job_id)
+        self.assertEqual(job['status'], IngestionJob.STATUS_COMPLETED)
+        self.assertEqual(job['stage'], 'done')
+        self.assertEqual(job['rows_processed'], 300)
+        self.assertEqual(Dataset.objects.get(pk=job['dataset_id']).row_count, 300)
+        self.assertFalse(os.path.exists(upload))
+    
+    def test_jobs_are_claimed_once_in_order(self):
+        first = self.submit(synthetic_frame(10, seed=1), 'first.csv').json()['job_id']
+        second = self.submit(synthetic_frame(10, seed=2), 'second.csv').json()['job_id']
+        
+        job = claim_next_job()
+        self.assertEqual((job.id, job.status, job.attempts), (first, IngestionJob.STATUS_RUNNING, 1))
+        self.assertEqual(claim_next_job().id, second)
+        self.assertIsNone(claim_next_job())
+        
+        self.assertEqual(requeue_interrupted_jobs(), 2)
+        self.assertEqual(self.job(first)['status'], IngestionJob.STATUS_PENDING)
+        self.assertEqual(claim_next_job().attempts, 2)
+    
+    @override_settings(INGEST_MAX_ATTEMPTS=2)
+    def test_locked_database_is_retried(self):
+        job_id = self.submit(synthetic_frame(10)).json()['job_id']
+        
+        with mock.patch('equipment_api.jobs.ingest_csv', side_effect=OperationalError('database is locked')):
+            with self.assertLogs('equipment_api.jobs', 'WARNING'):
+                process_job(claim_next_job())
+            self.assertEqual(self.job(job_id)['status'], IngestionJob.STATUS_PENDING)
+            
+            with self.assertLogs('equipment_api.jobs', 'ERROR'):
+                process_job(claim_next_job())
+        
+        job = self.job(job_id)
+        self.assertEqual(job['status'], IngestionJob.STATUS_FAILED)
+        self.assertEqual(job['error'], 'An error occurred while processing the file.')
+        self.assertIsNone(claim_next_job())
+    
+    def test_invalid_file_fails_job(self):
+        job_id = self.submit(synthetic_frame(0)).json()['job_id']
+        process_job(claim_next_job())
+        
+        job = self.job(job_id)
+        self.assertEqual(job['status'], IngestionJob.STATUS_FAILED)
+        self.assertEqual(job['error'], 'CSV file contains no data rows')
+
+class EquipmentPagingTests(IsolatedStorageMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.df = synthetic_frame(250, seed=7)
+        other = self.client_for(User.objects.create_user('other', password='secret'))
+        self.upload(synthetic_frame(40, seed=8), client=other)
+        self.dataset_id = self.upload(self.df).json()['dataset_id']
+        self.url = f'/api/datasets/{self.dataset_id}/equipment/'
+    
+    def pages(self, limit):
+        pages = []
+        url = f'{self.url}?limit={limit}'
+        while url:
+            body = self.client.get(url).json()
+            pages.append(body['results'])
+            url = body['next']
+        return pages
+    
+    def test_keyset_pages_cover_every_row_once(self):
+        for enabled in (True, False):
+            with self.subTest(columnar=enabled), override_settings(COLUMNAR_STORE_ENABLED=enabled):
+                pages = self.pages(100)
+                self.assertEqual([len(page) for page in pages], [100, 100, 50])
+                rows = [row for page in pages for row in page]
+                ids = [row['id'] for row in rows]
+                self.assertEqual(ids, sorted(set(ids)))
+                self.assertEqual([row['equipment_name'] for row in rows], self.df['Equipment Name'].tolist())
+    
+    def test_after_and_limit(self):
+        ids = [row['id'] for row in self.pages(1000)[0]]
+        
+        body = self.client.get(self.url, {'after': ids[9], 'limit': 5}).json()
+        self.assertEqual([row['id'] for row in body['results']], ids[10:15])
+        self.assertEqual(body['count'], 250)
+        self.assertIn(f'after={ids[14]}', body['next'])
+        self.assertEqual(self.client.get(self.url, {'after': ids[-1]}).json(), {
+            'dataset_id': self.dataset_id, 'count': 250, 'next': None, 'results': []
+        })
+        self.assertEqual(self.client.get(self.url, {'after': 'x'}).status_code, 400)
+        with override_settings(EQUIPMENT_MAX_PAGE_SIZE=20):
+            self.assertEqual(len(self.client.get(self.url, {'limit': 500}).json()['results']), 20)
+    
+    @override_settings(EQUIPMENT_STREAM_CHUNK_SIZE=64)
+    def test_stream_mode_returns_every_row(self):
+        expected = self.pages(1000)[0]
+        for enabled in (True, False):
+            with self.subTest(columnar=enabled), override_settings(COLUMNAR_STORE_ENABLED=enabled):
+                response = self.client.get(self.url, {'stream': 'true'})
+                self.assertEqual(response['Content-Type'], 'application/json')
+                self.assertEqual(json.loads(b''.join(response.streaming_content)), expected)
+
+class DatasetSerializationTests(IsolatedStorageMixin, TestCase):
+    def test_fast_path_matches_model_serializer(self):
+        df = synthetic_frame(300, seed=9)
+        df.loc[5, 'Flowrate'] = 12.5
+        df.loc[6, 'Pressure'] = 100000.1
+        dataset_id = self.upload(df).json()['dataset_id']
+        dataset = Dataset.objects.select_related('content').get(pk=dataset_id)
+        expected = json.loads(json.dumps(DatasetDetailSerializer(dataset).data, cls=DjangoJSONEncoder))
+        
+        for enabled in (True, False):
+            with self.subTest(columnar=enabled), override_settings(COLUMNAR_STORE_ENABLED=enabled):
+                response = self.client.get(f'/api/datasets/{dataset_id}/')
+                self.assertEqual(response['Content-Type'], 'application/json')
+                self.assertEqual(response.json(), expected)
+                self.assertEqual(response.json()['equipment'][5]['flowrate'], '12.50')
+                
+                rows = self.client.get(f'/api/datasets/{dataset_id}/equipment/', {'limit': 1000}).json()['results']
+                self.assertEqual(rows, expected['equipment'])
+
+class SummaryCacheTests(IsolatedStorageMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.dataset_id = self.upload(synthetic_frame(100, seed=1)).json()['dataset_id']
+    
+    def cached(self, dataset_id):
+        return [caches['summaries'].get(f'dataset-{kind}:{dataset_id}') for kind in ('summary', 'types')]
+    
+    def test_revalidation_returns_not_modified(self):
+        for path in ['/api/summary/{}/', '/api/summary/{}/types/', '/api/summary/{}/distribution/']:
+            with self.subTest(path=path):
+                url = path.format(self.dataset_id)
+                response = self.client.get(url)
+                etag = response['ETag']
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['Cache-Control'], 'private, no-cache')
+                
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+    
+    def test_append_changes_etag(self):
+        url = f'/api/summary/{self.dataset_id}/'
+        etag = self.client.get(url)['ETag']
+        self.append(self.dataset_id, synthetic_frame(50, seed=2))
+        
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['statistics']['total_count'], 150)
+    
+    def test_delete_and_deactivate_invalidate(self):
+        self.client.get(f'/api/summary/{self.dataset_id}/')
+        self.client.get(f'/api/summary/{self.dataset_id}/types/')
+        self.assertTrue(all(self.cached(self.dataset_id)))
+        
+        for seed in range(2, 7):
+            self.upload(synthetic_frame(10, seed=seed), name=f'plant_{seed}.csv')
+        self.assertFalse(Dataset.objects.get(pk=self.dataset_id).is_active)
+        self.assertEqual(self.cached(self.dataset_id), [None, None])
+        
+        self.client.get(f'/api/summary/{self.dataset_id}/')
+        self.assertEqual(self.client.delete(f'/api/datasets/{self.dataset_id}/delete/').status_code, 200)
+        self.assertEqual(self.cached(self.dataset_id), [None, None])
+        self.assertEqual(self.client.get(f'/api/summary/{self.dataset_id}/').status_code, 404)
+
+class WireFormatTests(IsolatedStorageMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.dataset_id = self.upload(synthetic_frame(120, seed=3)).json()['dataset_id']
+        self.rows = self.client.get(f'/api/datasets/{self.dataset_id}/').json()['equipment']
+    
+    def get(self, accept, path=''):
+        response = self.client.get(f'/api/datasets/{self.dataset_id}/{path}', HTTP_ACCEPT=accept)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'].split(';')[0], accept)
+        return response
+    
+    def assertColumnsMatchRows(self, columns, rows):
+        self.assertEqual(list(columns), EQUIPMENT_FIELDS)
+        self.assertEqual(columns['id'], [row['id'] for row in rows])
+        self.assertEqual(columns['equipment_name'], [row['equipment_name'] for row in rows])
+        self.assertEqual(columns['equipment_type'], [row['equipment_type'] for row in rows])
+        for field in ('flowrate', 'pressure', 'temperature'):
+            self.assertEqual([f'{value:.2f}' for value in columns[field]], [row[field] for row in rows])
+    
+    def test_columnar_json(self):
+        for enabled in (True, False):
+            with self.subTest(columnar=enabled), override_settings(COLUMNAR_STORE_ENABLED=enabled):
+                body = self.get('application/vnd.equipment.columns+json').json()
+                self.assertEqual(body['row_count'], 120)
+                self.assertColumnsMatchRows(body['equipment'], self.rows)
+    
+    @skipIf(msgpack is None, 'msgpack is not installed')
+    def test_msgpack(self):
+        body = msgpack.unpackb(self.get('application/msgpack').content)
+        self.assertEqual(body['filename'], 'plant.csv')
+        self.assertColumnsMatchRows(body['equipment'], self.rows)
+    
+    @skipIf(pa is None, 'pyarrow is not installed')
+    def test_arrow_stream(self):
+        table = pa.ipc.open_stream(self.get('application/vnd.apache.arrow.stream').content).read_all()
+        metadata = table.schema.metadata
+        self.assertEqual(metadata[b'columns'], b'equipment')
+        self.assertEqual(json.loads(metadata[b'payload'])['row_count'], 120)
+        self.assertTrue(pa.types.is_dictionary(table.schema.field('equipment_type').type))
+        self.assertColumnsMatchRows(table.to_pydict(), self.rows)
+    
+    @skipIf(pa is None, 'pyarrow is not installed')
+    def test_equipment_pages_negotiate_format(self):
+        response = self.get('application/vnd.apache.arrow.stream', 'equipment/?limit=50')
+        table = pa.ipc.open_stream(response.content).read_all()
+        payload = json.loads(table.schema.metadata[b'payload'])
+        self.assertIn(f"after={self.rows[49]['id']}", payload['next'])
+        self.assertColumnsMatchRows(table.to_pydict(), self.rows[:50])
+    
+    def test_json_is_the_default(self):
+        response = self.client.get(f'/api/datasets/{self.dataset_id}/')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json()['equipment'][0], self.rows[0])
+        self.assertEqual(self.client.get(f'/api/datasets/{self.dataset_id}/', HTTP_ACCEPT='text/csv').status_code, 406)
+
+class BatchTests(IsolatedStorageMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.dataset_id = self.upload(synthetic_frame(60, seed=1)).json()['dataset_id']
+        other = self.client_for(User.objects.create_user('other', password='secret'))
+        self.other_id = self.upload(synthetic_frame(60, seed=2), client=other).json()['dataset_id']
+    
+    def batch(self, requests):
+        return self.client.post('/api/batch/', {'requests': requests}, format='json')
+    
+    def test_per_item_statuses(self):
+        response = self.batch([
+            {'id': 'all', 'op': 'list'},
+            {'op': 'summary', 'dataset_id': self.dataset_id},
+            {'id': 'rows', 'op': 'dataset', 'dataset_id': self.dataset_id, 'columnar': True},
+            {'op': 'types', 'dataset_id': self.other_id},
+            {'op': 'distribution', 'dataset_id': 'x'},
+            {'op': 'delete', 'dataset_id': self.dataset_id},
+        ])
+        
+        self.assertEqual(response.status_code, 200)
+        responses = response.json()['responses']
+        self.assertEqual(
+            [(item['id'], item['status']) for item in responses],
+            [('all', 200), ('summary', 200), ('rows', 200), ('types', 404), ('distribution', 404), ('delete', 400)]
+        )
+        self.assertEqual([dataset['id'] for dataset in responses[0]['body']['results']], [self.dataset_id])
+        self.assertEqual(responses[1]['body'], self.client.get(f'/api/summary/{self.dataset_id}/').json())
+        self.assertEqual(len(responses[2]['body']['equipment']['id']), 60)
+        self.assertEqual(responses[5]['body'], {'error': 'Unknown operation: delete'})
+    
+    def test_datasets_are_looked_up_once(self):
+        requests = [{'op': op, 'dataset_id': self.dataset_id} for op in ('summary', 'types', 'distribution')]
+        self.batch(requests)
+        with CaptureQueriesContext(connection) as queries:
+            self.batch(requests)
+        dataset_queries = [query for query in queries.captured_queries if 'FROM "equipment_api_dataset"' in query['sql']]
+        self.assertEqual(len(dataset_queries), 1)
+    
+    def test_invalid_batches(self):
+        self.assertEqual(self.batch([]).status_code, 400)
+        self.assertEqual(self.batch(['summary']).status_code, 400)
+        with override_settings(BATCH_MAX_REQUESTS=1):
+            self.assertEqual(self.batch([{'op': 'list'}, {'op': 'list'}]).status_code, 400)
+
+class DistributionTests(IsolatedStorageMixin, TestCase):
+    def assertQuantilesMatch(self, distribution, values):
+        quantiles = [distribution['quantiles'][f'p{q}'] for q in RunningStatistics.QUANTILES]
+        expected = np.percentile(values, RunningStatistics.QUANTILES, method='inverted_cdf')
+        self.assertEqual(quantiles, sorted(quantiles))
+        self.assertGreaterEqual(quantiles[0], round(values.min(), 2))
+        self.assertLessEqual(quantiles[-1], round(values.max(), 2))
+        np.testing.assert_allclose(quantiles, expected, rtol=2 * RunningStatistics.RELATIVE_ACCURACY + 0.005, atol=0.01)
+        self.assertEqual(sum(distribution['counts']), len(values))
+    
+    def test_quantiles_match_numpy(self):
+        df = synthetic_frame(2000, seed=11)
+        dataset_id = self.upload(df).json()['dataset_id']
+        body = self.client.get(f'/api/summary/{dataset_id}/distribution/').json()
+        
+        self.assertEqual(body['quantiles'], ['p5', 'p25', 'p50', 'p75', 'p95'])
+        for column, field in RunningStatistics.NUMERIC_COLUMNS.items():
+            with self.subTest(field=field):
+                self.assertQuantilesMatch(body['overall'][field], df[column])
+                for eq_type, group in df.groupby('Type'):
+                    self.assertQuantilesMatch(body['types'][eq_type][field], group[column])
+    
+    def test_sketch_survives_serialization(self):
+        stats = RunningStatistics()
+        stats.update(synthetic_frame(500, seed=12))
+        restored = RunningStatistics.from_records(stats.get_type_stats())
+        self.assertEqual(restored.compute_distributions(), stats.compute_distributions())
+    
+    def test_append_merges_distributions(self):
+        first, second = synthetic_frame(700, seed=13), synthetic_frame(300, seed=14)
+        appended_id = self.upload(first).json()['dataset_id']
+        self.append(appended_id, second)
+        combined_id = self.upload(pd.concat([first, second], ignore_index=True), name='combined.csv').json()['dataset_id']
+        
+        appended = self.client.get(f'/api/summary/{appended_id}/distribution/').json()
+        combined = self.client.get(f'/api/summary/{combined_id}/distribution/').json()
+        self.assertEqual({**appended, 'dataset_id': None}, {**combined, 'dataset_id': None})
+
+class ChartDataTests(IsolatedStorageMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.df = synthetic_frame(400, seed=5)
+        self.dataset_id = self.upload(self.df).json()['dataset_id']
+        self.url = f'/api/datasets/{self.dataset_id}/chart-data/'
+    
+    def test_scatter_bins_match_numpy(self):
+        bounds = [(round(self.df[column].min(), 2), round(self.df[column].max(), 2)) for column in ('Pressure', 'Temperature')]
+        expected, _, _ = np.histogram2d(self.df['Pressure'], self.df['Temperature'], bins=10, range=bounds)
+        for enabled in (True, False):
+            with self.subTest(columnar=enabled), override_settings(COLUMNAR_STORE_ENABLED=enabled):
+                body = self.client.get(self.url, {'bins': 10, 'x': 'pressure', 'y': 'temperature'}).json()
+                counts = np.zeros((10, 10))
+                for row, col, count in body['cells']:
+                    counts[row, col] = count
+                self.assertEqual(body['total'], 400)
+                self.assertEqual(counts.tolist(), expected.tolist())
+        
+        body = self.client.get(self.url, {'type': 'Pump'}).json()
+        self.assertEqual(body['total'], int((self.df['Type'] == 'Pump').sum()))
+        self.assertEqual(self.client.get(self.url, {'type': 'Boiler'}).json()['cells'], [])
+    
+    def test_top_per_type(self):
+        body = self.client.get(self.url, {'chart': 'top', 'metric': 'flowrate', 'n': 3}).json()
+        for entry in body['types']:
+            expected = self.df[self.df['Type'] == entry['equipment_type']].nlargest(3, 'Flowrate')
+            self.assertEqual([row['equipment_name'] for row in entry['equipment']], expected['Equipment Name'].tolist())
+            self.assertEqual([row['flowrate'] for row in entry['equipment']], expected['Flowrate'].round(2).tolist())
+    
+    def test_options_are_validated_and_clamped(self):
+        with override_settings(CHART_MAX_BINS=30, CHART_MAX_TOP_N=2):
+            self.assertEqual(self.client.get(self.url, {'bins': 1000}).json()['bins'], 30)
+            self.assertEqual(self.client.get(self.url, {'bins': 1}).json()['bins'], 2)
+            self.assertEqual(self.client.get(self.url, {'chart': 'top', 'n': 50}).json()['n'], 2)
+        for params in [{'x': 'pressure', 'y': 'pressure'}, {'x': 'name'}, {'bins': 'many'}, {'chart': 'pie'}]:
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(self.url, params).status_code, 400)
+    
+    def test_results_are_cached_per_options_and_content(self):
+        builder = mock.Mock(wraps=CHART_BUILDERS['scatter'])
+        with mock.patch.dict(CHART_BUILDERS, {'scatter': builder}):
+            etag = self.client.get(self.url, {'bins': 10, 'x': 'pressure'})['ETag']
+            response = self.client.get(self.url, {'x': 'pressure', 'bins': 10, 'unused': 1}, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(builder.call_count, 1)
+            
+            self.client.get(self.url, {'bins': 11, 'x': 'pressure'})
+            self.assertEqual(builder.call_count, 2)
+            
+            self.append(self.dataset_id, synthetic_frame(10, seed=6))
+            body = self.client.get(self.url, {'bins': 10, 'x': 'pressure'}).json()
+            self.assertEqual(builder.call_count, 3)
+            self.assertEqual(body['total'], 410)
@@ -0,0 +1,25 @@
+import hashlib
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+
+class SHA256UploadMixin:
+    def new_file(self, *args, **kwargs):
+        self.sha256 = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+    
+    def receive_data_chunk(self, raw_data, start):
+        remaining = super().receive_data_chunk(raw_data, start)
+        if remaining is None:
+            self.sha256.update(raw_data)
+        return remaining
+    
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        if file is not None:
+            file.sha256 = self.sha256.hexdigest()
+        return file
+
+class HashingMemoryFileUploadHandler(SHA256UploadMixin, MemoryFileUploadHandler):
+    pass
+
+class HashingTemporaryFileUploadHandler(SHA256UploadMixin, TemporaryFileUploadHandler):
+    pass
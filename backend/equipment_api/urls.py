@@ -3,10 +3,26 @@ from . import views
 
 urlpatterns = [
     path('upload/', views.upload_csv, name='upload-csv'),
+    path('upload/archive/', views.upload_archive, name='upload-archive'),
+    path('upload/chunked/', views.init_chunked_upload, name='init-chunked-upload'),
+    path('upload/chunked/<uuid:upload_id>/', views.chunked_upload, name='chunked-upload'),
+    path('upload/chunked/<uuid:upload_id>/finalize/', views.finalize_chunked_upload, name='finalize-chunked-upload'),
+    path('batch/', views.batch, name='batch'),
+    path('jobs/<int:job_id>/', views.get_ingest_job, name='get-ingest-job'),
     path('datasets/list/', views.list_datasets, name='list-datasets'),
+    path('datasets/compare/', views.compare, name='compare-datasets'),
     path('datasets/<int:dataset_id>/', views.get_dataset, name='get-dataset'),
+    path('datasets/<int:dataset_id>/equipment/', views.list_equipment, name='list-equipment'),
+    path('datasets/<int:dataset_id>/query/', views.query_equipment, name='query-equipment'),
+    path('datasets/<int:dataset_id>/chart-data/', views.get_chart_data, name='get-chart-data'),
+    path('datasets/<int:dataset_id>/append/', views.append_to_dataset, name='append-to-dataset'),
     path('datasets/<int:dataset_id>/delete/', views.delete_dataset, name='delete-dataset'),
     path('summary/<int:dataset_id>/', views.get_summary, name='get-summary'),
     path('summary/<int:dataset_id>/types/', views.get_type_stats, name='get-type-stats'),
+    path('summary/<int:dataset_id>/distribution/', views.get_distribution, name='get-distribution'),
     path('report/<int:dataset_id>/pdf/', views.generate_pdf_report, name='generate-pdf'),
+    path('report/<int:dataset_id>/jobs/', views.submit_report_job, name='submit-report-job'),
+    path('report/export/', views.export_reports, name='export-reports'),
+    path('report/jobs/<int:job_id>/', views.get_report_job, name='get-report-job'),
+    path('report/jobs/<int:job_id>/download/', views.download_report_job, name='download-report-job'),
 ]
\ No newline at end of file
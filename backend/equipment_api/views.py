@@ -1,15 +1,76 @@
+import hashlib
+import logging
+import os
 from rest_framework import viewsets, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.conf import settings
-from django.http import HttpResponse
-from .models import Dataset, EquipmentData, DatasetSummary, EquipmentTypeStats
-from .serializers import (DatasetListSerializer, DatasetDetailSerializer, 
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from rest_framework.utils.urls import replace_query_param
+from .models import Dataset, DatasetSummary, EquipmentTypeStats, IngestionJob, ChunkedUpload, ReportJob
+from .serializers import (DatasetListSerializer, 
                           EquipmentTypeStatsSerializer, SummaryResponseSerializer)
 from data_processor.csv_parser import CSVParser
-from data_processor.analyzer import DataAnalyzer
+from data_processor.archive import is_archive
 from data_processor.pdf_generator import PDFReportGenerator
+from .ingestion import ingest_csv, ingest_archive, append_csv, find_content
+from .jobs import get_job_progress
+from .report_jobs import queue_report_job, stored_report
+from .report_export import (stored_reports, estimated_report_size, failed_reports, queue_missing_reports, 
+                            stream_report_archive)
+from .storage import get_report_store
+from .summary_cache import cached_summary_response, cached_chart_response, get_cached_summary
+from .renderers import DATASET_RENDERER_CLASSES
+from .queries import build_equipment_query
+from .chart_data import CHART_BUILDERS, parse_chart_options
+from .comparison import compare_datasets
+from .equipment_rows import EQUIPMENT_FIELDS, all_equipment, equipment_columns, equipment_column_data, equipment_records, equipment_page, iter_equipment_rows, stream_json_array
+
+logger = logging.getLogger(__name__)
+
+def _ingest_upload(request, file, filename, file_hash, file_size, stored_name=None, run_async=False):
+    if Dataset.objects.filter(file_hash=file_hash, user=request.user).exists():
+        return Response({'error': 'This file has already been uploaded.'}, 
+                        status=status.HTTP_400_BAD_REQUEST)
+    
+    run_async = run_async or request.query_params.get('async', 'false').lower() == 'true'
+    if run_async and not find_content(file_hash):
+        in_flight = IngestionJob.objects.filter(
+            user=request.user,
+            file_hash=file_hash,
+            status__in=[IngestionJob.STATUS_PENDING, IngestionJob.STATUS_RUNNING]
+        )
+        if in_flight.exists():
+            return Response({'error': 'This file is already being processed.'}, 
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        job = IngestionJob.objects.create(
+            user=request.user,
+            upload=stored_name or file,
+            filename=filename,
+            file_hash=file_hash,
+            file_size=file_size
+        )
+        return Response({
+            'job_id': job.id,
+            'filename': job.filename,
+            'status': job.status,
+            'message': 'File accepted for processing'
+        }, status=status.HTTP_202_ACCEPTED)
+    
+    dataset = ingest_csv(request.user, file, filename, file_hash, file_size)
+    
+    return Response({
+        'dataset_id': dataset.id,
+        'filename': dataset.filename,
+        'upload_date': dataset.upload_date,
+        'row_count': dataset.row_count,
+        'file_size': dataset.file_size,
+        'message': 'File uploaded and processed successfully'
+    }, status=status.HTTP_201_CREATED)
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -28,153 +89,482 @@ def upload_csv(request):
                         status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
     
     try:
-        parser = CSVParser()
-        analyzer = DataAnalyzer()
-        
-        file_hash = parser.generate_hash(file)
-        file.seek(0)
-        
-        if Dataset.objects.filter(file_hash=file_hash, user=request.user).exists():
-            return Response({'error': 'This file has already been uploaded.'}, 
-                            status=status.HTTP_400_BAD_REQUEST)
-        
-        df = parser.parse_file(file)
-        
-        dataset = Dataset.objects.create(
-            user=request.user,
-            filename=file.name,
-            file_hash=file_hash,
-            file_size=file.size,
-            row_count=len(df)
-        )
-        
-        equipment_list = []
-        for _, row in df.iterrows():
-            equipment_list.append(EquipmentData(
-                dataset=dataset,
-                equipment_name=row['Equipment Name'],
-                equipment_type=row['Type'],
-                flowrate=row['Flowrate'],
-                pressure=row['Pressure'],
-                temperature=row['Temperature']
-            ))
-        EquipmentData.objects.bulk_create(equipment_list)
-        
-        summary_data = analyzer.compute_statistics(df)
-        DatasetSummary.objects.create(dataset=dataset, **summary_data)
-        
-        type_distribution = analyzer.get_type_distribution(df)
-        for type_data in type_distribution:
-            type_stats = analyzer.get_type_statistics(df, type_data['equipment_type'])
-            EquipmentTypeStats.objects.create(
-                dataset=dataset,
-                equipment_type=type_data['equipment_type'],
-                count=type_data['count'],
-                percentage=type_data['percentage'],
-                **type_stats
-            )
-        
-        return Response({
-            'dataset_id': dataset.id,
-            'filename': dataset.filename,
-            'upload_date': dataset.upload_date,
-            'row_count': dataset.row_count,
-            'file_size': dataset.file_size,
-            'message': 'File uploaded and processed successfully'
-        }, status=status.HTTP_201_CREATED)
-        
+        file_hash = getattr(file, 'sha256', None) or CSVParser().generate_hash(file)
+        return _ingest_upload(request, file, file.name, file_hash, file.size)
     except ValueError as e:
         return Response({'error': str(e)}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        print(f"❌ REAL ERROR: {e}")
+    except Exception:
+        logger.exception('Failed to process upload %s', file.name)
         return Response({'error': 'An error occurred while processing the file.'}, 
                         status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def upload_archive(request):
+    file = request.FILES.get('file')
+    
+    if not file:
+        return Response({'error': 'No file provided'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    if not is_archive(file.name):
+        return Response({'error': 'Invalid file format. Only zip and tar archives are allowed.'}, 
+                        status=status.HTTP_400_BAD_REQUEST)
+    
+    if file.size > settings.ARCHIVE_MAX_SIZE:
+        return Response({'error': f'File size exceeds maximum limit of {settings.ARCHIVE_MAX_SIZE} bytes.'}, 
+                        status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+    
+    try:
+        results = ingest_archive(request.user, file, file.name)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    
+    created = sum(1 for result in results if result['status'] == 'created')
+    return Response({
+        'filename': file.name,
+        'file_count': len(results),
+        'created_count': created,
+        'results': results,
+        'message': f'{created} of {len(results)} files processed successfully'
+    }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+def _chunked_upload_state(upload):
+    return {
+        'upload_id': str(upload.upload_id),
+        'filename': upload.filename,
+        'file_size': upload.file_size,
+        'offset': upload.received_bytes,
+        'chunk_size': settings.CHUNKED_UPLOAD_CHUNK_SIZE,
+        'status': upload.status,
+    }
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def init_chunked_upload(request):
+    filename = request.data.get('filename', '')
+    sha256 = request.data.get('sha256', '').lower()
+    
+    try:
+        file_size = int(request.data.get('file_size'))
+    except (TypeError, ValueError):
+        return Response({'error': 'file_size must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    if not filename.endswith('.csv'):
+        return Response({'error': 'Invalid file format. Only CSV files are allowed.'}, 
+                        status=status.HTTP_400_BAD_REQUEST)
+    
+    if file_size <= 0 or file_size > settings.CHUNKED_UPLOAD_MAX_SIZE:
+        return Response({'error': f'File size must be between 1 and {settings.CHUNKED_UPLOAD_MAX_SIZE} bytes.'}, 
+                        status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+    
+    if sha256 and Dataset.objects.filter(file_hash=sha256, user=request.user).exists():
+        return Response({'error': 'This file has already been uploaded.'}, 
+                        status=status.HTTP_400_BAD_REQUEST)
+    
+    upload = ChunkedUpload.objects.create(
+        user=request.user,
+        filename=filename,
+        file_size=file_size,
+        sha256=sha256
+    )
+    os.makedirs(os.path.dirname(default_storage.path(upload.storage_name)), exist_ok=True)
+    open(default_storage.path(upload.storage_name), 'wb').close()
+    
+    return Response(_chunked_upload_state(upload), status=status.HTTP_201_CREATED)
+
+@api_view(['GET', 'PUT'])
+@permission_classes([IsAuthenticated])
+def chunked_upload(request, upload_id):
+    try:
+        upload = ChunkedUpload.objects.get(upload_id=upload_id, user=request.user, 
+                                           status=ChunkedUpload.STATUS_ACTIVE)
+    except ChunkedUpload.DoesNotExist:
+        return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    if request.method == 'GET':
+        return Response(_chunked_upload_state(upload))
+    
+    try:
+        offset = int(request.query_params.get('offset'))
+    except (TypeError, ValueError):
+        return Response({'error': 'offset must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    chunk_length = int(request.META.get('CONTENT_LENGTH') or 0)
+    if chunk_length == 0:
+        return Response({'error': 'Empty chunk'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    if chunk_length > settings.CHUNKED_UPLOAD_CHUNK_SIZE:
+        return Response({'error': f'Chunk exceeds maximum size of {settings.CHUNKED_UPLOAD_CHUNK_SIZE} bytes.'}, 
+                        status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+    
+    if offset + chunk_length <= upload.received_bytes:
+        return Response(_chunked_upload_state(upload))
+    
+    if offset != upload.received_bytes:
+        return Response({'error': 'Offset does not match the bytes received so far', 
+                         **_chunked_upload_state(upload)}, status=status.HTTP_409_CONFLICT)
+    
+    if offset + chunk_length > upload.file_size:
+        return Response({'error': 'Chunk extends past the declared file size'}, 
+                        status=status.HTTP_400_BAD_REQUEST)
+    
+    checksum = request.headers.get('X-Chunk-SHA256', '').lower()
+    if not checksum:
+        return Response({'error': 'X-Chunk-SHA256 header is required'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    sha256 = hashlib.sha256()
+    with open(default_storage.path(upload.storage_name), 'r+b') as part:
+        part.seek(offset)
+        part.truncate()
+        remaining = chunk_length
+        while remaining:
+            data = request.stream.read(min(remaining, CSVParser.HASH_CHUNK_SIZE))
+            if not data:
+                break
+            sha256.update(data)
+            part.write(data)
+            remaining -= len(data)
+        
+        if remaining or sha256.hexdigest() != checksum:
+            part.truncate(offset)
+            return Response({'error': 'Chunk checksum mismatch'}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    
+    upload.received_bytes = offset + chunk_length
+    upload.save(update_fields=['received_bytes', 'updated_at'])
+    return Response(_chunked_upload_state(upload))
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def finalize_chunked_upload(request, upload_id):
+    try:
+        upload = ChunkedUpload.objects.get(upload_id=upload_id, user=request.user, 
+                                           status=ChunkedUpload.STATUS_ACTIVE)
+    except ChunkedUpload.DoesNotExist:
+        return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    if upload.received_bytes != upload.file_size:
+        return Response({'error': 'Upload is incomplete', **_chunked_upload_state(upload)}, 
+                        status=status.HTTP_409_CONFLICT)
+    
+    try:
+        with default_storage.open(upload.storage_name, 'rb') as file:
+            file_hash = CSVParser().generate_hash(file)
+            if upload.sha256 and upload.sha256 != file_hash:
+                response = Response({'error': 'File checksum mismatch'}, 
+                                    status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+            else:
+                response = _ingest_upload(request, file, upload.filename, file_hash, upload.file_size, 
+                                          stored_name=upload.storage_name, run_async=True)
+    except ValueError as e:
+        response = Response({'error': str(e)}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    except Exception:
+        logger.exception('Failed to finalize chunked upload %s', upload.upload_id)
+        return Response({'error': 'An error occurred while processing the file. Retry finalizing the upload.'}, 
+                        status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    if response.status_code != status.HTTP_202_ACCEPTED:
+        default_storage.delete(upload.storage_name)
+    upload.status = ChunkedUpload.STATUS_COMPLETE
+    upload.save(update_fields=['status', 'updated_at'])
+    return response
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_ingest_job(request, job_id):
+    try:
+        job = IngestionJob.objects.get(id=job_id, user=request.user)
+    except IngestionJob.DoesNotExist:
+        return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    stage, rows_processed = get_job_progress(job)
+    return Response({
+        'job_id': job.id,
+        'filename': job.filename,
+        'status': job.status,
+        'stage': stage,
+        'rows_processed': rows_processed,
+        'error': job.error or None,
+        'dataset_id': job.dataset_id,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+    })
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def list_datasets(request):
     active_only = request.query_params.get('active_only', 'true').lower() == 'true'
-    
-    queryset = Dataset.objects.filter(user=request.user)
+    return Response(_dataset_list(request.user, active_only))
+
+def _dataset_list(user, active_only):
+    queryset = Dataset.objects.filter(user=user)
     if active_only:
         queryset = queryset.filter(is_active=True)
     
     serializer = DatasetListSerializer(queryset, many=True)
-    return Response({
+    return {
         'count': queryset.count(),
         'results': serializer.data
-    })
+    }
+
+def _dataset_detail(dataset, columnar=False):
+    data = DatasetListSerializer(dataset).data
+    if columnar:
+        data['equipment'] = equipment_columns(dataset.content)
+    else:
+        data['equipment'] = all_equipment(dataset.content)
+    return data
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@renderer_classes(DATASET_RENDERER_CLASSES)
 def get_dataset(request, dataset_id):
     try:
-        dataset = Dataset.objects.get(id=dataset_id, user=request.user)
-        serializer = DatasetDetailSerializer(dataset)
-        return Response(serializer.data)
+        dataset = Dataset.objects.select_related('content').get(id=dataset_id, user=request.user)
+        return Response(_dataset_detail(dataset, getattr(request.accepted_renderer, 'columnar', False)))
     except Dataset.DoesNotExist:
         return Response({'error': 'Dataset not found'}, status=status.HTTP_404_NOT_FOUND)
 
-@api_view(['DELETE'])
+@api_view(['GET'])
 @permission_classes([IsAuthenticated])
-def delete_dataset(request, dataset_id):
+@renderer_classes(DATASET_RENDERER_CLASSES)
+def list_equipment(request, dataset_id):
+    try:
+        dataset = Dataset.objects.select_related('content').get(id=dataset_id, user=request.user)
+    except Dataset.DoesNotExist:
+        return Response({'error': 'Dataset not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    if request.query_params.get('stream', 'false').lower() == 'true':
+        rows = iter_equipment_rows(dataset.content, settings.EQUIPMENT_STREAM_CHUNK_SIZE)
+        return StreamingHttpResponse(
+            stream_json_array(rows, settings.EQUIPMENT_STREAM_CHUNK_SIZE),
+            content_type='application/json'
+        )
+    
+    try:
+        after = int(request.query_params.get('after', 0))
+        limit = int(request.query_params.get('limit', settings.EQUIPMENT_PAGE_SIZE))
+    except ValueError:
+        return Response({'error': 'after and limit must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    limit = max(1, min(limit, settings.EQUIPMENT_MAX_PAGE_SIZE))
+    if getattr(request.accepted_renderer, 'columnar', False):
+        results = equipment_columns(dataset.content, after, limit)
+        row_ids = results['id']
+    else:
+        results = equipment_page(dataset.content, after, limit)
+        row_ids = [row['id'] for row in results]
+    
+    next_url = None
+    if len(row_ids) == limit:
+        next_url = replace_query_param(request.build_absolute_uri(), 'after', int(row_ids[-1]))
+    
+    return Response({
+        'dataset_id': dataset.id,
+        'count': dataset.row_count,
+        'next': next_url,
+        'results': results
+    })
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@renderer_classes(DATASET_RENDERER_CLASSES)
+def query_equipment(request, dataset_id):
     try:
         dataset = Dataset.objects.get(id=dataset_id, user=request.user)
-        dataset.delete()
-        return Response({'message': 'Dataset deleted successfully'}, status=status.HTTP_200_OK)
     except Dataset.DoesNotExist:
         return Response({'error': 'Dataset not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    try:
+        queryset = build_equipment_query(
+            dataset.content_id, request.query_params,
+            settings.EQUIPMENT_PAGE_SIZE, settings.EQUIPMENT_MAX_PAGE_SIZE
+        )
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    rows = queryset.values_list(*EQUIPMENT_FIELDS)
+    if getattr(request.accepted_renderer, 'columnar', False):
+        results = equipment_column_data(rows)
+    else:
+        results = equipment_records(rows)
+    
+    return Response({
+        'dataset_id': dataset.id,
+        'results': results
+    })
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-def get_summary(request, dataset_id):
+def compare(request):
+    try:
+        ids = [int(value) for param in request.query_params.getlist('ids') for value in param.split(',') if value]
+    except ValueError:
+        return Response({'error': 'ids must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+    ids = list(dict.fromkeys(ids))
+    
+    if len(ids) < 2:
+        return Response({'error': 'At least two dataset IDs are required'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    if len(ids) > settings.COMPARE_MAX_DATASETS:
+        return Response({'error': f'At most {settings.COMPARE_MAX_DATASETS} datasets can be compared'}, 
+                        status=status.HTTP_400_BAD_REQUEST)
+    
+    datasets = Dataset.objects.filter(user=request.user).in_bulk(ids)
+    missing = [dataset_id for dataset_id in ids if dataset_id not in datasets]
+    if missing:
+        return Response({'error': f"Datasets not found: {', '.join(map(str, missing))}"}, 
+                        status=status.HTTP_404_NOT_FOUND)
+    
+    return Response(compare_datasets([datasets[dataset_id] for dataset_id in ids]))
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_chart_data(request, dataset_id):
+    try:
+        dataset = Dataset.objects.select_related('content').get(id=dataset_id, user=request.user)
+    except Dataset.DoesNotExist:
+        return Response({'error': 'Dataset not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    try:
+        chart, options = parse_chart_options(
+            request.query_params, settings.CHART_BINS, settings.CHART_MAX_BINS,
+            settings.CHART_TOP_N, settings.CHART_MAX_TOP_N
+        )
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return cached_chart_response(request, dataset.content, chart, options, CHART_BUILDERS[chart])
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def append_to_dataset(request, dataset_id):
+    file = request.FILES.get('file')
+    
+    if not file:
+        return Response({'error': 'No file provided'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    if not file.name.endswith('.csv'):
+        return Response({'error': 'Invalid file format. Only CSV files are allowed.'}, 
+                        status=status.HTTP_400_BAD_REQUEST)
+    
+    if file.size > settings.MAX_UPLOAD_SIZE:
+        return Response({'error': f'File size exceeds maximum limit of {settings.MAX_UPLOAD_SIZE} bytes.'}, 
+                        status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+    
     try:
         dataset = Dataset.objects.get(id=dataset_id, user=request.user)
-        summary = DatasetSummary.objects.get(dataset=dataset)
-        type_stats = EquipmentTypeStats.objects.filter(dataset=dataset).order_by('-count')
-        
-        response_data = {
+    except Dataset.DoesNotExist:
+        return Response({'error': 'Dataset not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    try:
+        file_hash = getattr(file, 'sha256', None) or CSVParser().generate_hash(file)
+        dataset, rows_appended = append_csv(dataset, file, file_hash, file.size)
+        return Response({
             'dataset_id': dataset.id,
             'filename': dataset.filename,
-            'upload_date': dataset.upload_date,
-            'statistics': {
-                'total_count': summary.total_count,
-                'averages': {
-                    'flowrate': float(summary.avg_flowrate) if summary.avg_flowrate else None,
-                    'pressure': float(summary.avg_pressure) if summary.avg_pressure else None,
-                    'temperature': float(summary.avg_temperature) if summary.avg_temperature else None,
+            'row_count': dataset.row_count,
+            'rows_appended': rows_appended,
+            'message': 'Rows appended successfully'
+        }, status=status.HTTP_200_OK)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+@api_view(['DELETE'])
+@permission_classes([IsAuthenticated])
+def delete_dataset(request, dataset_id):
+    try:
+        dataset = Dataset.objects.get(id=dataset_id, user=request.user)
+        dataset.delete()
+        return Response({'message': 'Dataset deleted successfully'}, status=status.HTTP_200_OK)
+    except Dataset.DoesNotExist:
+        return Response({'error': 'Dataset not found'}, status=status.HTTP_404_NOT_FOUND)
+
+def _build_summary(dataset):
+    summary = DatasetSummary.objects.get(content=dataset.content_id)
+    type_stats = EquipmentTypeStats.objects.filter(content=dataset.content_id).order_by('-count')
+    
+    return {
+        'dataset_id': dataset.id,
+        'filename': dataset.filename,
+        'upload_date': dataset.upload_date,
+        'statistics': {
+            'total_count': summary.total_count,
+            'averages': {
+                'flowrate': float(summary.avg_flowrate) if summary.avg_flowrate else None,
+                'pressure': float(summary.avg_pressure) if summary.avg_pressure else None,
+                'temperature': float(summary.avg_temperature) if summary.avg_temperature else None,
+            },
+            'ranges': {
+                'flowrate': {
+                    'min': float(summary.min_flowrate) if summary.min_flowrate else None,
+                    'max': float(summary.max_flowrate) if summary.max_flowrate else None,
                 },
+                'pressure': {
+                    'min': float(summary.min_pressure) if summary.min_pressure else None,
+                    'max': float(summary.max_pressure) if summary.max_pressure else None,
+                },
+                'temperature': {
+                    'min': float(summary.min_temperature) if summary.min_temperature else None,
+                    'max': float(summary.max_temperature) if summary.max_temperature else None,
+                },
+            }
+        },
+        'type_distribution': [
+            {
+                'equipment_type': stat.equipment_type,
+                'count': stat.count,
+                'percentage': float(stat.percentage),
+                'avg_flowrate': float(stat.avg_flowrate) if stat.avg_flowrate else None,
+                'avg_pressure': float(stat.avg_pressure) if stat.avg_pressure else None,
+                'avg_temperature': float(stat.avg_temperature) if stat.avg_temperature else None,
                 'ranges': {
                     'flowrate': {
-                        'min': float(summary.min_flowrate) if summary.min_flowrate else None,
-                        'max': float(summary.max_flowrate) if summary.max_flowrate else None,
+                        'min': float(stat.min_flowrate) if stat.min_flowrate else None,
+                        'max': float(stat.max_flowrate) if stat.max_flowrate else None,
+                        'std': float(stat.std_flowrate) if stat.std_flowrate else None,
                     },
                     'pressure': {
-                        'min': float(summary.min_pressure) if summary.min_pressure else None,
-                        'max': float(summary.max_pressure) if summary.max_pressure else None,
+                        'min': float(stat.min_pressure) if stat.min_pressure else None,
+                        'max': float(stat.max_pressure) if stat.max_pressure else None,
+                        'std': float(stat.std_pressure) if stat.std_pressure else None,
                     },
                     'temperature': {
-                        'min': float(summary.min_temperature) if summary.min_temperature else None,
-                        'max': float(summary.max_temperature) if summary.max_temperature else None,
+                        'min': float(stat.min_temperature) if stat.min_temperature else None,
+                        'max': float(stat.max_temperature) if stat.max_temperature else None,
+                        'std': float(stat.std_temperature) if stat.std_temperature else None,
                     },
-                }
-            },
-            'type_distribution': [
-                {
-                    'equipment_type': stat.equipment_type,
-                    'count': stat.count,
-                    'percentage': float(stat.percentage),
-                    'avg_flowrate': float(stat.avg_flowrate) if stat.avg_flowrate else None,
-                    'avg_pressure': float(stat.avg_pressure) if stat.avg_pressure else None,
-                    'avg_temperature': float(stat.avg_temperature) if stat.avg_temperature else None,
-                }
-                for stat in type_stats
-            ]
-        }
-        
-        return Response(response_data)
+                },
+            }
+            for stat in type_stats
+        ]
+    }
+
+def _build_type_stats(dataset):
+    type_stats = EquipmentTypeStats.objects.filter(content=dataset.content_id).order_by('-count')
+    
+    return {
+        'dataset_id': dataset.id,
+        'types': [
+            {
+                'equipment_type': stat.equipment_type,
+                'count': stat.count,
+                'percentage': float(stat.percentage)
+            }
+            for stat in type_stats
+        ]
+    }
+
+def _build_distribution(dataset):
+    summary = DatasetSummary.objects.get(content=dataset.content_id)
+    return {'dataset_id': dataset.id, **summary.distributions}
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_summary(request, dataset_id):
+    try:
+        dataset = Dataset.objects.select_related('content').get(id=dataset_id, user=request.user)
+        return cached_summary_response(request, dataset, 'summary', _build_summary)
     except Dataset.DoesNotExist:
         return Response({'error': 'Dataset not found'}, status=status.HTTP_404_NOT_FOUND)
     except DatasetSummary.DoesNotExist:
@@ -184,38 +574,242 @@ def get_summary(request, dataset_id):
 @permission_classes([IsAuthenticated])
 def get_type_stats(request, dataset_id):
     try:
-        dataset = Dataset.objects.get(id=dataset_id, user=request.user)
-        type_stats = EquipmentTypeStats.objects.filter(dataset=dataset).order_by('-count')
-        
-        response_data = {
-            'dataset_id': dataset.id,
-            'types': [
-                {
-                    'equipment_type': stat.equipment_type,
-                    'count': stat.count,
-                    'percentage': float(stat.percentage)
-                }
-                for stat in type_stats
-            ]
-        }
-        
-        return Response(response_data)
+        dataset = Dataset.objects.select_related('content').get(id=dataset_id, user=request.user)
+        return cached_summary_response(request, dataset, 'types', _build_type_stats)
     except Dataset.DoesNotExist:
         return Response({'error': 'Dataset not found'}, status=status.HTTP_404_NOT_FOUND)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_distribution(request, dataset_id):
+    try:
+        dataset = Dataset.objects.select_related('content').get(id=dataset_id, user=request.user)
+        return cached_summary_response(request, dataset, 'distribution', _build_distribution)
+    except Dataset.DoesNotExist:
+        return Response({'error': 'Dataset not found'}, status=status.HTTP_404_NOT_FOUND)
+    except DatasetSummary.DoesNotExist:
+        return Response({'error': 'Summary not found'}, status=status.HTTP_404_NOT_FOUND)
+
+def _batch_dataset_id(sub_request):
+    try:
+        return int(sub_request.get('dataset_id'))
+    except (TypeError, ValueError):
+        return None
+
+def _run_batch_request(user, sub_request, datasets):
+    op = sub_request.get('op')
+    result = {'id': sub_request.get('id', op)}
+    
+    if op == 'list':
+        return {**result, 'status': 200, 'body': _dataset_list(user, sub_request.get('active_only', True))}
+    
+    if op not in ('dataset', 'summary', 'types', 'distribution'):
+        return {**result, 'status': 400, 'body': {'error': f'Unknown operation: {op}'}}
+    
+    dataset = datasets.get(_batch_dataset_id(sub_request))
+    if dataset is None:
+        return {**result, 'status': 404, 'body': {'error': 'Dataset not found'}}
+    
+    try:
+        if op == 'dataset':
+            body = _dataset_detail(dataset, bool(sub_request.get('columnar')))
+        elif op == 'summary':
+            body = get_cached_summary(dataset, 'summary', _build_summary)['data']
+        elif op == 'distribution':
+            body = get_cached_summary(dataset, 'distribution', _build_distribution)['data']
+        else:
+            body = get_cached_summary(dataset, 'types', _build_type_stats)['data']
+    except DatasetSummary.DoesNotExist:
+        return {**result, 'status': 404, 'body': {'error': 'Summary not found'}}
+    
+    return {**result, 'status': 200, 'body': body}
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def batch(request):
+    sub_requests = request.data.get('requests')
+    
+    if not isinstance(sub_requests, list) or not sub_requests:
+        return Response({'error': 'requests must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    if len(sub_requests) > settings.BATCH_MAX_REQUESTS:
+        return Response({'error': f'A batch can contain at most {settings.BATCH_MAX_REQUESTS} requests'}, 
+                        status=status.HTTP_400_BAD_REQUEST)
+    
+    if not all(isinstance(sub_request, dict) for sub_request in sub_requests):
+        return Response({'error': 'Each request must be an object'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    dataset_ids = {_batch_dataset_id(sub_request) for sub_request in sub_requests} - {None}
+    datasets = Dataset.objects.select_related('content').filter(user=request.user).in_bulk(dataset_ids)
+    
+    return Response({
+        'responses': [_run_batch_request(request.user, sub_request, datasets) for sub_request in sub_requests]
+    })
+
+def _stored_report_response(store, path, filename):
+    if not settings.REPORT_ACCEL_REDIRECT_PREFIX:
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=filename, content_type='application/pdf')
+    
+    response = HttpResponse(content_type='application/pdf')
+    response['X-Accel-Redirect'] = settings.REPORT_ACCEL_REDIRECT_PREFIX + os.path.relpath(path, store.root)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def generate_pdf_report(request, dataset_id):
     try:
-        dataset = Dataset.objects.get(id=dataset_id, user=request.user)
-        generator = PDFReportGenerator()
-        pdf_buffer = generator.generate_report(dataset)
+        dataset = Dataset.objects.select_related('content').get(id=dataset_id, user=request.user)
+        full = request.query_params.get('full', 'false').lower() == 'true'
+        filename = f'equipment_report_{dataset_id}_full.pdf' if full else f'equipment_report_{dataset_id}.pdf'
         
-        response = HttpResponse(pdf_buffer.getvalue(), content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="equipment_report_{dataset_id}.pdf"'
-        return response
+        store = get_report_store()
+        path = store.get(dataset.id, PDFReportGenerator.TEMPLATE_VERSION, dataset.content.file_hash, full=full)
+        if path is not None:
+            return _stored_report_response(store, path, filename)
+        
+        job, _ = queue_report_job(request.user, dataset, full)
+        if job is None:
+            return Response({'error': f'No more than {settings.REPORT_MAX_QUEUED_JOBS} reports can be queued at once.'},
+                            status=status.HTTP_429_TOO_MANY_REQUESTS)
+        path = stored_report(job) if job.status == ReportJob.STATUS_COMPLETED else None
+        if path is not None:
+            return _stored_report_response(store, path, filename)
+        return _report_job_response(request, job, status.HTTP_202_ACCEPTED)
     except Dataset.DoesNotExist:
         return Response({'error': 'Dataset not found'}, status=status.HTTP_404_NOT_FOUND)
-    except Exception as e:
+    except Exception:
+        logger.exception('Failed to generate PDF report for dataset %s', dataset_id)
         return Response({'error': 'Failed to generate PDF report'}, 
-                        status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+                        status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def export_reports(request):
+    datasets = Dataset.objects.select_related('content').filter(user=request.user)
+    full = str(request.data.get('full', 'false')).lower() == 'true'
+    
+    if str(request.data.get('all', 'false')).lower() == 'true':
+        datasets = list(datasets.order_by('upload_date', 'id'))
+    else:
+        dataset_ids = request.data.get('dataset_ids')
+        if not isinstance(dataset_ids, list) or not dataset_ids:
+            return Response({'error': 'dataset_ids must be a non-empty list, or set all to true'}, 
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            dataset_ids = list(dict.fromkeys(int(dataset_id) for dataset_id in dataset_ids))
+        except (TypeError, ValueError):
+            return Response({'error': 'dataset_ids must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        found = datasets.in_bulk(dataset_ids)
+        missing = [dataset_id for dataset_id in dataset_ids if dataset_id not in found]
+        if missing:
+            return Response({'error': f"Datasets not found: {', '.join(map(str, missing))}"}, 
+                            status=status.HTTP_404_NOT_FOUND)
+        datasets = [found[dataset_id] for dataset_id in dataset_ids]
+    
+    if not datasets:
+        return Response({'error': 'No datasets to export'}, status=status.HTTP_404_NOT_FOUND)
+    
+    if len(datasets) > settings.REPORT_EXPORT_MAX_DATASETS:
+        return Response({'error': f'At most {settings.REPORT_EXPORT_MAX_DATASETS} reports can be exported at once'}, 
+                        status=status.HTTP_400_BAD_REQUEST)
+    
+    reports = stored_reports(datasets, full)
+    export_size = sum(estimated_report_size(dataset, path, full) for dataset, path in reports)
+    if export_size > settings.REPORT_EXPORT_MAX_BYTES:
+        return Response({'error': f'These reports need about {export_size // 2 ** 20 + 1} MB, more than the '
+                                  f'{settings.REPORT_EXPORT_MAX_BYTES // 2 ** 20} MB one export can hold. '
+                                  'Export fewer datasets at a time.'},
+                        status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+    failed = failed_reports([dataset for dataset, path in reports if path is None], full)
+    pending = [dataset for dataset, path in reports if path is None and dataset.id not in failed]
+    if pending:
+        jobs = queue_missing_reports(request.user, pending, full)
+        response = Response({
+            'status': 'pending',
+            'ready_count': sum(1 for _, path in reports if path is not None),
+            'pending_count': len(pending),
+            'jobs': [
+                {
+                    'job_id': job.id,
+                    'dataset_id': job.dataset_id,
+                    'status': job.status,
+                    'url': request.build_absolute_uri(reverse('get-report-job', args=[job.id])),
+                }
+                for job in jobs
+            ],
+            'message': f'{len(pending)} reports are being rendered. Repeat the export once they are ready.'
+        }, status=status.HTTP_202_ACCEPTED)
+        response['Retry-After'] = str(settings.REPORT_EXPORT_RETRY_AFTER)
+        return response
+    
+    response = StreamingHttpResponse(
+        stream_report_archive(
+            [(dataset, path) for dataset, path in reports if path is not None],
+            [dataset for dataset, _ in reports if dataset.id in failed]
+        ),
+        content_type='application/zip'
+    )
+    response['Content-Disposition'] = 'attachment; filename="equipment_reports.zip"'
+    return response
+
+def _report_job_response(request, job, status_code=status.HTTP_200_OK):
+    data = {
+        'job_id': job.id,
+        'dataset_id': job.dataset_id,
+        'full': job.full,
+        'status': job.status,
+        'error': job.error or None,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+        'download_url': None,
+    }
+    if job.status == ReportJob.STATUS_COMPLETED:
+        data['download_url'] = request.build_absolute_uri(reverse('download-report-job', args=[job.id]))
+    return Response(data, status=status_code)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def submit_report_job(request, dataset_id):
+    try:
+        dataset = Dataset.objects.select_related('content').get(id=dataset_id, user=request.user)
+    except Dataset.DoesNotExist:
+        return Response({'error': 'Dataset not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    full = str(request.data.get('full', 'false')).lower() == 'true'
+    job, created = queue_report_job(request.user, dataset, full)
+    if job is None:
+        return Response({'error': f'No more than {settings.REPORT_MAX_QUEUED_JOBS} reports can be queued at once.'},
+                        status=status.HTTP_429_TOO_MANY_REQUESTS)
+    if job.status == ReportJob.STATUS_COMPLETED:
+        return _report_job_response(request, job)
+    return _report_job_response(request, job, status.HTTP_202_ACCEPTED)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_report_job(request, job_id):
+    try:
+        job = ReportJob.objects.get(id=job_id, user=request.user)
+    except ReportJob.DoesNotExist:
+        return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+    return _report_job_response(request, job)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def download_report_job(request, job_id):
+    try:
+        job = ReportJob.objects.get(id=job_id, user=request.user)
+    except ReportJob.DoesNotExist:
+        return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    if job.status != ReportJob.STATUS_COMPLETED:
+        return Response({'error': 'Report is not ready'}, status=status.HTTP_409_CONFLICT)
+    
+    path = stored_report(job)
+    if path is None:
+        return Response({'error': 'Report is no longer available. Submit a new report job.'},
+                        status=status.HTTP_410_GONE)
+    suffix = '_full' if job.full else ''
+    return _stored_report_response(get_report_store(), path, f'equipment_report_{job.dataset_id}{suffix}.pdf')
\ No newline at end of file
@@ -0,0 +1,81 @@
+import multiprocessing
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections
+from django.db.models import F
+from django.utils import timezone
+
+def claim_next(model, **running_fields):
+    while True:
+        job = model.objects.filter(status=model.STATUS_PENDING).order_by('created_at').first()
+        if job is None:
+            return None
+        
+        claimed = model.objects.filter(pk=job.pk, status=model.STATUS_PENDING).update(
+            status=model.STATUS_RUNNING,
+            attempts=F('attempts') + 1,
+            started_at=timezone.now(),
+            **running_fields
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+def requeue_interrupted(model, **pending_fields):
+    return model.objects.filter(status=model.STATUS_RUNNING).update(
+        status=model.STATUS_PENDING,
+        started_at=None,
+        **pending_fields
+    )
+
+def work(claim, process, poll_interval, once):
+    while True:
+        try:
+            job = claim()
+        except OperationalError:
+            time.sleep(poll_interval)
+            continue
+        if job is None:
+            if once:
+                break
+            time.sleep(poll_interval)
+            continue
+        process(job)
+    connections.close_all()
+
+class JobWorkerCommand(BaseCommand):
+    job_name = None
+    workers_setting = None
+    poll_interval_setting = None
+    claim = None
+    process = None
+    requeue = None
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=getattr(settings, self.workers_setting))
+        parser.add_argument('--poll-interval', type=float, default=getattr(settings, self.poll_interval_setting))
+        parser.add_argument('--once', action='store_true', help='Exit once the queue is empty.')
+    
+    def handle(self, *args, **options):
+        requeued = self.requeue()
+        if requeued:
+            self.stdout.write(f'Requeued {requeued} interrupted {self.job_name} job(s)')
+        
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(
+                target=work, args=(self.claim, self.process, options['poll_interval'], options['once'])
+            )
+            for _ in range(options['workers'])
+        ]
+        for process in processes:
+            process.start()
+        self.stdout.write(f'Started {len(processes)} {self.job_name} worker(s)')
+        
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
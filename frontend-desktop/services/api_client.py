@@ -1,12 +1,35 @@
+import hashlib
+import json
+import os
+import time
+import pandas as pd
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+ARROW_STREAM = 'application/vnd.apache.arrow.stream'
+MSGPACK = 'application/msgpack'
+COLUMNAR_JSON = 'application/vnd.equipment.columns+json'
+EQUIPMENT_COLUMNS = ['id', 'equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature']
+
 class APIClient:
+    RESUMABLE_UPLOAD_THRESHOLD = 8 * 1024 * 1024
+    
     def __init__(self, base_url):
         self.base_url = base_url
         self.token = None
         self.session = requests.Session()
+        self._summary_cache = {}
         
         retry = Retry(total=3, backoff_factor=0.3)
         adapter = HTTPAdapter(max_retries=retry)
@@ -46,6 +69,116 @@ class APIClient:
         else:
             raise Exception(response.json().get('error', 'Upload failed'))
     
+    def upload_csv_resumable(self, file_path, upload_id=None, progress=None, max_retries=5):
+        file_size = os.path.getsize(file_path)
+        headers = {'Authorization': f'Token {self.token}'}
+        
+        if upload_id:
+            state = self._get_chunked_upload(upload_id)
+        else:
+            response = self.session.post(
+                f'{self.base_url}/upload/chunked/',
+                json={
+                    'filename': os.path.basename(file_path),
+                    'file_size': file_size,
+                    'sha256': self._file_sha256(file_path)
+                },
+                headers=self._get_headers()
+            )
+            if response.status_code != 201:
+                raise Exception(response.json().get('error', 'Upload failed'))
+            state = response.json()
+        
+        upload_id = state['upload_id']
+        offset = state['offset']
+        retries = 0
+        
+        with open(file_path, 'rb') as f:
+            while offset < file_size:
+                f.seek(offset)
+                chunk = f.read(state['chunk_size'])
+                try:
+                    response = self.session.put(
+                        f'{self.base_url}/upload/chunked/{upload_id}/',
+                        params={'offset': offset},
+                        data=chunk,
+                        headers={
+                            **headers,
+                            'Content-Type': 'application/octet-stream',
+                            'X-Chunk-SHA256': hashlib.sha256(chunk).hexdigest()
+                        }
+                    )
+                except requests.RequestException:
+                    retries += 1
+                    if retries > max_retries:
+                        raise Exception(f'Upload interrupted, resume with upload_id {upload_id}')
+                    time.sleep(min(2 ** retries, 30))
+                    offset = self._get_chunked_upload(upload_id)['offset']
+                    continue
+                
+                if response.status_code == 409:
+                    offset = response.json()['offset']
+                    continue
+                if response.status_code != 200:
+                    raise Exception(response.json().get('error', 'Upload failed'))
+                
+                offset = response.json()['offset']
+                retries = 0
+                if progress:
+                    progress(offset, file_size)
+        
+        response = self.session.post(
+            f'{self.base_url}/upload/chunked/{upload_id}/finalize/',
+            headers=self._get_headers()
+        )
+        if response.status_code == 202:
+            return self.wait_for_ingest_job(response.json()['job_id'])
+        if response.status_code in [200, 201]:
+            return response.json()
+        if response.status_code >= 500:
+            raise Exception(f'Finalizing failed, resume with upload_id {upload_id}')
+        else:
+            raise Exception(response.json().get('error', 'Upload failed'))
+    
+    def wait_for_ingest_job(self, job_id, timeout=3600, interval=2):
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get_ingest_job(job_id)
+            if job['status'] == 'completed':
+                return job
+            if job['status'] == 'failed':
+                raise Exception(job.get('error') or 'Upload failed')
+            if time.monotonic() >= deadline:
+                raise Exception(f'Timed out waiting for ingestion job {job_id}')
+            time.sleep(interval)
+    
+    def get_ingest_job(self, job_id):
+        response = self.session.get(
+            f'{self.base_url}/jobs/{job_id}/',
+            headers=self._get_headers()
+        )
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise Exception('Failed to get ingestion job')
+    
+    def _get_chunked_upload(self, upload_id):
+        response = self.session.get(
+            f'{self.base_url}/upload/chunked/{upload_id}/',
+            headers=self._get_headers()
+        )
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise Exception(response.json().get('error', 'Upload not found'))
+    
+    def _file_sha256(self, file_path):
+        sha256 = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                sha256.update(block)
+        return sha256.hexdigest()
+    
     def list_datasets(self, active_only=True):
         params = {'active_only': 'true' if active_only else 'false'}
         response = self.session.get(
@@ -58,6 +191,17 @@ class APIClient:
         else:
             raise Exception('Failed to list datasets')
     
+    def compare_datasets(self, dataset_ids):
+        response = self.session.get(
+            f'{self.base_url}/datasets/compare/',
+            params={'ids': ','.join(str(dataset_id) for dataset_id in dataset_ids)},
+            headers=self._get_headers()
+        )
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise Exception(response.json().get('error', 'Failed to compare datasets'))
+    
     def get_dataset(self, dataset_id):
         response = self.session.get(
             f'{self.base_url}/datasets/{dataset_id}/',
@@ -68,32 +212,207 @@ class APIClient:
         else:
             raise Exception('Failed to get dataset')
     
+    def get_dataset_frame(self, dataset_id):
+        headers = self._get_headers()
+        headers['Accept'] = self._columnar_accept()
+        
+        response = self.session.get(
+            f'{self.base_url}/datasets/{dataset_id}/',
+            headers=headers
+        )
+        if response.status_code == 406:
+            return self._equipment_frame(self.get_dataset(dataset_id))
+        if response.status_code == 200:
+            return self._decode_dataset(response)
+        else:
+            raise Exception('Failed to get dataset')
+    
+    def _columnar_accept(self):
+        media_types = []
+        if pa is not None:
+            media_types.append(ARROW_STREAM)
+        if msgpack is not None:
+            media_types.append(MSGPACK)
+        media_types.append(COLUMNAR_JSON)
+        return ', '.join(media_types)
+    
+    def _decode_dataset(self, response):
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip()
+        if content_type == ARROW_STREAM:
+            table = pa.ipc.open_stream(response.content).read_all()
+            data = json.loads(table.schema.metadata[b'payload'])
+            data['equipment'] = table.to_pandas()
+            return data
+        
+        if content_type == MSGPACK:
+            data = msgpack.unpackb(response.content)
+        else:
+            data = response.json()
+        return self._equipment_frame(data)
+    
+    def _equipment_frame(self, data):
+        equipment = data['equipment']
+        if isinstance(equipment, dict):
+            equipment = pd.DataFrame(equipment, columns=EQUIPMENT_COLUMNS)
+        else:
+            equipment = pd.DataFrame.from_records(equipment, columns=EQUIPMENT_COLUMNS)
+        numeric = ['flowrate', 'pressure', 'temperature']
+        equipment[numeric] = equipment[numeric].astype(float)
+        data['equipment'] = equipment
+        return data
+    
+    def batch(self, requests):
+        response = self.session.post(
+            f'{self.base_url}/batch/',
+            json={'requests': requests},
+            headers=self._get_headers()
+        )
+        if response.status_code != 200:
+            raise Exception(response.json().get('error', 'Batch request failed'))
+        
+        responses = response.json()['responses']
+        for sub_request, result in zip(requests, responses):
+            if sub_request.get('op') == 'dataset' and sub_request.get('columnar') and result['status'] == 200:
+                self._equipment_frame(result['body'])
+        return responses
+    
+    def query_equipment(self, dataset_id, **filters):
+        response = self.session.get(
+            f'{self.base_url}/datasets/{dataset_id}/query/',
+            params=filters,
+            headers=self._get_headers()
+        )
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise Exception(response.json().get('error', 'Failed to query equipment'))
+    
+    def get_chart_data(self, dataset_id, **params):
+        response = self.session.get(
+            f'{self.base_url}/datasets/{dataset_id}/chart-data/',
+            params=params,
+            headers=self._get_headers()
+        )
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise Exception(response.json().get('error', 'Failed to get chart data'))
+    
     def get_summary(self, dataset_id):
+        headers = self._get_headers()
+        cached = self._summary_cache.get(dataset_id)
+        if cached:
+            headers['If-None-Match'] = cached[0]
+        
         response = self.session.get(
             f'{self.base_url}/summary/{dataset_id}/',
+            headers=headers
+        )
+        if response.status_code == 304 and cached:
+            return cached[1]
+        if response.status_code == 200:
+            data = response.json()
+            if response.headers.get('ETag'):
+                self._summary_cache[dataset_id] = (response.headers['ETag'], data)
+            return data
+        else:
+            raise Exception('Failed to get summary')
+    
+    def get_distribution(self, dataset_id):
+        response = self.session.get(
+            f'{self.base_url}/summary/{dataset_id}/distribution/',
             headers=self._get_headers()
         )
         if response.status_code == 200:
             return response.json()
         else:
-            raise Exception('Failed to get summary')
+            raise Exception('Failed to get distribution')
     
-    def get_pdf_report(self, dataset_id):
+    def get_pdf_report(self, dataset_id, full=False, timeout=600):
         response = self.session.get(
             f'{self.base_url}/report/{dataset_id}/pdf/',
+            params={'full': 'true'} if full else None,
             headers={'Authorization': f'Token {self.token}'}
         )
+        if response.status_code == 202:
+            return self.wait_for_report_job(response.json()['job_id'], timeout)
         if response.status_code == 200:
             return response.content
         else:
             raise Exception('Failed to generate PDF')
     
+    def wait_for_report_job(self, job_id, timeout=600, interval=2):
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get_report_job(job_id)
+            if job['status'] == 'completed':
+                return self.download_report_job(job_id)
+            if job['status'] == 'failed':
+                raise Exception(job.get('error') or 'Failed to generate PDF')
+            if time.monotonic() >= deadline:
+                raise Exception('Timed out waiting for the report to render')
+            time.sleep(interval)
+    
+    def submit_report_job(self, dataset_id, full=False):
+        response = self.session.post(
+            f'{self.base_url}/report/{dataset_id}/jobs/',
+            json={'full': full},
+            headers=self._get_headers()
+        )
+        if response.status_code in (200, 202):
+            return response.json()
+        else:
+            raise Exception(response.json().get('error', 'Failed to submit report'))
+    
+    def get_report_job(self, job_id):
+        response = self.session.get(
+            f'{self.base_url}/report/jobs/{job_id}/',
+            headers=self._get_headers()
+        )
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise Exception('Failed to get report job')
+    
+    def download_report_job(self, job_id):
+        response = self.session.get(
+            f'{self.base_url}/report/jobs/{job_id}/download/',
+            headers={'Authorization': f'Token {self.token}'}
+        )
+        if response.status_code == 200:
+            return response.content
+        else:
+            raise Exception(response.json().get('error', 'Failed to download report'))
+    
+    def export_reports(self, path, dataset_ids=None, full=False, timeout=600):
+        payload = {'dataset_ids': dataset_ids, 'full': full} if dataset_ids else {'all': True, 'full': full}
+        deadline = time.monotonic() + timeout
+        while True:
+            with self.session.post(
+                f'{self.base_url}/report/export/',
+                json=payload,
+                headers=self._get_headers(),
+                stream=True
+            ) as response:
+                if response.status_code == 200:
+                    with open(path, 'wb') as archive:
+                        for chunk in response.iter_content(chunk_size=1024 * 1024):
+                            archive.write(chunk)
+                    return path
+                if response.status_code != 202:
+                    raise Exception(response.json().get('error', 'Failed to export reports'))
+                if time.monotonic() >= deadline:
+                    raise Exception('Timed out waiting for reports to render')
+                delay = int(response.headers.get('Retry-After', 5))
+            time.sleep(delay)
+    
     def delete_dataset(self, dataset_id):
         response = self.session.delete(
             f'{self.base_url}/datasets/{dataset_id}/delete/',
             headers=self._get_headers()
         )
         if response.status_code == 200:
+            self._summary_cache.pop(dataset_id, None)
             return response.json()
         else:
             raise Exception('Failed to delete dataset')
\ No newline at end of file
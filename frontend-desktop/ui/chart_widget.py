@@ -1,6 +1,7 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+import numpy as np
 
 class ChartWidget(QWidget):
     def __init__(self):
@@ -12,9 +13,9 @@ class ChartWidget(QWidget):
         layout.addWidget(self.canvas)
         self.setLayout(layout)
     
-    def plot_type_distribution(self, type_distribution):
+    def plot_type_distribution(self, type_distribution, scatter=None):
         self.figure.clear()
-        ax = self.figure.add_subplot(111)
+        ax = self.figure.add_subplot(121 if scatter else 111)
         
         if not type_distribution:
             ax.text(0.5, 0.5, 'No data available', ha='center', va='center')
@@ -29,4 +30,22 @@ class ChartWidget(QWidget):
                startangle=90)
         ax.set_title('Equipment Type Distribution', fontsize=14, fontweight='bold')
         
-        self.canvas.draw()
\ No newline at end of file
+        if scatter:
+            self.plot_scatter_density(self.figure.add_subplot(122), scatter)
+        
+        self.canvas.draw()
+    
+    def plot_scatter_density(self, ax, scatter):
+        if not scatter['cells']:
+            ax.text(0.5, 0.5, 'No data available', ha='center', va='center')
+            return
+        
+        counts = np.full((len(scatter['x_edges']) - 1, len(scatter['y_edges']) - 1), np.nan)
+        rows, cols, values = np.array(scatter['cells']).T
+        counts[rows, cols] = values
+        
+        mesh = ax.pcolormesh(scatter['x_edges'], scatter['y_edges'], counts.T, cmap='viridis')
+        self.figure.colorbar(mesh, ax=ax, label='Equipment count')
+        ax.set_xlabel(scatter['x'].capitalize())
+        ax.set_ylabel(scatter['y'].capitalize())
+        ax.set_title(f"{scatter['x'].capitalize()} vs {scatter['y'].capitalize()}", fontsize=14, fontweight='bold')
\ No newline at end of file
@@ -6,12 +6,28 @@ from .upload_dialog import UploadDialog
 from .chart_widget import ChartWidget
 import pandas as pd
 
+class ReportWorker(QThread):
+    finished = pyqtSignal()
+    error = pyqtSignal(str)
+    
+    def __init__(self, task):
+        super().__init__()
+        self.task = task
+    
+    def run(self):
+        try:
+            self.task()
+            self.finished.emit()
+        except Exception as e:
+            self.error.emit(str(e))
+
 class MainWindow(QMainWindow):
     def __init__(self, config, api_client):
         super().__init__()
         self.config = config
         self.api_client = api_client
         self.current_dataset_id = None
+        self.dataset_ids = []
         self.init_ui()
         self.load_datasets()
     
@@ -63,11 +79,16 @@ class MainWindow(QMainWindow):
             }
         """)
         
+        self.export_all_btn = QPushButton('🗂 Export All PDFs')
+        self.export_all_btn.clicked.connect(self.export_all_pdfs)
+        self.export_all_btn.setStyleSheet(self.export_btn.styleSheet())
+        
         self.refresh_btn = QPushButton('🔄 Refresh')
         self.refresh_btn.clicked.connect(self.load_datasets)
         
         toolbar_layout.addWidget(self.upload_btn)
         toolbar_layout.addWidget(self.export_btn)
+        toolbar_layout.addWidget(self.export_all_btn)
         toolbar_layout.addWidget(self.refresh_btn)
         toolbar_layout.addStretch()
         
@@ -150,6 +171,7 @@ class MainWindow(QMainWindow):
         try:
             response = self.api_client.list_datasets()
             datasets = response['results']
+            self.dataset_ids = [dataset['id'] for dataset in datasets]
             
             self.datasets_table.setRowCount(len(datasets))
             for row, dataset in enumerate(datasets):
@@ -166,24 +188,20 @@ class MainWindow(QMainWindow):
     
     def on_dataset_clicked(self, row, col):
         if col < 3:
-            try:
-                datasets = self.api_client.list_datasets()['results']
-                if row < len(datasets):
-                    self.load_dataset(datasets[row]['id'])
-            except Exception as e:
-                QMessageBox.critical(self, 'Error', str(e))
+            if row < len(self.dataset_ids):
+                self.load_dataset(self.dataset_ids[row])
     
     def load_dataset(self, dataset_id):
         try:
             self.statusBar().showMessage('Loading dataset...')
             self.current_dataset_id = dataset_id
             
-            dataset = self.api_client.get_dataset(dataset_id)
+            dataset = self.api_client.get_dataset_frame(dataset_id)
             summary = self.api_client.get_summary(dataset_id)
             
             self.update_summary(summary)
             self.update_table(dataset['equipment'])
-            self.update_charts(summary)
+            self.update_charts(summary, self.api_client.get_chart_data(dataset_id, chart='scatter', bins=40))
             
             self.export_btn.setEnabled(True)
             self.statusBar().showMessage('Dataset loaded successfully')
@@ -201,26 +219,64 @@ class MainWindow(QMainWindow):
     
     def update_table(self, equipment):
         self.table.setRowCount(len(equipment))
-        for row, item in enumerate(equipment):
-            self.table.setItem(row, 0, QTableWidgetItem(item['equipment_name']))
-            self.table.setItem(row, 1, QTableWidgetItem(item['equipment_type']))
-            self.table.setItem(row, 2, QTableWidgetItem(str(item['flowrate'])))
-            self.table.setItem(row, 3, QTableWidgetItem(str(item['pressure'])))
-            self.table.setItem(row, 4, QTableWidgetItem(str(item['temperature'])))
+        for row, item in enumerate(equipment.itertuples(index=False)):
+            self.table.setItem(row, 0, QTableWidgetItem(item.equipment_name))
+            self.table.setItem(row, 1, QTableWidgetItem(item.equipment_type))
+            self.table.setItem(row, 2, QTableWidgetItem(f'{item.flowrate:.2f}'))
+            self.table.setItem(row, 3, QTableWidgetItem(f'{item.pressure:.2f}'))
+            self.table.setItem(row, 4, QTableWidgetItem(f'{item.temperature:.2f}'))
     
-    def update_charts(self, summary):
-        self.chart_widget.plot_type_distribution(summary['type_distribution'])
+    def update_charts(self, summary, scatter=None):
+        self.chart_widget.plot_type_distribution(summary['type_distribution'], scatter)
     
     def export_pdf(self):
         if not self.current_dataset_id:
             return
         
-        try:
-            filename, _ = QFileDialog.getSaveFileName(self, 'Save PDF', '', 'PDF Files (*.pdf)')
-            if filename:
-                pdf_data = self.api_client.get_pdf_report(self.current_dataset_id)
-                with open(filename, 'wb') as f:
-                    f.write(pdf_data)
-                QMessageBox.information(self, 'Success', 'PDF exported successfully')
-        except Exception as e:
-            QMessageBox.critical(self, 'Error', f'Failed to export PDF: {str(e)}')
\ No newline at end of file
+        filename, _ = QFileDialog.getSaveFileName(self, 'Save PDF', '', 'PDF Files (*.pdf)')
+        if not filename:
+            return
+        
+        self.export_btn.setEnabled(False)
+        self.statusBar().showMessage('Generating PDF...')
+        self.pdf_worker = ReportWorker(lambda: self.save_pdf(self.current_dataset_id, filename))
+        self.pdf_worker.finished.connect(self.on_export_pdf_success)
+        self.pdf_worker.error.connect(self.on_export_pdf_error)
+        self.pdf_worker.start()
+    
+    def save_pdf(self, dataset_id, filename):
+        pdf_data = self.api_client.get_pdf_report(dataset_id)
+        with open(filename, 'wb') as f:
+            f.write(pdf_data)
+    
+    def on_export_pdf_success(self):
+        self.export_btn.setEnabled(True)
+        self.statusBar().showMessage('PDF exported successfully')
+        QMessageBox.information(self, 'Success', 'PDF exported successfully')
+    
+    def on_export_pdf_error(self, error):
+        self.export_btn.setEnabled(True)
+        self.statusBar().showMessage('Error exporting PDF')
+        QMessageBox.critical(self, 'Error', f'Failed to export PDF: {error}')
+    
+    def export_all_pdfs(self):
+        filename, _ = QFileDialog.getSaveFileName(self, 'Save Reports', 'equipment_reports.zip', 'ZIP Files (*.zip)')
+        if not filename:
+            return
+        
+        self.export_all_btn.setEnabled(False)
+        self.statusBar().showMessage('Exporting reports...')
+        self.export_worker = ReportWorker(lambda: self.api_client.export_reports(filename))
+        self.export_worker.finished.connect(self.on_export_all_success)
+        self.export_worker.error.connect(self.on_export_all_error)
+        self.export_worker.start()
+    
+    def on_export_all_success(self):
+        self.export_all_btn.setEnabled(True)
+        self.statusBar().showMessage('Reports exported successfully')
+        QMessageBox.information(self, 'Success', 'Reports exported successfully')
+    
+    def on_export_all_error(self, error):
+        self.export_all_btn.setEnabled(True)
+        self.statusBar().showMessage('Error exporting reports')
+        QMessageBox.critical(self, 'Error', f'Failed to export reports: {error}')
\ No newline at end of file
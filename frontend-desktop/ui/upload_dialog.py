@@ -1,6 +1,7 @@
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QLabel, QPushButton, 
                               QFileDialog, QProgressBar, QMessageBox)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
+import os
 
 class UploadWorker(QThread):
     progress = pyqtSignal(int)
@@ -14,7 +15,13 @@ class UploadWorker(QThread):
     
     def run(self):
         try:
-            result = self.api_client.upload_csv(self.file_path)
+            if os.path.getsize(self.file_path) > self.api_client.RESUMABLE_UPLOAD_THRESHOLD:
+                result = self.api_client.upload_csv_resumable(
+                    self.file_path,
+                    progress=lambda sent, total: self.progress.emit(int(sent * 100 / total))
+                )
+            else:
+                result = self.api_client.upload_csv(self.file_path)
             self.finished.emit(result)
         except Exception as e:
             self.error.emit(str(e))
@@ -105,6 +112,7 @@ class UploadDialog(QDialog):
         self.progress_bar.setValue(0)
         
         self.worker = UploadWorker(self.api_client, self.file_path)
+        self.worker.progress.connect(self.progress_bar.setValue)
         self.worker.finished.connect(self.on_upload_success)
         self.worker.error.connect(self.on_upload_error)
         self.worker.start()
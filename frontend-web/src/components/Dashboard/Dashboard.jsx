@@ -5,14 +5,20 @@ import SummaryCards from './SummaryCards'
 import DataTable from './DataTable'
 import DoughnutChart from '../Visualization/DoughnutChart'
 import BarChart from '../Visualization/BarChart'
+import ScatterChart from '../Visualization/ScatterChart'
 import HistoryList from '../History/HistoryList'
 import LoadingSpinner from '../Common/LoadingSpinner'
 import { datasetAPI, summaryAPI } from '../../services/api'
 
+const CHART_BINS = 40
+const CHART_TOP_N = 5
+
 export default function Dashboard() {
   const [currentDataset, setCurrentDataset] = useState(null)
   const [summary, setSummary] = useState(null)
   const [equipment, setEquipment] = useState([])
+  const [scatter, setScatter] = useState(null)
+  const [top, setTop] = useState(null)
   const [loading, setLoading] = useState(false)
   const [refreshKey, setRefreshKey] = useState(0)
 
@@ -24,14 +30,18 @@ export default function Dashboard() {
   const loadDataset = async (datasetId) => {
     setLoading(true)
     try {
-      const [datasetRes, summaryRes] = await Promise.all([
+      const [datasetRes, summaryRes, scatterRes, topRes] = await Promise.all([
         datasetAPI.get(datasetId),
-        summaryAPI.get(datasetId)
+        summaryAPI.get(datasetId),
+        datasetAPI.chartData(datasetId, { chart: 'scatter', bins: CHART_BINS }),
+        datasetAPI.chartData(datasetId, { chart: 'top', metric: 'flowrate', n: CHART_TOP_N })
       ])
       
       setCurrentDataset(datasetRes.data)
       setEquipment(datasetRes.data.equipment)
       setSummary(summaryRes.data)
+      setScatter(scatterRes.data)
+      setTop(topRes.data)
     } catch (error) {
       console.error('Failed to load dataset:', error)
     } finally {
@@ -61,7 +71,10 @@ export default function Dashboard() {
               <DoughnutChart data={summary?.type_distribution || []} />
             </div>
 
-            <BarChart equipment={equipment} />
+            <div className="grid grid-2">
+              <ScatterChart scatter={scatter} />
+              <BarChart top={top} />
+            </div>
           </>
         ) : (
           <div className="card" style={{ textAlign: 'center', padding: '48px' }}>
@@ -35,7 +35,7 @@ export default function HistoryList({ onSelectDataset, refreshKey, currentDatase
   const handleDownloadPDF = async (id, filename, e) => {
     e.stopPropagation()
     try {
-      const response = await reportAPI.getPDF(id)
+      const response = await reportAPI.downloadPDF(id)
       const url = window.URL.createObjectURL(new Blob([response.data]))
       const link = document.createElement('a')
       link.href = url
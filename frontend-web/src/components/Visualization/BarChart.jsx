@@ -3,30 +3,28 @@ import { Bar } from 'react-chartjs-2'
 
 ChartJS.register(CategoryScale, LinearScale, BarElement, Title, Tooltip, Legend)
 
-export default function BarChart({ equipment }) {
-  if (!equipment || equipment.length === 0) {
+const COLORS = ['#2196F3', '#4CAF50', '#FF9800', '#9C27B0', '#F44336', '#00BCD4']
+
+const METRIC_LABELS = {
+  flowrate: 'Flowrate (L/m)',
+  pressure: 'Pressure (bar)',
+  temperature: 'Temperature (°C)'
+}
+
+export default function BarChart({ top }) {
+  if (!top || top.types.length === 0) {
     return null
   }
 
+  const ranks = Math.max(...top.types.map(item => item.equipment.length))
+
   const chartData = {
-    labels: equipment.slice(0, 10).map(item => item.equipment_name),
-    datasets: [
-      {
-        label: 'Flowrate (L/m)',
-        data: equipment.slice(0, 10).map(item => item.flowrate),
-        backgroundColor: '#2196F3'
-      },
-      {
-        label: 'Pressure (bar)',
-        data: equipment.slice(0, 10).map(item => item.pressure),
-        backgroundColor: '#4CAF50'
-      },
-      {
-        label: 'Temperature (°C)',
-        data: equipment.slice(0, 10).map(item => item.temperature),
-        backgroundColor: '#FF9800'
-      }
-    ]
+    labels: Array.from({ length: ranks }, (_, index) => `#${index + 1}`),
+    datasets: top.types.map((item, index) => ({
+      label: item.equipment_type,
+      data: item.equipment.map(equipment => equipment[top.metric]),
+      backgroundColor: COLORS[index % COLORS.length]
+    }))
   }
 
   const options = {
@@ -38,8 +36,13 @@ export default function BarChart({ equipment }) {
       },
       title: {
         display: true,
-        text: 'Parameter Comparison (First 10 Equipment)',
+        text: `Top ${top.n} Equipment per Type by ${METRIC_LABELS[top.metric]}`,
         font: { size: 16 }
+      },
+      tooltip: {
+        callbacks: {
+          title: (items) => top.types[items[0].datasetIndex].equipment[items[0].dataIndex].equipment_name
+        }
       }
     },
     scales: {
@@ -56,4 +59,4 @@ export default function BarChart({ equipment }) {
       </div>
     </div>
   )
-}
\ No newline at end of file
+}
@@ -0,0 +1,68 @@
+import { Chart as ChartJS, LinearScale, PointElement, Title, Tooltip } from 'chart.js'
+import { Bubble } from 'react-chartjs-2'
+
+ChartJS.register(LinearScale, PointElement, Title, Tooltip)
+
+const capitalize = (text) => text.charAt(0).toUpperCase() + text.slice(1)
+
+export default function ScatterChart({ scatter }) {
+  if (!scatter || scatter.cells.length === 0) {
+    return <div className="card"><p>No data available</p></div>
+  }
+
+  const { x_edges: xEdges, y_edges: yEdges } = scatter
+  const maxCount = Math.max(...scatter.cells.map(([, , count]) => count))
+
+  const chartData = {
+    datasets: [{
+      data: scatter.cells.map(([row, col, count]) => ({
+        x: (xEdges[row] + xEdges[row + 1]) / 2,
+        y: (yEdges[col] + yEdges[col + 1]) / 2,
+        r: 2 + 8 * Math.sqrt(count / maxCount),
+        count
+      })),
+      backgroundColor: 'rgba(33, 150, 243, 0.5)',
+      borderColor: '#2196F3'
+    }]
+  }
+
+  const options = {
+    responsive: true,
+    maintainAspectRatio: false,
+    plugins: {
+      legend: {
+        display: false
+      },
+      title: {
+        display: true,
+        text: `${capitalize(scatter.x)} vs ${capitalize(scatter.y)}`,
+        font: { size: 16 }
+      },
+      tooltip: {
+        callbacks: {
+          label: (context) => `${context.raw.count} equipment`
+        }
+      }
+    },
+    scales: {
+      x: {
+        min: xEdges[0],
+        max: xEdges[xEdges.length - 1],
+        title: { display: true, text: capitalize(scatter.x) }
+      },
+      y: {
+        min: yEdges[0],
+        max: yEdges[yEdges.length - 1],
+        title: { display: true, text: capitalize(scatter.y) }
+      }
+    }
+  }
+
+  return (
+    <div className="card">
+      <div style={{ height: '400px' }}>
+        <Bubble data={chartData} options={options} />
+      </div>
+    </div>
+  )
+}
@@ -42,17 +42,39 @@ export const datasetAPI = {
     })
   },
   list: (params) => api.get('/datasets/list/', { params }),
+  compare: (ids) => api.get('/datasets/compare/', { params: { ids: ids.join(',') } }),
   get: (id) => api.get(`/datasets/${id}/`),
+  query: (id, params) => api.get(`/datasets/${id}/query/`, { params }),
+  chartData: (id, params) => api.get(`/datasets/${id}/chart-data/`, { params }),
   delete: (id) => api.delete(`/datasets/${id}/delete/`),
 }
 
 export const summaryAPI = {
   get: (id) => api.get(`/summary/${id}/`),
   getTypes: (id) => api.get(`/summary/${id}/types/`),
+  getDistribution: (id) => api.get(`/summary/${id}/distribution/`),
 }
 
 export const reportAPI = {
-  getPDF: (id) => api.get(`/report/${id}/pdf/`, { responseType: 'blob' }),
+  getPDF: (id, params) => api.get(`/report/${id}/pdf/`, { params, responseType: 'blob' }),
+  submitJob: (id, data) => api.post(`/report/${id}/jobs/`, data),
+  getJob: (jobId) => api.get(`/report/jobs/${jobId}/`),
+  downloadJob: (jobId) => api.get(`/report/jobs/${jobId}/download/`, { responseType: 'blob' }),
+  exportAll: (data) => api.post('/report/export/', data, { responseType: 'blob' }),
+  downloadPDF: async (id, params, { interval = 2000, timeout = 600000 } = {}) => {
+    const response = await reportAPI.getPDF(id, params)
+    if (response.status !== 202) return response
+
+    const { job_id: jobId } = JSON.parse(await response.data.text())
+    const deadline = Date.now() + timeout
+    while (true) {
+      const { data: job } = await reportAPI.getJob(jobId)
+      if (job.status === 'completed') return reportAPI.downloadJob(jobId)
+      if (job.status === 'failed') throw new Error(job.error || 'Failed to generate PDF')
+      if (Date.now() >= deadline) throw new Error('Timed out waiting for the report to render')
+      await new Promise((resolve) => setTimeout(resolve, interval))
+    }
+  },
 }
 
 export default api
\ No newline at end of file